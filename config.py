@@ -29,11 +29,115 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     EKAY_MAIL_SUBJECT_PREFIX = '[E-KAY]'
     EKAY_MAIL_SENDER = 'E-KAY Admin <noreply@ekay-ekam.ht>'
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', EKAY_MAIL_SENDER)
+    MAIL_SUPPRESS_SEND = os.environ.get('MAIL_SUPPRESS_SEND', 'false').lower() in ['true', 'on', '1']
     EKAY_ADMIN = os.environ.get('EKAY_ADMIN')
     
     # Pagination
     PROPERTIES_PER_PAGE = 12
     
+    # Index de recherche en mémoire (nécessite NumPy)
+    SEARCH_INDEX_ENABLED = os.environ.get('SEARCH_INDEX_ENABLED', 'false').lower() in ['true', 'on', '1']
+    
+    # Instrumentation SQL par requête (en-tête X-SQL-Queries et journal)
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', 'false').lower() in ['true', 'on', '1']
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', '5'))
+    SQL_QUERY_BUDGET = int(os.environ['SQL_QUERY_BUDGET']) if os.environ.get('SQL_QUERY_BUDGET') else None
+    
+    # Endpoint /metrics au format Prometheus (nécessite prometheus_client)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() in ['true', 'on', '1']
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # jeton Bearer exigé par /metrics
+    
+    # Profilage par échantillonnage d'une fraction des requêtes
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() in ['true', 'on', '1']
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0.01'))
+    PROFILING_ENDPOINTS = [e for e in os.environ.get('PROFILING_ENDPOINTS', '').split(',') if e]
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')  # valeur attendue de l'en-tête X-Profile
+    PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', '0.005'))
+    PROFILING_DIR = os.environ.get('PROFILING_DIR') or os.path.join(basedir, 'profiles')
+    PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', '500'))
+    
+    # Import en masse de propriétés (flask properties import, /admin/properties/import)
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', '1000'))  # erreurs affichées
+    # Exports administrateur en flux (/admin/export/<jeu>.<format>) : lignes par tranche
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '1000'))
+    # Ressources statiques à empreinte (voir ekay_platform/assets.py, flask assets build)
+    ASSETS_FINGERPRINT = os.environ.get('ASSETS_FINGERPRINT', 'true').lower() in ['true', 'on', '1']
+    ASSETS_DIRS = ['css', 'js', 'dist', 'icons', 'images', 'img']  # sous-dossiers de static/
+    # Paquets CSS/JS minifiés par type de page (static/dist/, voir ekay_platform/bundles.py)
+    ASSETS_BUNDLES = os.environ.get('ASSETS_BUNDLES', 'true').lower() in ['true', 'on', '1']
+    ASSETS_MANIFEST = os.environ.get('ASSETS_MANIFEST')  # static/assets-manifest.json par défaut
+    # Compression (voir ekay_platform/compression.py) : variantes .gz/.br écrites par flask assets build,
+    # réponses dynamiques texte compressées au-delà de COMPRESS_MIN_SIZE octets
+    STATIC_PRECOMPRESSED = os.environ.get('STATIC_PRECOMPRESSED', 'true').lower() in ['true', 'on', '1']
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', 'true').lower() in ['true', 'on', '1']
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))  # gzip, 1 à 9
+    COMPRESS_BR_QUALITY = int(os.environ.get('COMPRESS_BR_QUALITY', '4'))  # brotli, 0 à 11
+    COMPRESS_MIMETYPES = ['text/html', 'application/json', 'text/csv', 'application/x-ndjson', 'text/plain']
+    # Hachage des mots de passe (voir ekay_platform/passwords.py) : méthode werkzeug,
+    # pool borné (thread, process ou sync) ; un hash d'une autre méthode est recalculé à la connexion
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '30'))
+    # Cache des utilisateurs connectés (voir ekay_platform/user_cache.py) ; 0 pour le désactiver
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '30'))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '10000'))
+    # Secondes entre deux lectures de la génération partagée (suppressions, droits)
+    USER_CACHE_CHECK_INTERVAL = float(os.environ.get('USER_CACHE_CHECK_INTERVAL', '1'))
+    LAST_SEEN_INTERVAL = int(os.environ.get('LAST_SEEN_INTERVAL', '60'))  # secondes entre deux écritures
+    # Limitation du débit (voir ekay_platform/rate_limit.py) : soumissions par client,
+    # seaux en mémoire du worker, dans un fichier SQLite partagé ou sur un serveur Redis
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')
+    RATE_LIMIT_PROXY_COUNT = int(os.environ.get('RATE_LIMIT_PROXY_COUNT', '0'))  # proxys devant l'application
+    RATE_LIMITS = {
+        'login': os.environ.get('RATE_LIMIT_LOGIN', '10/minute'),  # par IP
+        'register': os.environ.get('RATE_LIMIT_REGISTER', '5/hour'),
+        'password_reset': os.environ.get('RATE_LIMIT_PASSWORD_RESET', '5/hour'),
+        'verification_email': os.environ.get('RATE_LIMIT_VERIFICATION_EMAIL', '5/hour'),
+        'booking': os.environ.get('RATE_LIMIT_BOOKING', '20/hour'),  # par utilisateur
+    }
+    # Listes paginées de l'administration
+    ITEMS_PER_PAGE = int(os.environ.get('ITEMS_PER_PAGE', '20'))
+    ADMIN_PROPERTIES_PER_PAGE = int(os.environ.get('ADMIN_PROPERTIES_PER_PAGE', '25'))
+    ADMIN_SIGNUP_DAYS = int(os.environ.get('ADMIN_SIGNUP_DAYS', '30'))  # historique des inscriptions
+    # Statistiques quotidiennes des annonces (flask properties rollup-stats, tâche périodique)
+    STATS_ROLLUP_DAYS = int(os.environ.get('STATS_ROLLUP_DAYS', '2'))  # jours recalculés par passage
+    STATS_VIEW_RETENTION_DAYS = int(os.environ.get('STATS_VIEW_RETENTION_DAYS', '90'))  # vues brutes
+    STATS_DASHBOARD_DAYS = int(os.environ.get('STATS_DASHBOARD_DAYS', '30'))  # période des graphiques
+    # Purge des tokens expirés ou utilisés (flask auth sweep-tokens, tâche périodique)
+    TOKEN_SWEEP_BATCH_SIZE = int(os.environ.get('TOKEN_SWEEP_BATCH_SIZE', '1000'))  # tokens par transaction
+    TOKEN_RETENTION_HOURS = int(os.environ.get('TOKEN_RETENTION_HOURS', '24'))  # délai avant suppression
+    TOKEN_SWEEP_PAUSE = float(os.environ.get('TOKEN_SWEEP_PAUSE', '0.05'))  # secondes entre deux lots
+    
+    # Réglages du moteur (voir ekay_platform/db_tuning.py)
+    # SQLite : pragmas appliqués à chaque connexion (SQLITE_TUNING=false pour les désactiver)
+    SQLITE_PRAGMAS = {
+        'busy_timeout': 5000,       # attendre le verrou d'écriture (ms) plutôt qu'échouer
+        'journal_mode': 'WAL',      # lectures et écriture concurrentes
+        'synchronous': 'NORMAL',    # fsync aux checkpoints seulement, sûr en WAL
+        'cache_size': -64000,       # 64 Mo de cache de pages par connexion
+        'mmap_size': 268435456,     # 256 Mo lus par projection mémoire
+        'temp_store': 'MEMORY',
+    } if os.environ.get('SQLITE_TUNING', 'true').lower() in ['true', 'on', '1'] else {}
+    # PostgreSQL : pool par worker (DB_POOL_SIZE et DB_MAX_OVERFLOW fixés par gunicorn.conf.py)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))  # secondes d'attente d'une connexion
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '-1'))
+    DB_POOL_PRE_PING = False
+    # Cache des requêtes compilées (et préparées par sqlite3)
+    DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', '1000'))
+    
+    # Réplicas en lecture (voir ekay_platform/db_routing.py), séparés par des virgules
+    SQLALCHEMY_REPLICA_URIS = [u for u in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if u]
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', '5'))  # secondes de retard tolérées
+    REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', '10'))
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', '5'))  # primaire après une écriture
+    
     @staticmethod
     def init_app(app):
         # Ensure upload folder exists
@@ -43,20 +147,26 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    SQL_PROFILING = True
+    ASSETS_FINGERPRINT = False  # fichiers modifiés visibles sans redémarrage
+    ASSETS_BUNDLES = False  # fichiers sources servis séparément, sans minification
 
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    RATE_LIMIT_ENABLED = False  # activé explicitement par les tests de limitation
 
 
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'ekay_prod.db')
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-    }
+    DB_POOL_PRE_PING = True
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '300'))
+    # Actif par défaut seulement si /metrics est protégé par un jeton
+    METRICS_ENABLED = os.environ.get(
+        'METRICS_ENABLED', 'true' if os.environ.get('METRICS_TOKEN') else 'false'
+    ).lower() in ['true', 'on', '1']
 
 
 config = {
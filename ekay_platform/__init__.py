@@ -26,12 +26,61 @@ def create_app(config_name='default'):
     config[config_name].init_app(app)
     
     # Initialize extensions
+    from . import db_tuning, db_routing
+    db_tuning.configure_engine(app)
     db.init_app(app)
+    db_tuning.init_app(app)
+    db_routing.init_app(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, render_as_batch=True)
     mail.init_app(app)
     babel.init_app(app)
     
+    # Index de recherche en mémoire (optionnel)
+    from . import search_index
+    search_index.init_app(app)
+    
+    # Autocomplétion des villes et quartiers
+    from . import autocomplete
+    autocomplete.init_app(app)
+    
+    # Hachage des mots de passe dans un pool borné
+    from . import passwords
+    passwords.init_app(app)
+    
+    # Paquets CSS/JS, ressources statiques à empreinte et service worker
+    from . import assets, bundles
+    bundles.init_app(app)
+    assets.init_app(app)
+    
+    # Compression des réponses dynamiques
+    from . import compression
+    compression.init_app(app)
+    
+    # Limitation du débit des formulaires sensibles
+    from . import rate_limit
+    rate_limit.init_app(app)
+    
+    # Cache des utilisateurs connectés
+    from . import user_cache
+    user_cache.init_app(app)
+    
+    # Agrégats du tableau de bord administrateur
+    from . import admin_stats
+    admin_stats.init_app(app)
+    
+    # Compteurs SQL par requête et détection des N+1
+    from . import sql_stats
+    sql_stats.init_app(app)
+    
+    # Métriques Prometheus (/metrics)
+    from . import metrics
+    metrics.init_app(app)
+    
+    # Profilage par échantillonnage (optionnel)
+    from . import profiling
+    profiling.init_app(app)
+    
     # Configure login manager
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
@@ -58,20 +107,22 @@ def create_app(config_name='default'):
     app.register_blueprint(admin_blueprint, url_prefix='/admin')
     
     # Error handlers
-    from .errors import page_not_found, internal_server_error, forbidden
+    from .errors import page_not_found, internal_server_error, forbidden, too_many_requests
     app.register_error_handler(404, page_not_found)
     app.register_error_handler(500, internal_server_error)
     app.register_error_handler(403, forbidden)
+    app.register_error_handler(429, too_many_requests)
     
     # Shell context
     @app.shell_context_processor
     def make_shell_context():
-        from .models import User, Property, PropertyImage
+        from .models import User, Property, PropertyImage, Booking
         return {
             'db': db,
             'User': User,
             'Property': Property,
-            'PropertyImage': PropertyImage
+            'PropertyImage': PropertyImage,
+            'Booking': Booking
         }
     
     return app
@@ -80,4 +131,4 @@ def create_app(config_name='default'):
 # Import des modèles pour s'assurer qu'ils sont enregistrés avec SQLAlchemy
 # Cette importation est nécessaire pour que SQLAlchemy connaisse tous les modèles
 # avant de créer les tables de la base de données
-from .models import User, Property, PropertyImage, Token  # noqa: F401
+from .models import User, Property, PropertyImage, Booking, Token  # noqa: F401
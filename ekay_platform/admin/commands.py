@@ -0,0 +1,15 @@
+"""
+E-KAY Platform - Commandes CLI de l'administration (flask admin ...)
+"""
+
+import click
+
+from . import admin_bp
+from .. import admin_stats
+
+
+@admin_bp.cli.command('refresh-stats')
+def refresh_stats_command():
+    """Recalcule les agrégats du tableau de bord administrateur"""
+    count = admin_stats.rebuild()
+    click.echo(f'{count} compteurs recalculés.')
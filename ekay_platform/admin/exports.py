@@ -0,0 +1,183 @@
+"""
+E-KAY Platform - Exports administrateur en flux
+
+/admin/export/<jeu>.<format> où le jeu est ``properties``, ``users`` ou
+``bookings`` et le format ``csv``, ``ndjson`` ou ``parquet`` (nécessite
+pyarrow).
+
+Les lignes sont lues par tranches de ``EXPORT_CHUNK_SIZE`` avec
+``stream_results`` (curseur côté serveur sous PostgreSQL) sous forme de tuples
+Core, sans objets ORM, et chaque tranche est envoyée aussitôt sérialisée :
+la mémoire du worker ne dépend pas du volume exporté. En GET, la lecture
+part sur un réplica s'il y en a (voir db_routing). Avec des workers
+gthread ou gevent, une longue réponse en flux n'est pas interrompue par le
+délai de gunicorn, qui ne surveille que le battement du worker.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import Response, abort, current_app, flash, redirect, stream_with_context, url_for
+from flask_login import current_user, login_required
+from sqlalchemy import select
+
+from .. import db
+from ..models import Booking, Property, User
+from . import admin_bp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    pa = pq = None
+
+# Colonnes jamais exportées (secrets)
+EXCLUDED_COLUMNS = {'password_hash', 'reset_password_token', 'reset_password_expires'}
+
+DATASETS = {
+    'properties': Property,
+    'users': User,
+    'bookings': Booking,
+}
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def export_columns(model):
+    return [column for column in model.__table__.columns if column.name not in EXCLUDED_COLUMNS]
+
+
+def iter_chunks(columns, chunk_size):
+    """Tranches de tuples lues par curseur serveur"""
+    # stream_results + partitions : disponible dès SQLAlchemy 1.4 (yield_per Core : 1.4.40)
+    statement = select(*columns).order_by(columns[0].table.c.id).execution_options(
+        stream_results=True, max_row_buffer=chunk_size
+    )
+    result = db.session.execute(statement)
+    try:
+        for partition in result.partitions(chunk_size):
+            yield partition
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'{type(value).__name__} non sérialisable')
+
+
+def write_csv(names, chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_ndjson(names, chunks):
+    # Un seul encodeur : json.dumps avec options en recrée un à chaque appel
+    encode = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+    for rows in chunks:
+        yield ''.join(encode(dict(zip(names, row))) + '\n' for row in rows).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Fichier en écriture seule dont on récupère le contenu au fil de l'eau"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return pa.string()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type in (float, Decimal):
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp('us')
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+def write_parquet(columns, chunks):
+    """Un groupe de lignes Parquet par tranche ; le pied de fichier à la fin"""
+    schema = pa.schema([(column.name, _arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for rows in chunks:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+@admin_bp.route('/export/<dataset>.<fmt>')
+@login_required
+def export_dataset(dataset, fmt):
+    if not current_user.is_admin:
+        flash('Accès refusé. Vous devez être administrateur.', 'danger')
+        return redirect(url_for('main.index'))
+
+    model = DATASETS.get(dataset)
+    if model is None or fmt not in MIMETYPES:
+        abort(404)
+    if fmt == 'parquet' and pq is None:
+        abort(404, description="L'export Parquet nécessite pyarrow")
+
+    columns = export_columns(model)
+    names = [column.name for column in columns]
+    chunks = iter_chunks(columns, current_app.config.get('EXPORT_CHUNK_SIZE', 1000))
+    if fmt == 'csv':
+        body = write_csv(names, chunks)
+    elif fmt == 'ndjson':
+        body = write_ndjson(names, chunks)
+    else:
+        body = write_parquet(columns, chunks)
+
+    filename = f'{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}'
+    return Response(stream_with_context(body), mimetype=MIMETYPES[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'X-Accel-Buffering': 'no',  # pas de mise en tampon par un proxy nginx
+    })
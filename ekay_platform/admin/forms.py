@@ -2,6 +2,7 @@
 E-KAY Platform - Admin Forms
 """
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileAllowed, FileField, FileRequired
 from wtforms import StringField, PasswordField, BooleanField, SubmitField, SelectField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, Optional, ValidationError
 from ..models import User
@@ -94,3 +95,24 @@ class PropertySearchForm(FlaskForm):
                                 ('unavailable', 'Non disponible')],
                         validators=[Optional()])
     submit = SubmitField('Filtrer')
+
+
+class PropertyImportForm(FlaskForm):
+    """Formulaire d'import en masse de propriétés"""
+    file = FileField('Fichier CSV ou JSON',
+                     validators=[FileRequired(),
+                                 FileAllowed(['csv', 'json', 'jsonl', 'ndjson'],
+                                             'Formats acceptés : CSV, JSON, JSON Lines')])
+    owner = StringField('Propriétaire des annonces (nom d\'utilisateur)',
+                        validators=[DataRequired(), Length(max=50)])
+    status = SelectField('Statut des annonces', choices=[
+        ('pending', 'En attente de validation'),
+        ('draft', 'Brouillon'),
+        ('published', 'Publié'),
+    ], default='pending')
+    geocode = BooleanField('Géocoder les adresses sans coordonnées')
+    submit = SubmitField('Importer')
+
+    def validate_owner(self, owner):
+        if User.query.filter_by(username=owner.data).first() is None:
+            raise ValidationError('Utilisateur inconnu.')
@@ -1,12 +1,34 @@
-from flask import render_template, redirect, url_for, flash, request, current_app
+from flask import render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 import os
-from .. import db
+from sqlalchemy.orm import load_only
+from .. import db, admin_stats
 from ..models import Property, User
+from ..search_index import IndexPagination
 from ..properties.forms import PropertyForm
+from ..properties.bulk_import import GeocodeCache, import_properties
+from .forms import PropertyImportForm
 from . import admin_bp
 
+# Tableau de bord : filtres de la liste, tris autorisés, colonnes chargées
+DASHBOARD_FILTERS = ('q', 'status', 'city', 'property_type')
+DASHBOARD_SORTS = {
+    'id': Property.id,
+    'title': Property.title,
+    'type': Property.property_type,
+    'price': Property.price,
+    'city': Property.city,
+    'status': Property.status,
+    'views': Property.view_count,
+    'created': Property.created_at,
+}
+DASHBOARD_COLUMNS = (
+    Property.id, Property.title, Property.property_type, Property.price, Property.price_type,
+    Property.currency, Property.city, Property.status, Property.is_available,
+    Property.view_count, Property.created_at,
+)
+
 @admin_bp.route('/admin')
 @login_required
 def admin_dashboard():
@@ -14,8 +36,41 @@ def admin_dashboard():
         flash('Accès refusé. Vous devez être administrateur.', 'danger')
         return redirect(url_for('main.index'))
     
-    properties = Property.query.all()
-    return render_template('admin/dashboard.html', title='Tableau de bord', properties=properties)
+    filters = {name: request.args.get(name, '').strip() for name in DASHBOARD_FILTERS}
+    sort = request.args.get('sort', 'created')
+    if sort not in DASHBOARD_SORTS:
+        sort = 'created'
+    direction = 'asc' if request.args.get('dir') == 'asc' else 'desc'
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = current_app.config.get('ADMIN_PROPERTIES_PER_PAGE', 25)
+    
+    stats = admin_stats.dashboard_stats(current_app.config.get('ADMIN_SIGNUP_DAYS', 30))
+    
+    query = Property.query.options(load_only(*DASHBOARD_COLUMNS))
+    if filters['q']:
+        query = query.filter(Property.title.ilike(f"%{filters['q']}%"))
+    for name in ('status', 'city', 'property_type'):
+        if filters[name]:
+            query = query.filter(getattr(Property, name) == filters[name])
+    
+    # Sans filtre ou sur le seul statut, le total vient des agrégats
+    if filters['q'] or filters['city'] or filters['property_type']:
+        total = query.order_by(None).count()
+    elif filters['status']:
+        total = dict(stats['property_status']).get(filters['status'], 0)
+    else:
+        total = stats['properties_total']
+    
+    column = DASHBOARD_SORTS[sort]
+    order = column.asc() if direction == 'asc' else column.desc()
+    tiebreak = Property.id.asc() if direction == 'asc' else Property.id.desc()
+    items = query.order_by(order, tiebreak).offset((page - 1) * per_page).limit(per_page).all()
+    pagination = IndexPagination(page, per_page, total, items)
+    
+    return render_template('admin/dashboard.html', title='Tableau de bord',
+                           pagination=pagination, stats=stats, filters=filters,
+                           active_filters={name: value for name, value in filters.items() if value},
+                           sort=sort, direction=direction)
 
 @admin_bp.route('/admin/property/new', methods=['GET', 'POST'])
 @login_required
@@ -130,3 +185,35 @@ def delete_property(id):
     db.session.commit()
     flash('Le bien a été supprimé avec succès!', 'success')
     return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/properties/import', methods=['GET', 'POST'])
+@login_required
+def import_properties_view():
+    if not current_user.is_admin:
+        flash('Accès refusé. Vous devez être administrateur.', 'danger')
+        return redirect(url_for('main.index'))
+    
+    form = PropertyImportForm()
+    report = None
+    if form.validate_on_submit():
+        upload = form.file.data
+        fmt = 'csv' if upload.filename.lower().endswith('.csv') else 'json'
+        owner = User.query.filter_by(username=form.owner.data).first()
+        try:
+            # Le fichier reçu est lu en flux (Werkzeug le garde sur disque au-delà de 500 Ko)
+            report = import_properties(
+                upload.stream, fmt, owner.id, status=form.status.data,
+                batch_size=current_app.config.get('IMPORT_BATCH_SIZE', 500),
+                geocoder=GeocodeCache.nominatim() if form.geocode.data else None,
+                max_errors=current_app.config.get('IMPORT_MAX_ERRORS', 1000),
+            )
+        except (ValueError, UnicodeDecodeError) as e:
+            db.session.rollback()
+            flash(f'Fichier illisible : {e}', 'danger')
+        else:
+            if request.accept_mimetypes.best == 'application/json':
+                return jsonify(report.to_dict())
+            flash(f'{report.imported} biens importés, {report.failed} lignes rejetées sur {report.total}.',
+                  'success' if not report.failed else 'warning')
+    
+    return render_template('admin/import.html', title='Importer des biens', form=form, report=report)
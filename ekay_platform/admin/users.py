@@ -3,7 +3,6 @@ E-KAY Platform - Admin Users Management
 """
 from flask import render_template, flash, redirect, url_for, request, current_app
 from flask_login import login_required, current_user
-from werkzeug.security import generate_password_hash
 from .. import db
 from ..models import User
 from . import admin_bp
@@ -68,7 +67,7 @@ def edit_user(user_id):
         user.email_verified = form.email_verified.data
         
         if form.password.data:
-            user.password_hash = generate_password_hash(form.password.data)
+            user.password = form.password.data
         
         db.session.commit()
         flash('Utilisateur mis à jour avec succès!', 'success')
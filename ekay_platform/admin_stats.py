@@ -0,0 +1,213 @@
+"""
+E-KAY Platform - Agrégats matérialisés du tableau de bord administrateur
+
+Les chiffres du tableau de bord (annonces par statut, ville et type,
+réservations par statut, inscriptions par jour) sont lus dans la table
+``dashboard_counters`` au lieu d'agréger les tables à chaque affichage.
+
+Mise à jour incrémentale : après chaque flush de la session, les objets
+créés, supprimés ou dont un attribut suivi a changé produisent des deltas
+(+1 sur la nouvelle valeur, -1 sur l'ancienne) appliqués dans la même
+transaction par un seul UPSERT (SQLite, PostgreSQL ; UPDATE puis INSERT
+ailleurs). Les insertions Core de l'import en masse appliquent leurs
+propres deltas (voir properties.bulk_import).
+
+Les écritures qui contournent l'ORM (SQL brut, autre application) ne sont
+pas vues : ``flask admin refresh-stats`` recalcule tout par GROUP BY. Le
+tableau de bord fait de même à la première visite, tant que la table n'a
+jamais été remplie.
+"""
+
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event, func, inspect
+
+from .extensions import db
+from .models import Booking, DashboardCounter, Property, User
+
+try:
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    UPSERT_DIALECTS = {'postgresql': pg_insert, 'sqlite': sqlite_insert}
+except ImportError:  # pragma: no cover - SQLAlchemy sans ON CONFLICT
+    UPSERT_DIALECTS = {}
+
+SIGNUPS = 'user_signups'
+# Ligne sentinelle : date (epoch) du dernier recalcul complet
+META = ('meta', 'rebuilt_at')
+
+# Dimension -> (modèle, attribut suivi)
+TRACKED = {
+    'property_status': (Property, 'status'),
+    'property_city': (Property, 'city'),
+    'property_type': (Property, 'property_type'),
+    'booking_status': (Booking, 'status'),
+}
+
+
+def _key(value):
+    # Les clés font partie de la clé primaire : jamais NULL
+    return '' if value is None else str(value)[:100]
+
+
+def _signup_key(created_at):
+    return (created_at or datetime.utcnow()).date().isoformat()
+
+
+def collect_deltas(session):
+    """Deltas (dimension, clé) -> variation produits par le flush en cours"""
+    deltas = Counter()
+    for obj in session.new:
+        for dimension, (model, attr) in TRACKED.items():
+            if isinstance(obj, model):
+                deltas[dimension, _key(getattr(obj, attr))] += 1
+        if isinstance(obj, User):
+            deltas[SIGNUPS, _signup_key(obj.created_at)] += 1
+    for obj in session.deleted:
+        state = inspect(obj)
+        for dimension, (model, attr) in TRACKED.items():
+            if isinstance(obj, model):
+                history = state.attrs[attr].history
+                old = history.deleted[0] if history.deleted else getattr(obj, attr)
+                deltas[dimension, _key(old)] -= 1
+        if isinstance(obj, User):
+            deltas[SIGNUPS, _signup_key(obj.created_at)] -= 1
+    for obj in session.dirty:
+        if obj in session.deleted:
+            continue
+        state = inspect(obj)
+        for dimension, (model, attr) in TRACKED.items():
+            if not isinstance(obj, model):
+                continue
+            history = state.attrs[attr].history
+            if history.deleted and history.added:
+                deltas[dimension, _key(history.deleted[0])] -= 1
+                deltas[dimension, _key(history.added[0])] += 1
+    return deltas
+
+
+def row_deltas(model, rows):
+    """Deltas d'une insertion Core de `rows` (dicts de colonnes) dans `model`"""
+    deltas = Counter()
+    for row in rows:
+        for dimension, (tracked, attr) in TRACKED.items():
+            if tracked is model:
+                deltas[dimension, _key(row.get(attr))] += 1
+    return deltas
+
+
+def apply_deltas(connection, deltas):
+    """Ajoute les deltas aux compteurs, dans la transaction de `connection`"""
+    rows = [{'dimension': dimension, 'key': key, 'value': value}
+            for (dimension, key), value in deltas.items() if value]
+    if not rows:
+        return
+    table = DashboardCounter.__table__
+    insert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is not None:
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.dimension, table.c.key],
+            set_={'value': table.c.value + statement.excluded.value},
+        )
+        connection.execute(statement, rows)
+        return
+    for row in rows:
+        updated = connection.execute(
+            table.update()
+            .where(table.c.dimension == row['dimension'], table.c.key == row['key'])
+            .values(value=table.c.value + row['value'])
+        ).rowcount
+        if not updated:
+            connection.execute(table.insert(), row)
+
+
+def rebuild():
+    """Recalcule tous les compteurs par GROUP BY et valide la transaction"""
+    rows = []
+    for dimension, (model, attr) in TRACKED.items():
+        column = getattr(model, attr)
+        for value, count in db.session.query(column, func.count()).group_by(column):
+            rows.append({'dimension': dimension, 'key': _key(value), 'value': count})
+    day = func.date(User.created_at)
+    for value, count in db.session.query(day, func.count()).group_by(day):
+        if value is not None:
+            rows.append({'dimension': SIGNUPS, 'key': str(value), 'value': count})
+    rows.append({'dimension': META[0], 'key': META[1], 'value': int(time.time())})
+
+    table = DashboardCounter.__table__
+    db.session.execute(table.delete())
+    db.session.execute(table.insert(), rows)
+    db.session.commit()
+    return len(rows) - 1
+
+
+def dashboard_stats(days=30):
+    """Agrégats du tableau de bord ; recalcul complet si jamais rempli
+
+    Retourne un dict dimension -> [(clé, valeur)] trié par valeur
+    décroissante, plus ``signups`` (inscriptions des `days` derniers jours,
+    jours sans inscription compris) et les totaux.
+    """
+    since = (date.today() - timedelta(days=days - 1)).isoformat()
+    query = db.session.query(
+        DashboardCounter.dimension, DashboardCounter.key, DashboardCounter.value
+    ).filter(db.or_(DashboardCounter.dimension != SIGNUPS, DashboardCounter.key >= since))
+    rows = query.all()
+    if not any((dimension, key) == META for dimension, key, _ in rows):
+        rebuild()
+        rows = query.all()
+
+    stats = {dimension: [] for dimension in TRACKED}
+    daily = {}
+    for dimension, key, value in rows:
+        if dimension == SIGNUPS:
+            daily[key] = value
+        elif dimension in stats and value:
+            stats[dimension].append((key, value))
+    for values in stats.values():
+        values.sort(key=lambda item: (-item[1], item[0]))
+
+    start = date.today() - timedelta(days=days - 1)
+    stats['signups'] = [
+        (day.isoformat(), daily.get(day.isoformat(), 0))
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    ]
+    stats['properties_total'] = sum(value for _, value in stats['property_status'])
+    stats['bookings_total'] = sum(value for _, value in stats['booking_status'])
+    stats['users_total'] = db.session.query(func.coalesce(func.sum(DashboardCounter.value), 0)).filter(
+        DashboardCounter.dimension == SIGNUPS
+    ).scalar()
+    return stats
+
+
+def _after_flush(session, flush_context):
+    deltas = collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+_listeners_installed = False
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    # active_history : l'ancienne valeur est chargée avant modification,
+    # sinon un attribut expiré changerait sans décrémenter son compteur
+    for model, attr in TRACKED.values():
+        event.listen(getattr(model, attr), 'set', _keep_old_value, active_history=True, retval=True)
+    event.listen(db.session, 'after_flush', _after_flush)
+    _listeners_installed = True
+
+
+def init_app(app):
+    """Maintient les compteurs du tableau de bord à chaque flush"""
+    _install_listeners()
@@ -0,0 +1,175 @@
+"""
+E-KAY Platform - Empreinte des ressources statiques
+
+Chaque fichier des dossiers ``ASSETS_DIRS`` de ``static/`` (CSS, JS,
+icônes, images) reçoit un nom dérivé de son contenu :
+``css/style.css`` -> ``css/style.3f2a9c1b04de.css``. Le manifeste
+(``static/assets-manifest.json``) associe les deux noms et est :
+
+- écrit à la construction (``flask assets build``, voir render.yaml) ;
+- relu au démarrage, ou recalculé en mémoire s'il est absent.
+
+Avec ``ASSETS_FINGERPRINT`` :
+
+- ``url_for('static', filename='css/style.css')`` produit le nom à
+  empreinte, sans changement dans les templates ;
+- ce nom est servi avec ``Cache-Control: public, max-age=31536000,
+  immutable`` : le navigateur ne revalide jamais, une modification du
+  fichier change son URL. Les anciens noms restent servis normalement ;
+- ``/sw.js`` sert le service worker (``static/sw.js``) précédé de la
+  version du cache (empreinte du manifeste) et de la liste à précharger,
+  tirées du même manifeste : plus de ``CACHE_NAME`` à incrémenter à la main.
+
+La construction regroupe d'abord CSS et JS en paquets (``ASSETS_BUNDLES``,
+voir ``bundles``), puis écrit le manifeste et, avec
+``STATIC_PRECOMPRESSED``, les variantes ``.gz`` / ``.br`` servies par
+négociation (voir ``compression``).
+"""
+
+import hashlib
+import json
+import os
+
+import click
+from flask import Response, current_app, url_for
+from flask.cli import AppGroup
+
+from . import bundles, compression
+
+MANIFEST_NAME = 'assets-manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+HASH_LENGTH = 12
+# Pages préchargées par le service worker, en plus des ressources du manifeste
+SERVICE_WORKER_PAGES = ('main.index', 'auth.login', 'auth.register', 'properties.list_properties')
+OFFLINE_PAGE = 'offline.html'
+
+assets_cli = AppGroup('assets', help='Ressources statiques (paquets, empreintes, compression)')
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(name, digest):
+    root, extension = os.path.splitext(name)
+    return f'{root}.{digest}{extension}'
+
+
+class AssetManifest:
+    """Noms d'origine -> noms à empreinte, et l'inverse pour les servir"""
+
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+        self.sources = {hashed: name for name, hashed in self.files.items()}
+        encoded = json.dumps(self.files, sort_keys=True).encode('utf-8')
+        self.version = hashlib.sha256(encoded).hexdigest()[:HASH_LENGTH]
+
+    @classmethod
+    def build(cls, static_folder, dirs):
+        files = {}
+        for directory in dirs:
+            top = os.path.join(static_folder, directory)
+            for root, _, names in os.walk(top):
+                for filename in names:
+                    path = os.path.join(root, filename)
+                    name = os.path.relpath(path, static_folder).replace(os.sep, '/')
+                    files[name] = fingerprinted_name(name, file_hash(path))
+        return cls(files)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as stream:
+            return cls(json.load(stream)['files'])
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as stream:
+            json.dump({'version': self.version, 'files': self.files}, stream, indent=1, sort_keys=True)
+            stream.write('\n')
+
+
+def manifest_path(app):
+    return app.config.get('ASSETS_MANIFEST') or os.path.join(app.static_folder, MANIFEST_NAME)
+
+
+def build_manifest(app):
+    return AssetManifest.build(app.static_folder, app.config.get('ASSETS_DIRS', ('css', 'js')))
+
+
+def get_manifest():
+    return current_app.extensions.get('assets_manifest') or AssetManifest()
+
+
+def _fingerprint_url(endpoint, values):
+    # url_defaults : appelé par url_for avant la construction de l'URL
+    if endpoint == 'static' and 'filename' in values:
+        manifest = current_app.extensions['assets_manifest']
+        values['filename'] = manifest.files.get(values['filename'], values['filename'])
+
+
+def serve_static(filename):
+    """Vue ``static`` : noms à empreinte mis en cache pour toujours, variantes précompressées"""
+    source = get_manifest().sources.get(filename)
+    if source is None:
+        return compression.send_static_file(filename)
+    response = compression.send_static_file(source, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def service_worker_assets():
+    """Version du cache et URL à précharger, pour le service worker"""
+    manifest = get_manifest()
+    precache = [url_for(endpoint) for endpoint in SERVICE_WORKER_PAGES]
+    precache.append(url_for('static', filename=OFFLINE_PAGE))
+    # Sources regroupées et source maps : inutiles hors ligne
+    skipped = ('css/', 'js/') if current_app.config.get('ASSETS_BUNDLES') else ()
+    precache.extend(url_for('static', filename=name) for name in sorted(manifest.files)
+                    if not name.endswith('.map') and not name.startswith(skipped))
+    return {'version': manifest.version, 'precache': precache}
+
+
+def service_worker():
+    with open(os.path.join(current_app.static_folder, 'sw.js'), encoding='utf-8') as stream:
+        script = stream.read()
+    header = f'self.EKAY_ASSETS = {json.dumps(service_worker_assets())};\n'
+    response = Response(header + script, mimetype='application/javascript')
+    # Le navigateur vérifie le service worker à chaque navigation
+    response.cache_control.no_cache = True
+    return response
+
+
+@assets_cli.command('build')
+def build_command():
+    """Regroupe CSS et JS, calcule les empreintes, écrit le manifeste et les variantes compressées"""
+    if current_app.config.get('ASSETS_BUNDLES'):
+        for path, (raw, size) in bundles.build_all(current_app.static_folder).items():
+            click.echo(f'{path} : {raw / 1024:.1f} Kio de sources -> {size / 1024:.1f} Kio')
+    manifest = build_manifest(current_app)
+    path = manifest_path(current_app)
+    manifest.save(path)
+    current_app.extensions['assets_manifest'] = manifest
+    click.echo(f'{len(manifest.files)} ressources, version {manifest.version} -> {path}')
+    if current_app.config.get('STATIC_PRECOMPRESSED'):
+        count, raw, totals = compression.precompress(current_app.static_folder, manifest.files)
+        sizes = ', '.join(f'{encoding} {size / 1024:.0f} Kio' for encoding, size in totals.items())
+        click.echo(f'{count} fichiers précompressés : {raw / 1024:.0f} Kio -> {sizes}')
+
+
+def init_app(app):
+    """Active les noms à empreinte si ASSETS_FINGERPRINT, les variantes si STATIC_PRECOMPRESSED"""
+    app.cli.add_command(assets_cli)
+    if app.config.get('ASSETS_FINGERPRINT') or app.config.get('STATIC_PRECOMPRESSED'):
+        app.view_functions['static'] = serve_static
+    if not app.config.get('ASSETS_FINGERPRINT'):
+        return None
+    path = manifest_path(app)
+    manifest = AssetManifest.load(path) if os.path.exists(path) else build_manifest(app)
+    app.extensions['assets_manifest'] = manifest
+    app.url_defaults(_fingerprint_url)
+    app.add_url_rule('/sw.js', 'service_worker', service_worker)
+    return manifest
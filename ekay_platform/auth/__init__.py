@@ -14,7 +14,7 @@ from ..email_utils import send_password_reset_email
 auth = Blueprint('auth', __name__)
 
 # Import routes at the bottom to avoid circular imports
-from . import routes
+from . import routes, commands
 
 # This file serves as the entry point for the auth blueprint
 # All route handlers are defined in routes.py to keep the code organized
@@ -0,0 +1,41 @@
+"""
+E-KAY Platform - Commandes CLI de l'authentification (flask auth ...)
+"""
+
+import time
+
+import click
+
+from . import auth
+from .. import token_sweeper
+
+
+@auth.cli.command('sweep-tokens')
+@click.option('--batch-size', default=None, type=int, help='tokens par DELETE (TOKEN_SWEEP_BATCH_SIZE)')
+@click.option('--retention-hours', default=None, type=int, help='délai avant purge (TOKEN_RETENTION_HOURS)')
+def sweep_tokens_command(batch_size, retention_hours):
+    """Supprime par lots les tokens expirés ou utilisés (tâche périodique)"""
+    from flask import current_app
+
+    config = dict(current_app.config)
+    if batch_size is not None:
+        config['TOKEN_SWEEP_BATCH_SIZE'] = batch_size
+    if retention_hours is not None:
+        config['TOKEN_RETENTION_HOURS'] = retention_hours
+    started = time.perf_counter()
+    deleted = token_sweeper.run(config)
+    click.echo(f'{deleted} tokens supprimés en {time.perf_counter() - started:.1f} s')
+
+
+@auth.cli.command('token-stats')
+def token_stats_command():
+    """Affiche le nombre de tokens par type et état, et la taille de la table"""
+    from flask import current_app
+
+    stats = token_sweeper.token_stats(current_app.config.get('TOKEN_RETENTION_HOURS', 24))
+    for token_type, counts in sorted(stats['by_type'].items()):
+        click.echo(f"{token_type} : {counts['total']} ({counts['valid']} valides, {counts['used']} utilisés, "
+                   f"{counts['expired']} expirés, {counts['sweepable']} à purger)")
+    size = stats['table_bytes']
+    click.echo(f"total : {stats['total']} tokens, {stats['sweepable']} à purger, "
+               f"table : {'inconnue' if size is None else f'{size / 1024:.0f} Kio'}")
@@ -20,8 +20,11 @@ from ..models import User
 from .forms import (LoginForm, RegistrationForm, EditProfileForm,
                    ResetPasswordRequestForm, ResetPasswordForm, ResendVerificationForm, ChangePasswordForm)
 from ..email_utils import send_password_reset_email, send_verification_email
+from ..passwords import rehash_if_needed
+from ..rate_limit import rate_limit
 
 @auth.route('/login', methods=['GET', 'POST'])
+@rate_limit('login')
 def login():
     """Gère la connexion des utilisateurs"""
     if current_user.is_authenticated:
@@ -38,6 +41,10 @@ def login():
         if user is None or not user.check_password(form.password.data):
             flash('Nom d\'utilisateur/email ou mot de passe invalide', 'danger')
             return redirect(url_for('auth.login'))
+        
+        # Hash calculé avec d'anciens paramètres : recalcul avec le mot de passe vérifié
+        if rehash_if_needed(user, form.password.data):
+            db.session.commit()
             
         login_user(user, remember=form.remember_me.data)
         
@@ -51,6 +58,7 @@ def login():
 
 
 @auth.route('/reset_password_request', methods=['GET', 'POST'])
+@rate_limit('password_reset')
 def reset_password_request():
     if current_user.is_authenticated:
         return redirect(url_for('main.index'))
@@ -86,6 +94,7 @@ def verify_email(token):
     return redirect(url_for('auth.resend_verification'))
 
 @auth.route('/resend-verification', methods=['GET', 'POST'])
+@rate_limit('verification_email')
 def resend_verification():
     if current_user.is_authenticated and current_user.email_verified:
         return redirect(url_for('main.index'))
@@ -123,6 +132,7 @@ def reset_password(token):
     return render_template('auth/reset_password.html', form=form)
 
 @auth.route('/register', methods=['GET', 'POST'])
+@rate_limit('register')
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('main.index'))
@@ -0,0 +1,232 @@
+"""
+E-KAY Platform - Autocomplétion des villes et quartiers
+
+Index de préfixes en mémoire (tableaux triés + recherche dichotomique) pour
+``/api/cities`` et ``/api/neighborhoods``. Les clés sont normalisées sans
+accents ni ponctuation, de sorte que « petion v » trouve « Pétion-Ville ».
+Les résultats sont classés par popularité (nombre d'annonces).
+
+L'index est construit à la première requête puis maintenu de façon
+incrémentale à chaque commit qui crée, modifie ou supprime une propriété.
+Les écritures des autres processus incrémentent la génération partagée
+``autocomplete`` (voir ``generations``) : l'index du worker est alors
+reconstruit à la requête suivante.
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect
+
+from .extensions import db
+from .generations import Generation
+from .models import Property
+
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+# Compteur partagé des modifications des villes et quartiers (table cache_generations)
+GENERATION = 'autocomplete'
+
+
+def normalize(text):
+    """Normalise un texte pour la recherche : minuscules, sans accents ni ponctuation"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _SEPARATORS.sub(' ', text.casefold()).strip()
+
+
+class PrefixIndex:
+    """Ensemble de libellés pondérés interrogeable par préfixe"""
+
+    def __init__(self):
+        self.counts = Counter()
+        # Clés triées (clé normalisée, libellé) ; chaque mot du libellé est une entrée
+        self._keys = []
+
+    def _entries(self, label):
+        words = normalize(label).split()
+        return [(' '.join(words[i:]), label) for i in range(len(words))]
+
+    def add(self, label, count=1):
+        if not label:
+            return
+        if label not in self.counts:
+            for entry in self._entries(label):
+                insort(self._keys, entry)
+        self.counts[label] += count
+
+    def discard(self, label, count=1):
+        if label not in self.counts:
+            return
+        self.counts[label] -= count
+        if self.counts[label] <= 0:
+            del self.counts[label]
+            for entry in self._entries(label):
+                pos = bisect_left(self._keys, entry)
+                if pos < len(self._keys) and self._keys[pos] == entry:
+                    del self._keys[pos]
+
+    def lookup(self, prefix, limit=10):
+        """Retourne les libellés commençant par `prefix`, les plus populaires d'abord"""
+        prefix = normalize(prefix)
+        if not prefix:
+            matches = self.counts.keys()
+        else:
+            matches = set()
+            pos = bisect_left(self._keys, (prefix,))
+            while pos < len(self._keys) and self._keys[pos][0].startswith(prefix):
+                matches.add(self._keys[pos][1])
+                pos += 1
+        return sorted(matches, key=lambda label: (-self.counts[label], normalize(label), label))[:limit]
+
+
+class AutocompleteService:
+    """Index des villes et des quartiers (par ville) des annonces"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ready = False
+        self.generation = Generation(GENERATION)
+        self._reset()
+
+    def _reset(self):
+        self.cities = PrefixIndex()
+        self.neighborhoods = PrefixIndex()
+        self._by_city = {}
+
+    def build(self, session=None):
+        """Construit l'index à partir des comptes agrégés en base"""
+        session = session or db.session
+        generation = self.generation.read(session)  # avant les lignes, comme l'index de recherche
+        rows = session.query(
+            Property.city, Property.neighborhood, func.count(Property.id)
+        ).group_by(Property.city, Property.neighborhood).all()
+        with self._lock:
+            self._reset()
+            for city, neighborhood, count in rows:
+                self._add(city, neighborhood, count)
+            self.generation.built(generation)
+            self.ready = True
+
+    def _add(self, city, neighborhood, count=1):
+        self.cities.add(city, count)
+        if neighborhood:
+            self.neighborhoods.add(neighborhood, count)
+            self._by_city.setdefault(city, PrefixIndex()).add(neighborhood, count)
+
+    def _discard(self, city, neighborhood, count=1):
+        self.cities.discard(city, count)
+        if neighborhood:
+            self.neighborhoods.discard(neighborhood, count)
+            city_index = self._by_city.get(city)
+            if city_index is not None:
+                city_index.discard(neighborhood, count)
+                if not city_index.counts:
+                    del self._by_city[city]
+
+    def apply(self, removed=(), added=()):
+        """Applique des couples (ville, quartier) retirés puis ajoutés"""
+        with self._lock:
+            for city, neighborhood in removed:
+                self._discard(city, neighborhood)
+            for city, neighborhood in added:
+                self._add(city, neighborhood)
+
+    def complete_cities(self, prefix, limit=10):
+        with self._lock:
+            return self.cities.lookup(prefix, limit)
+
+    def complete_neighborhoods(self, prefix, city=None, limit=10):
+        with self._lock:
+            if city:
+                city_index = self._by_city.get(city)
+                return city_index.lookup(prefix, limit) if city_index else []
+            return self.neighborhoods.lookup(prefix, limit)
+
+
+def _previous(state, name):
+    """Valeur d'un attribut avant les modifications en attente"""
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.attrs[name].value
+
+
+def _current_service():
+    return current_app.extensions.get('autocomplete') if has_app_context() else None
+
+
+def _before_flush(session, flush_context, instances):
+    changes = session.info.setdefault('autocomplete_changes', ([], []))
+    removed, added = changes
+    count = len(removed) + len(added)
+    for obj in session.new:
+        if isinstance(obj, Property):
+            added.append((obj.city, obj.neighborhood))
+    for obj in session.deleted:
+        if isinstance(obj, Property):
+            state = inspect(obj)
+            removed.append((_previous(state, 'city'), _previous(state, 'neighborhood')))
+    for obj in session.dirty:
+        if isinstance(obj, Property):
+            state = inspect(obj)
+            if state.attrs.city.history.has_changes() or state.attrs.neighborhood.history.has_changes():
+                removed.append((_previous(state, 'city'), _previous(state, 'neighborhood')))
+                added.append((obj.city, obj.neighborhood))
+    service = _current_service()
+    if service is not None and len(removed) + len(added) > count:
+        service.generation.bump(session)
+
+
+def _after_commit(session):
+    changes = session.info.pop('autocomplete_changes', None)
+    service = _current_service()
+    if service is None:
+        return
+    if changes and service.ready:
+        service.apply(*changes)
+    service.generation.after_commit(session)
+
+
+def _after_rollback(session):
+    session.info.pop('autocomplete_changes', None)
+    service = _current_service()
+    if service is not None:
+        service.generation.after_rollback(session)
+
+
+_listeners_installed = False
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(db.session, 'before_flush', _before_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_rollback', _after_rollback)
+    _listeners_installed = True
+
+
+def init_app(app):
+    """Enregistre le service d'autocomplétion (construit à la première requête)"""
+    service = AutocompleteService()
+    app.extensions['autocomplete'] = service
+    _install_listeners()
+    return service
+
+
+def get_autocomplete():
+    """Retourne le service de l'application courante, reconstruit s'il est absent ou périmé"""
+    service = current_app.extensions['autocomplete']
+    if not service.ready or not service.generation.is_current():
+        service.build()
+    return service
@@ -0,0 +1,5 @@
+"""
+E-KAY Platform - Benchmarks
+
+Chaque module s'exécute avec ``python -m ekay_platform.benchmarks.<module>``.
+"""
@@ -0,0 +1,98 @@
+"""
+E-KAY Platform - Benchmark du filtre de prix annuel
+
+Compare l'ancien filtre de la page d'accueil (annual_price s'il est défini,
+sinon price * 12) à la colonne indexée effective_annual_price.
+
+Usage : python -m ekay_platform.benchmarks.bench_annual_price --rows 100000
+"""
+
+import argparse
+import random
+
+from sqlalchemy import text
+
+from ekay_platform import create_app
+from ekay_platform.extensions import db
+from ekay_platform.models import Property
+from ekay_platform.benchmarks.datagen import generate
+from ekay_platform.benchmarks.harness import measure, print_results
+
+
+def legacy_query(min_price, max_price):
+    """Filtre d'origine, qui ne peut pas utiliser d'index"""
+    return Property.query.filter_by(is_available=True).filter(
+        db.or_(
+            db.and_(Property.annual_price.isnot(None), Property.annual_price >= min_price),
+            db.and_(Property.annual_price.is_(None), Property.price * 12 >= min_price)
+        ),
+        db.or_(
+            db.and_(Property.annual_price.isnot(None), Property.annual_price <= max_price),
+            db.and_(Property.annual_price.is_(None), Property.price * 12 <= max_price)
+        )
+    )
+
+
+def indexed_query(min_price, max_price):
+    """Filtre sur la colonne maintenue par le modèle"""
+    return Property.query.filter_by(is_available=True).filter(
+        Property.effective_annual_price >= min_price,
+        Property.effective_annual_price <= max_price
+    )
+
+
+def query_plan(query):
+    statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--per-page', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        generate(users=1, properties=args.rows, images=0, bookings=0, rng=rng)
+
+        # Fourchettes étroites, typiques d'une recherche de budget
+        workload = []
+        for _ in range(args.queries):
+            low = rng.uniform(60000, 600000)
+            workload.append(((low, low * 1.1), None, rng.randint(1, 3)))
+
+        def run(build):
+            def fn(bounds, sort_by, page):
+                query = build(*bounds).order_by(Property.created_at.desc())
+                return query.paginate(page=page, per_page=args.per_page, error_out=False).items
+            return fn
+
+        for bounds, _, page in workload[:10]:
+            legacy = [p.id for p in run(legacy_query)(bounds, None, page)]
+            assert legacy == [p.id for p in run(indexed_query)(bounds, None, page)]
+
+        results = {
+            'COALESCE (ancien)': measure(run(legacy_query), workload),
+            'effective_annual_price': measure(run(indexed_query), workload),
+        }
+        plans = {
+            'COALESCE (ancien)': query_plan(legacy_query(100000, 110000)),
+            'effective_annual_price': query_plan(indexed_query(100000, 110000)),
+        }
+
+    print(f"{args.rows} propriétés, {args.queries} requêtes paginées")
+    print_results('Filtre', results)
+    for name, plan in plans.items():
+        print(f"\nPlan {name}:")
+        for line in plan:
+            print(f"  {line}")
+
+
+if __name__ == '__main__':
+    main()
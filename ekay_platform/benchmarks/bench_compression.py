@@ -0,0 +1,101 @@
+"""
+E-KAY Platform - Benchmark des octets transférés
+
+Remplit une base SQLite en mémoire avec le générateur synthétique puis
+demande la page d'accueil et des pages de la liste des annonces sans
+compression, en gzip et en brotli (si le paquet est installé), ainsi que
+les ressources statiques de base.html. Rapporte pour chaque page les
+octets reçus et la durée moyenne de la requête (compression comprise).
+
+Usage : python -m ekay_platform.benchmarks.bench_compression --properties 2000
+"""
+
+import argparse
+import random
+import re
+import shutil
+import tempfile
+import time
+
+from config import config as app_config
+from ekay_platform import compression, create_app
+from ekay_platform.extensions import db
+from ekay_platform.benchmarks.datagen import generate
+
+PAGES = {
+    'accueil': ('/', None),
+    'liste': ('/properties/', None),
+    'liste page 3': ('/properties/', {'page': 3, 'sort_by': 'price_asc'}),
+}
+STATIC_URL = re.compile(r'(?:href|src)="(/static/[^"]+\.(?:css|js))"')
+
+
+def bench_app(workdir):
+    class BenchConfig(app_config['testing']):
+        COMPRESS_RESPONSES = True
+        COMPRESS_MIN_SIZE = 1024
+        COMPRESS_LEVEL = 6
+        COMPRESS_BR_QUALITY = 4
+        COMPRESS_MIMETYPES = ['text/html', 'application/json']
+        STATIC_PRECOMPRESSED = True
+
+    app_config['bench'] = BenchConfig
+    try:
+        app = create_app('bench')
+    finally:
+        del app_config['bench']
+    # Copie de static/ : les variantes précompressées ne sont pas écrites dans l'arbre
+    app.static_folder = shutil.copytree(app.static_folder, f'{workdir}/static',
+                                        ignore=shutil.ignore_patterns('uploads'))
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--properties', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    encodings = ('identity',) + tuple(reversed(compression.available_encodings()))
+    workdir = tempfile.mkdtemp(prefix='ekay-static-')
+    try:
+        app = bench_app(workdir)
+        client = app.test_client()
+        with app.app_context():
+            db.create_all()
+            generate(users=20, properties=args.properties, images=0, bookings=0, rng=random.Random(args.seed))
+
+        html = client.get('/').get_data(as_text=True)
+        assets = sorted(set(STATIC_URL.findall(html)))
+        manifest = app.extensions.get('assets_manifest')
+        compression.precompress(app.static_folder, manifest.files if manifest else [url[len('/static/'):] for url in assets])
+
+        print(f"{'Ressource':<22}" + ''.join(f'{encoding:>12}' for encoding in encodings) + f"{'ms (gzip)':>12}")
+        totals = dict.fromkeys(encodings, 0)
+        for name, (path, params) in list(PAGES.items()) + [('static (base.html)', (None, None))]:
+            sizes, elapsed = {}, 0.0
+            for encoding in encodings:
+                headers = {'Accept-Encoding': encoding}
+                start = time.perf_counter()
+                for _ in range(args.iterations if path else 1):
+                    urls = [path] if path else assets
+                    size = 0
+                    for url in urls:
+                        response = client.get(url, query_string=params, headers=headers)
+                        assert response.status_code == 200, (url, response.status_code)
+                        size += len(response.get_data())
+                        response.close()
+                if encoding == 'gzip':
+                    elapsed = (time.perf_counter() - start) * 1000 / (args.iterations if path else 1)
+                sizes[encoding] = size
+                totals[encoding] += size
+            print(f'{name:<22}' + ''.join(f'{sizes[encoding]:>12,}' for encoding in encodings) + f'{elapsed:>12.1f}')
+        print(f"{'total':<22}" + ''.join(f'{totals[encoding]:>12,}' for encoding in encodings))
+        print(f'{args.properties} propriétés, {len(assets)} ressources statiques, octets du corps de la réponse')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+E-KAY Platform - Benchmark de l'index de recherche
+
+Compare le chemin SQL de ``list_properties`` à l'index colonnaire en mémoire
+sur un jeu de propriétés synthétiques.
+
+Usage : python -m ekay_platform.benchmarks.bench_search_index --rows 20000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from ekay_platform import create_app
+from ekay_platform.extensions import db
+from ekay_platform.models import Property
+from ekay_platform.search_index import (
+    AMENITY_FIELDS, SORT_OPTIONS, PropertySearchIndex, filter_query, order_query
+)
+from ekay_platform.benchmarks.datagen import PROPERTY_TYPES, generate
+from ekay_platform.benchmarks.harness import measure, print_results
+
+
+def random_criteria(rng):
+    """Génère une combinaison de filtres comparable à celle du formulaire"""
+    criteria = {'amenities': tuple(f for f in AMENITY_FIELDS if rng.random() < 0.15)}
+    if rng.random() < 0.5:
+        criteria['property_type'] = rng.choice(list(PROPERTY_TYPES))
+    if rng.random() < 0.5:
+        criteria['min_price'] = rng.uniform(60000, 240000)
+    if rng.random() < 0.5:
+        criteria['max_price'] = rng.uniform(240000, 960000)
+    if rng.random() < 0.3:
+        criteria['min_rooms'] = rng.randint(1, 5)
+    if rng.random() < 0.2:
+        criteria['available_before'] = datetime.utcnow()
+    return criteria
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--per-page', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        generate(users=1, properties=args.rows, images=0, bookings=0, rng=rng)
+
+        start = time.perf_counter()
+        index = PropertySearchIndex()
+        index.build()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        workload = [(random_criteria(rng), rng.choice(SORT_OPTIONS), rng.randint(1, 3))
+                    for _ in range(args.queries)]
+
+        def sql_path(criteria, sort_by, page):
+            query = filter_query(Property.query.filter_by(is_available=True), criteria)
+            return order_query(query, sort_by).paginate(
+                page=page, per_page=args.per_page, error_out=False).items
+
+        def index_path(criteria, sort_by, page):
+            ids, _ = index.search(criteria, sort_by, page, args.per_page)
+            return Property.query.filter(Property.id.in_(ids)).all() if ids else []
+
+        def index_ids_only(criteria, sort_by, page):
+            return index.search(criteria, sort_by, page, args.per_page)
+
+        # Vérifier que les deux chemins renvoient les mêmes pages
+        for criteria, sort_by, page in workload[:20]:
+            expected = [p.id for p in sql_path(criteria, sort_by, page)]
+            assert expected == index_ids_only(criteria, sort_by, page)[0], (criteria, sort_by)
+
+        results = {
+            'SQL (paginate)': measure(sql_path, workload),
+            'Index + chargement': measure(index_path, workload),
+            'Index (ids seuls)': measure(index_ids_only, workload),
+        }
+
+    print(f"{args.rows} propriétés, {index.count} indexées, construction {build_ms:.1f} ms")
+    print_results('Chemin', results, width=22)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+E-KAY Platform - Benchmark de concurrence en écriture sur SQLite
+
+Compare, sur une base fichier remplie par le générateur synthétique, le
+comportement par défaut de SQLite (journal rollback, ``synchronous=FULL``)
+et le profil ``SQLITE_PRAGMAS`` de config.py (WAL, ``synchronous=NORMAL``,
+cache, mmap).
+
+Des threads écrivains enchaînent de petites transactions comparables à
+celles de l'application (compteur de vues, réservation) pendant que des
+threads lecteurs exécutent la requête de la page de liste. Chaque profil
+rapporte le débit d'écritures et de lectures, les percentiles de latence et
+les erreurs « database is locked ».
+
+Usage : python -m ekay_platform.benchmarks.bench_sqlite_writes --writers 4 --readers 8 --duration 10
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from ekay_platform.db_tuning import install_pragmas
+from ekay_platform.extensions import db
+from ekay_platform.models import Booking, Property, User
+from ekay_platform.benchmarks.datagen import CITIES, property_record
+
+PROFILES = {
+    'défaut': {},
+    'SQLITE_PRAGMAS': Config.SQLITE_PRAGMAS,
+}
+
+VIEW_SQL = text('UPDATE properties SET view_count = view_count + 1 WHERE id = :id')
+LIST_SQL = text(
+    'SELECT id, title, price, city FROM properties '
+    'WHERE city = :city AND is_available = 1 ORDER BY created_at DESC LIMIT 12'
+)
+
+
+def create_database(path, properties, seed):
+    """Crée le schéma et les propriétés (sans pragmas : le fichier reste neutre)"""
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [{
+            'username': 'user1', 'email': 'user1@example.com', 'password_hash': 'x', 'created_at': now,
+        }])
+        connection.execute(Property.__table__.insert(), [
+            property_record(rng, i + 1, 1, now) for i in range(properties)
+        ])
+    engine.dispose()
+
+
+def run_profile(path, pragmas, writers, readers, duration, properties, seed):
+    """Lance écrivains et lecteurs sur une copie de la base"""
+    # Une connexion par thread : seule la base limite la concurrence
+    engine = create_engine(f'sqlite:///{path}', pool_size=writers + readers, max_overflow=0)
+    if pragmas:
+        install_pragmas(engine, pragmas)
+    samples = {'write': [], 'read': []}
+    errors = {'write': 0, 'read': 0}
+    deadline = time.monotonic() + duration
+
+    def writer(index):
+        rng = random.Random(seed * 100 + index)
+        today = date.today()
+        while time.monotonic() < deadline:
+            property_id = rng.randint(1, properties)
+            start_date = today + timedelta(days=rng.randint(1, 365))
+            start = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(VIEW_SQL, {'id': property_id})
+                    if rng.random() < 0.2:
+                        connection.execute(Booking.__table__.insert(), {
+                            'property_id': property_id, 'user_id': 1,
+                            'start_date': start_date, 'end_date': start_date + timedelta(days=7),
+                            'guests': 2, 'status': 'pending',
+                            'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow(),
+                        })
+            except OperationalError:
+                errors['write'] += 1
+                continue
+            samples['write'].append(time.perf_counter() - start)
+
+    def reader(index):
+        rng = random.Random(seed * 1000 + index)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(LIST_SQL, {'city': rng.choice(list(CITIES))}).fetchall()
+            except OperationalError:
+                errors['read'] += 1
+                continue
+            samples['read'].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    engine.dispose()
+
+    results = {}
+    for kind, durations in samples.items():
+        durations.sort()
+        results[kind] = {
+            'count': len(durations),
+            'errors': errors[kind],
+            'per_second': len(durations) / elapsed,
+            'p50': durations[len(durations) // 2] * 1000 if durations else 0.0,
+            'p95': durations[int(len(durations) * 0.95)] * 1000 if durations else 0.0,
+        }
+    return results
+
+
+def print_report(report):
+    print(f"{'Profil':<18}{'type':<8}{'ops/s':>10}{'erreurs':>9}{'p50 (ms)':>11}{'p95 (ms)':>11}")
+    for profile, results in report.items():
+        for kind, stats in results.items():
+            print(f"{profile:<18}{kind:<8}{stats['per_second']:>10.1f}{stats['errors']:>9}"
+                  f"{stats['p50']:>11.2f}{stats['p95']:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrence en écriture SQLite : défaut contre SQLITE_PRAGMAS')
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help='secondes par profil')
+    parser.add_argument('--properties', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='fichier où enregistrer les résultats')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ekay-sqlite-')
+    try:
+        template = os.path.join(workdir, 'template.db')
+        create_database(template, args.properties, args.seed)
+        report = {}
+        for name, pragmas in PROFILES.items():
+            # Chaque profil part d'une copie identique : le mode WAL est persistant
+            path = os.path.join(workdir, f'{len(report)}.db')
+            shutil.copy(template, path)
+            report[name] = run_profile(path, pragmas, args.writers, args.readers,
+                                       args.duration, args.properties, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f'{args.writers} écrivains, {args.readers} lecteurs, {args.duration:g} s par profil')
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+E-KAY Platform - Suite de benchmarks des chemins principaux
+
+Remplit une base SQLite en mémoire avec le générateur synthétique puis
+mesure, avec une graine fixe :
+
+- la page de liste des propriétés (filtres et tris aléatoires) ;
+- la page de détail d'une propriété ;
+- ``is_property_available`` ;
+- l'autocomplétion des villes ;
+- ``Property.to_dict``.
+
+Chaque ligne donne p50/p95 en ms et le nombre moyen de requêtes SQL par
+appel. ``--json`` enregistre les résultats pour comparer deux exécutions.
+
+Usage : python -m ekay_platform.benchmarks.bench_suite --properties 5000 --json bench.json
+"""
+
+import argparse
+import json
+import random
+from datetime import date, timedelta
+
+from ekay_platform import create_app
+from ekay_platform.extensions import db
+from ekay_platform.models import Property
+from ekay_platform.properties.routes import is_property_available
+from ekay_platform.benchmarks.datagen import CITIES, generate
+from ekay_platform.benchmarks.harness import measure, print_results
+from ekay_platform.search_index import SORT_OPTIONS
+
+AMENITY_ARGS = ['has_pool', 'has_parking', 'is_furnished', 'has_garden']
+
+
+def list_workload(rng, count):
+    """Paramètres de /properties/ comparables à ceux du formulaire de recherche"""
+    workload = []
+    for _ in range(count):
+        params = {'sort_by': rng.choice(SORT_OPTIONS), 'page': rng.randint(1, 3)}
+        if rng.random() < 0.4:
+            params['city'] = rng.choice(list(CITIES))
+        if rng.random() < 0.4:
+            params['min_price'] = rng.choice([100000, 200000, 300000])
+        if rng.random() < 0.3:
+            params['min_rooms'] = rng.randint(1, 4)
+        for amenity in AMENITY_ARGS:
+            if rng.random() < 0.1:
+                params[amenity] = 'y'
+        workload.append((params,))
+    return workload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--properties', type=int, default=5000)
+    parser.add_argument('--bookings', type=int, default=10000)
+    parser.add_argument('--images', type=float, default=3)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='fichier où enregistrer les résultats')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    app = create_app('testing')
+    app.config['WTF_CSRF_ENABLED'] = False
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        counts = generate(args.users, args.properties, args.images, args.bookings, rng=rng)
+        property_ids = [pid for pid, in db.session.query(Property.id)]
+
+    n = args.iterations
+
+    def get(path, params=None):
+        response = client.get(path, query_string=params)
+        assert response.status_code == 200, (path, params, response.status_code)
+
+    def available(property_id, start, end):
+        with app.app_context():
+            is_property_available(property_id, start, end)
+
+    def to_dict(property_id):
+        # to_dict construit des URL d'images : il faut un contexte de requête
+        with app.test_request_context():
+            Property.query.get(property_id).to_dict()
+
+    today = date.today()
+    prefixes = ['p', 'po', 'pe', 'ca', 'de', 'ja', 'ta', 'go', 'les', 'k']
+    results = {
+        'list_properties': measure(lambda params: get('/properties/', params), list_workload(rng, n)),
+        'view_property': measure(lambda pid: get(f'/properties/{pid}'),
+                                 [(rng.choice(property_ids),) for _ in range(n)]),
+        'is_property_available': measure(available, [
+            (rng.choice(property_ids), start, start + timedelta(days=rng.randint(1, 14)))
+            for start in (today + timedelta(days=rng.randint(-30, 120)) for _ in range(n))
+        ]),
+        'api_cities': measure(lambda q: get('/properties/api/cities', {'q': q}),
+                              [(rng.choice(prefixes),) for _ in range(n)]),
+        'to_dict': measure(to_dict, [(rng.choice(property_ids),) for _ in range(n)]),
+    }
+
+    print(', '.join(f'{count} {name}' for name, count in counts.items()) + f', {n} itérations')
+    print_results('Benchmark', results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'dataset': counts, 'seed': args.seed, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+E-KAY Platform - Générateur de données synthétiques
+
+Produit de façon reproductible (graine fixe) des utilisateurs, propriétés,
+images et réservations, insérés par lots. Les distributions imitent le
+marché : prix log-normaux dépendant de la ville, du type de bien et du
+nombre de pièces, équipements plus fréquents sur les biens haut de gamme,
+quartiers réels des principales villes d'Haïti.
+
+Les insertions passent par le Core SQLAlchemy : les colonnes dérivées
+(neighborhood, effective_annual_price) sont calculées ici avec les mêmes
+fonctions que les validateurs du modèle.
+
+Usage : python -m ekay_platform.benchmarks.datagen --config development --properties 5000
+"""
+
+import argparse
+import random
+from datetime import date, datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from ekay_platform.extensions import db
+from ekay_platform.models import Booking, Property, PropertyImage, User
+
+# Ville : (poids dans l'offre, facteur de prix, quartiers)
+CITIES = {
+    'Port-au-Prince': (20, 1.0, ['Bois-Verna', 'Turgeau', 'Pacot', 'Canapé-Vert', 'Bourdon', 'Lalue']),
+    'Pétion-Ville': (18, 1.6, ['Juvenat', 'Thomassin', 'Morne Calvaire', 'Vivy Mitchell', 'Laboule']),
+    'Delmas': (15, 0.9, ['Delmas 33', 'Delmas 60', 'Delmas 75', 'Delmas 95']),
+    'Tabarre': (8, 1.1, ['Tabarre 27', 'Clercine', 'Tabarre 48']),
+    'Kenscoff': (4, 1.3, ['Fermathe', 'Furcy']),
+    'Cap-Haïtien': (10, 0.8, ['Carénage', 'Vaudreuil', 'Petite Anse']),
+    'Jacmel': (7, 0.7, ['Bas-Ville', 'Cyvadier', 'Bord de Mer']),
+    'Les Cayes': (6, 0.6, ['Gelée', 'Bergeaud']),
+    'Gonaïves': (5, 0.55, ['Raboteau', 'Bienac']),
+    'Saint-Marc': (4, 0.55, ['Portail Guêpe', 'Pivert']),
+    'Caracol': (3, 0.5, []),
+}
+# Type : (poids, facteur de prix, pièces min, pièces max)
+PROPERTY_TYPES = {
+    'apartment': (35, 1.0, 1, 5),
+    'house': (30, 1.3, 2, 8),
+    'studio': (15, 0.6, 1, 1),
+    'villa': (7, 2.8, 4, 12),
+    'commercial': (8, 1.8, 1, 10),
+    'land': (5, 0.8, 1, 1),
+}
+# Équipement : probabilité de base (multipliée pour les biens haut de gamme)
+AMENITIES = {
+    'has_kitchen': 0.8, 'has_parking': 0.45, 'has_garden': 0.3, 'has_balcony': 0.35,
+    'has_pool': 0.06, 'is_furnished': 0.3, 'has_air_conditioning': 0.25,
+    'has_internet': 0.4, 'has_security': 0.3, 'has_elevator': 0.08,
+}
+STREETS = ['Rue Capois', 'Rue Lamarre', 'Avenue John Brown', 'Route de Frères',
+           'Rue Grégoire', 'Avenue Panaméricaine', 'Rue Faubert', 'Route de Kenscoff']
+
+BATCH_SIZE = 5000
+
+
+def _weighted(rng, table):
+    names = list(table)
+    return rng.choices(names, weights=[table[n][0] for n in names])[0]
+
+
+def _insert(table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def property_record(rng, index, user_id, now):
+    """Une ligne de la table properties"""
+    city = _weighted(rng, CITIES)
+    _, city_factor, neighborhoods = CITIES[city]
+    property_type = _weighted(rng, PROPERTY_TYPES)
+    _, type_factor, min_rooms, max_rooms = PROPERTY_TYPES[property_type]
+    rooms = rng.randint(min_rooms, max_rooms)
+
+    price = round(rng.lognormvariate(9.6, 0.45) * city_factor * type_factor * (1 + 0.15 * rooms), -2)
+    annual_price = round(price * rng.uniform(10, 11.5), -2) if rng.random() < 0.3 else None
+    premium = price > 60000
+
+    street = f'{rng.randint(1, 150)} {rng.choice(STREETS)}'
+    address = f'{rng.choice(neighborhoods)}, {street}' if neighborhoods and rng.random() < 0.85 else street
+    created_at = now - timedelta(minutes=rng.randint(0, 2 * 525600))
+    record = {
+        'title': f'{property_type.capitalize()} {rooms} pièces à {city} #{index}',
+        'description': ' '.join(rng.choices(
+            ['Lumineux', 'calme', 'proche des commerces', 'vue dégagée', 'rénové',
+             'sécurisé', 'accès facile', 'grande cour', 'citerne', 'génératrice'], k=rng.randint(8, 40))),
+        'property_type': property_type,
+        'transaction_type': 'rent',
+        'status': 'published',
+        'price': price,
+        'annual_price': annual_price,
+        'price_type': 'annual' if annual_price is not None else 'monthly',
+        'effective_annual_price': Property.compute_effective_annual_price(price, annual_price),
+        'rooms': rooms,
+        'bedrooms': max(1, rooms - 1),
+        'area': None if rng.random() < 0.1 else round(rooms * rng.uniform(12, 35), 1),
+        'address': address,
+        'neighborhood': Property.extract_neighborhood(address),
+        'city': city,
+        'country': 'Haiti',
+        'is_available': rng.random() < 0.9,
+        'is_featured': rng.random() < 0.05,
+        'view_count': int(rng.paretovariate(1.2)) - 1,
+        'created_at': created_at,
+        'published_at': created_at,
+        'available_from': now + timedelta(days=rng.randint(-60, 60)),
+        'user_id': user_id,
+    }
+    for field, probability in AMENITIES.items():
+        record[field] = rng.random() < min(0.95, probability * (2.5 if premium else 1))
+    return record
+
+
+def generate(users=50, properties=1000, images=3, bookings=1000, seed=42, rng=None):
+    """Insère un jeu de données synthétique et retourne les nombres de lignes créées
+
+    `images` est le nombre moyen d'images par propriété (0 pour aucune).
+    """
+    rng = rng or random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash('password')
+
+    first_user = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+    _insert(User.__table__, [{
+        'username': f'user{first_user + i}',
+        'email': f'user{first_user + i}@example.com',
+        'password_hash': password_hash,
+        'is_landlord': i % 3 == 0,
+        'email_verified': True,
+        'created_at': now - timedelta(days=rng.randint(0, 730)),
+    } for i in range(users)])
+    user_ids = list(range(first_user, first_user + users))
+    landlord_ids = user_ids[::3]
+
+    first_property = (db.session.query(db.func.max(Property.id)).scalar() or 0) + 1
+    _insert(Property.__table__, [
+        property_record(rng, first_property + i, rng.choice(landlord_ids), now)
+        for i in range(properties)
+    ])
+    property_ids = list(range(first_property, first_property + properties))
+
+    image_rows = []
+    for property_id in property_ids if images else ():
+        for position in range(min(12, int(rng.expovariate(1 / images)))):
+            filename = f'{property_id}-{position}.jpg'
+            image_rows.append({
+                'filename': filename,
+                'original_filename': filename,
+                'file_size': rng.randint(80000, 900000),
+                'content_type': 'image/jpeg',
+                'width': 1200,
+                'height': 900,
+                'is_primary': position == 0,
+                'position': position,
+                'created_at': now,
+                'property_id': property_id,
+            })
+    _insert(PropertyImage.__table__, image_rows)
+
+    booking_rows = []
+    today = date.today()
+    for _ in range(bookings if property_ids else 0):
+        start = today + timedelta(days=rng.randint(-180, 180))
+        booking_rows.append({
+            'property_id': rng.choice(property_ids),
+            'user_id': rng.choice(user_ids),
+            'start_date': start,
+            'end_date': start + timedelta(days=rng.randint(1, 30)),
+            'guests': rng.randint(1, 6),
+            'status': rng.choices(['pending', 'confirmed', 'cancelled', 'completed'], [3, 5, 1, 2])[0],
+            'created_at': now,
+            'updated_at': now,
+        })
+    _insert(Booking.__table__, booking_rows)
+
+    db.session.commit()
+    return {'users': users, 'properties': properties, 'images': len(image_rows), 'bookings': len(booking_rows)}
+
+
+def main():
+    from ekay_platform import create_app
+
+    parser = argparse.ArgumentParser(description='Remplit la base configurée avec des données synthétiques')
+    parser.add_argument('--config', default='development')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--properties', type=int, default=1000)
+    parser.add_argument('--images', type=float, default=3)
+    parser.add_argument('--bookings', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+        counts = generate(args.users, args.properties, args.images, args.bookings, args.seed)
+    print(', '.join(f'{count} {name}' for name, count in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
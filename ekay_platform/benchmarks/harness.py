@@ -0,0 +1,35 @@
+"""
+E-KAY Platform - Outils communs des benchmarks
+"""
+
+import statistics
+import time
+
+from ekay_platform.sql_stats import collect_queries
+
+
+def measure(fn, workload):
+    """Exécute `fn(*args)` pour chaque entrée de `workload` ; temps en ms et requêtes SQL par appel"""
+    timings = []
+    queries = []
+    for args in workload:
+        with collect_queries() as stats:
+            start = time.perf_counter()
+            fn(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(stats.count)
+    timings.sort()
+    return {
+        'mean': statistics.mean(timings),
+        'p50': timings[len(timings) // 2],
+        'p95': timings[max(0, int(len(timings) * 0.95) - 1)],
+        'queries': statistics.mean(queries),
+    }
+
+
+def print_results(title, results, width=26):
+    """Affiche un tableau nom / moyenne / p50 / p95 / requêtes SQL"""
+    print(f"{title:<{width}}{'moy. (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}{'requêtes':>10}")
+    for name, stats in results.items():
+        print(f"{name:<{width}}{stats['mean']:>12.3f}{stats['p50']:>12.3f}"
+              f"{stats['p95']:>12.3f}{stats['queries']:>10.1f}")
@@ -0,0 +1,297 @@
+"""
+E-KAY Platform - Test de charge de bout en bout
+
+Lance un serveur gunicorn local sur une base SQLite remplie par le
+générateur synthétique (ou cible un serveur existant avec ``--url``), puis
+simule des visiteurs concurrents. Chaque visiteur enchaîne des parcours tirés
+selon un mélange pondéré :
+
+- browse : page d'accueil puis une page de la liste ;
+- search : autocomplétion d'une ville puis liste filtrée et triée ;
+- detail : fiche d'une propriété ;
+- favourite : ajout/retrait d'un favori (connecté) ;
+- book : formulaire de réservation puis envoi (connecté).
+
+Le rapport donne, par parcours et par étape, le débit et les percentiles de
+latence, pour dimensionner les workers.
+
+Usage :
+    python -m ekay_platform.benchmarks.loadtest --users 20 --duration 30 --workers 4 --worker-class gthread --threads 4
+    python -m ekay_platform.benchmarks.loadtest --url http://127.0.0.1:8000 --users 50
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import requests
+
+from ekay_platform.benchmarks.datagen import CITIES
+
+DEFAULT_MIX = 'browse=35,search=25,detail=30,favourite=5,book=5'
+SORTS = ['newest', 'price_asc', 'price_desc', 'area_desc']
+
+_CSRF = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+class Visitor:
+    """Un visiteur : session HTTP persistante et mesures de ses étapes"""
+
+    def __init__(self, base_url, rng, context, records):
+        self.base_url = base_url.rstrip('/')
+        self.rng = rng
+        self.context = context
+        self.records = records
+        self.http = requests.Session()
+        self.logged_in = False
+
+    def step(self, scenario, name, method, path, expect=(200,), **kwargs):
+        """Exécute une requête et enregistre (parcours, étape, durée, succès)"""
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, allow_redirects=False,
+                                         timeout=30, **kwargs)
+            ok = response.status_code in expect
+        except requests.RequestException:
+            response, ok = None, False
+        self.records.append((scenario, name, time.perf_counter() - start, ok))
+        return response if ok else None
+
+    def login(self, scenario):
+        if self.logged_in:
+            return True
+        page = self.step(scenario, 'login_form', 'GET', '/auth/login')
+        token = page is not None and _CSRF.search(page.text)
+        if not token:
+            return False
+        username = f"user{self.rng.choice(self.context['user_ids'])}"
+        self.logged_in = self.step(scenario, 'login', 'POST', '/auth/login', expect=(302,), data={
+            'username': username, 'password': 'password', 'csrf_token': token.group(1),
+        }) is not None
+        return self.logged_in
+
+    def property_id(self):
+        return self.rng.choice(self.context['property_ids'])
+
+    def browse(self):
+        self.step('browse', 'index', 'GET', '/')
+        self.step('browse', 'list', 'GET', '/properties/', params={'page': self.rng.randint(1, 5)})
+
+    def search(self):
+        city = self.rng.choice(list(CITIES))
+        self.step('search', 'autocomplete', 'GET', '/properties/api/cities', params={'q': city[:2]})
+        self.step('search', 'list_filtered', 'GET', '/properties/', params={
+            'city': city, 'sort_by': self.rng.choice(SORTS), 'min_rooms': self.rng.randint(1, 4),
+        })
+
+    def detail(self):
+        self.step('detail', 'view', 'GET', f'/properties/{self.property_id()}')
+
+    def favourite(self):
+        if self.login('favourite'):
+            self.step('favourite', 'toggle', 'POST', f'/properties/{self.property_id()}/favorite')
+
+    def book(self):
+        if not self.login('book'):
+            return
+        property_id = self.property_id()
+        # Une propriété indisponible redirige vers sa fiche : c'est un résultat attendu
+        page = self.step('book', 'form', 'GET', f'/properties/property/{property_id}/book', expect=(200, 302))
+        token = page is not None and page.status_code == 200 and _CSRF.search(page.text)
+        if not token:
+            return
+        start = date.today() + timedelta(days=self.rng.randint(1, 365))
+        self.step('book', 'submit', 'POST', f'/properties/property/{property_id}/book', expect=(200, 302), data={
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=self.rng.randint(1, 14))).isoformat(),
+            'guests': self.rng.randint(1, 4),
+            'csrf_token': token.group(1),
+        })
+
+
+def run_visitors(base_url, context, mix, users, duration, seed):
+    """Fait tourner `users` visiteurs pendant `duration` secondes"""
+    scenarios, weights = zip(*mix.items())
+    records = []
+    deadline = time.monotonic() + duration
+
+    def visitor_loop(index):
+        rng = random.Random(seed * 1000 + index)
+        visitor = Visitor(base_url, rng, context, records)
+        while time.monotonic() < deadline:
+            scenario = rng.choices(scenarios, weights)[0]
+            start = time.perf_counter()
+            getattr(visitor, scenario)()
+            records.append((scenario, None, time.perf_counter() - start, True))
+
+    threads = [threading.Thread(target=visitor_loop, args=(i,), daemon=True) for i in range(users)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.monotonic() - started
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def summarize(records, elapsed):
+    """Débit et percentiles par parcours (étape None) et par étape"""
+    groups = defaultdict(list)
+    errors = defaultdict(int)
+    for scenario, name, duration, ok in records:
+        groups[(scenario, name)].append(duration)
+        if not ok:
+            errors[(scenario, name)] += 1
+    report = {}
+    for (scenario, name), durations in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or '')):
+        durations.sort()
+        report[f'{scenario}' if name is None else f'{scenario}.{name}'] = {
+            'count': len(durations),
+            'errors': errors[(scenario, name)],
+            'rps': len(durations) / elapsed,
+            'p50': _percentile(durations, 0.50),
+            'p95': _percentile(durations, 0.95),
+            'p99': _percentile(durations, 0.99),
+        }
+    requests_total = sum(1 for _, name, _, _ in records if name is not None)
+    return {'elapsed': elapsed, 'requests': requests_total, 'rps': requests_total / elapsed, 'results': report}
+
+
+def print_report(summary):
+    print(f"{summary['requests']} requêtes en {summary['elapsed']:.1f} s, {summary['rps']:.1f} req/s")
+    print(f"{'Parcours / étape':<28}{'nombre':>8}{'erreurs':>9}{'req/s':>9}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}")
+    for name, stats in summary['results'].items():
+        label = name if '.' not in name else '  ' + name.split('.', 1)[1]
+        print(f"{label:<28}{stats['count']:>8}{stats['errors']:>9}{stats['rps']:>9.1f}"
+              f"{stats['p50']:>11.1f}{stats['p95']:>11.1f}{stats['p99']:>11.1f}")
+
+
+def seed_database(path, args):
+    """Remplit une base SQLite neuve avec le générateur (dans un processus séparé)"""
+    subprocess.run([
+        sys.executable, '-m', 'ekay_platform.benchmarks.datagen', '--config', 'production',
+        '--users', str(args.accounts), '--properties', str(args.properties),
+        '--images', str(args.images), '--bookings', str(args.bookings), '--seed', str(args.seed),
+    ], env=dict(os.environ, DATABASE_URL=f'sqlite:///{path}'), check=True)
+
+
+def visitor_context(args):
+    """Identifiants des comptes et propriétés créés par le générateur sur une base vide"""
+    return {
+        'user_ids': list(range(1, args.accounts + 1)),
+        'property_ids': list(range(1, args.properties + 1)),
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(database_path, args):
+    """Démarre gunicorn sur un port libre et attend qu'il réponde"""
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+               "ekay_platform:create_app('production')"]
+    # Réglages passés comme en production, par l'environnement lu par gunicorn.conf.py
+    env = dict(
+        os.environ,
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_ACCESS_LOG='',
+        GUNICORN_LOG_LEVEL='warning',
+        DATABASE_URL=f'sqlite:///{database_path}',
+        SECRET_KEY='loadtest',
+        MAIL_SUPPRESS_SEND='true',
+        # Les visiteurs simulés partagent une IP : la limitation les refuserait en 429
+        RATE_LIMIT_ENABLED='false',
+    )
+    # Répertoire des métriques laissé à gunicorn.conf.py, comme en production
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    process = subprocess.Popen(command, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn s\'est arrêté (code {process.returncode})')
+        try:
+            requests.get(base_url + '/properties/api/cities', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn ne répond pas')
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if not hasattr(Visitor, name.strip()):
+            raise argparse.ArgumentTypeError(f'parcours inconnu : {name}')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test de charge de bout en bout')
+    parser.add_argument('--url', help='serveur existant (sinon gunicorn est lancé localement)')
+    parser.add_argument('--users', type=int, default=20, help='visiteurs simultanés')
+    parser.add_argument('--duration', type=float, default=30, help='durée en secondes')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--accounts', type=int, default=200, help='comptes générés')
+    parser.add_argument('--properties', type=int, default=5000)
+    parser.add_argument('--images', type=float, default=3)
+    parser.add_argument('--bookings', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='fichier où enregistrer le rapport')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ekay-loadtest-')
+    process = None
+    try:
+        if args.url:
+            # La base cible doit avoir été remplie par datagen avec les mêmes volumes
+            base_url = args.url
+        else:
+            database_path = os.path.join(workdir, 'loadtest.db')
+            seed_database(database_path, args)
+            process, base_url = start_gunicorn(database_path, args)
+        records, elapsed = run_visitors(base_url, visitor_context(args), args.mix,
+                                        args.users, args.duration, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(records, elapsed)
+    summary['server'] = args.url or f'gunicorn {args.workers} x {args.worker_class} ({args.threads} threads)'
+    print(summary['server'])
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+E-KAY Platform - Regroupement et minification des CSS et JS
+
+Chaque page chargeait sept feuilles de style et plusieurs scripts, autant
+d'allers-retours sur une connexion mobile lente. ``BUNDLES`` décrit un
+paquet par type de page (``site`` pour toutes, ``home`` pour l'accueil) :
+les fichiers sont concaténés dans l'ordre de la cascade d'origine,
+minifiés et écrits dans ``static/dist/`` avec leur source map
+(``dist/home.css`` + ``dist/home.css.map``). ``style.css`` forme un paquet
+à part (``style``), inclus après le bloc ``extra_css`` des pages : il
+garde la priorité sur leurs feuilles propres, comme avant le regroupement.
+
+- Construction : ``flask assets build`` (avant les empreintes et la
+  précompression), ou au démarrage si un paquet manque ou est plus ancien
+  que l'une de ses sources.
+- Templates : ``bundle_urls(page_bundle, 'css')`` renvoie l'URL du paquet
+  (à empreinte, voir ``assets``), ou celles des fichiers sources si
+  ``ASSETS_BUNDLES`` est désactivé (développement). Une page choisit son
+  paquet par ``{% set page_bundle = 'home' %}`` en tête de template.
+- Minification en Python pur, prudente : commentaires, indentation et
+  lignes vides supprimés, espaces inutiles du CSS retirés (une ligne par
+  fichier CSS, une ligne par ligne conservée en JS). Les source maps
+  pointent vers la ligne d'origine de chaque fragment ; gzip/brotli
+  (``compression``) fait le reste.
+"""
+
+import json
+import os
+import re
+
+from flask import current_app, url_for
+
+OUTPUT_DIR = 'dist'
+
+# Paquet -> type -> fichiers de static/, dans l'ordre de chargement
+BUNDLES = {
+    'site': {
+        'css': ['css/ekay-theme.css', 'css/footer.css', 'css/property-cards.css',
+                'css/notifications.css', 'css/animations.css'],
+        'js': ['js/main.js'],
+    },
+    'home': {
+        'css': ['css/ekay-theme.css', 'css/footer.css', 'css/property-cards.css',
+                'css/notifications.css', 'css/animations.css', 'css/home.css'],
+        'js': ['js/main.js', 'js/home.js'],
+    },
+    # Après {% block extra_css %} de base.html
+    'style': {
+        'css': ['css/style.css'],
+    },
+}
+DEFAULT_BUNDLE = 'site'
+
+# Caractère précédant un « / » qui ouvre une expression régulière JS
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = ('return', 'typeof', 'case', 'delete', 'void', 'in', 'of', 'new', 'throw')
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+CSS_COLON = re.compile(r':\s+')
+
+
+def _strip_comments(text, kind):
+    """Retire les commentaires sans changer le nombre de lignes
+
+    Retourne le texte et les numéros des lignes comprises dans un gabarit
+    JS multiligne (à ne pas retoucher).
+    """
+    out = []
+    literal_lines = set()
+    line = 0
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        following = text[i + 1] if i + 1 < n else ''
+        if char == '/' and following == '*':
+            end = text.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            newlines = text.count('\n', i, end)
+            out.append('\n' * newlines)
+            line += newlines
+            i = end
+        elif kind == 'js' and char == '/' and following == '/':
+            end = text.find('\n', i)
+            i = n if end == -1 else end
+        elif char in '\'"`' or (kind == 'js' and char == '/' and _starts_regex(out)):
+            start = i
+            i += 1
+            in_class = False
+            while i < n:
+                current = text[i]
+                if current == '\\':
+                    i += 2
+                    continue
+                if char == '/' and current == '[':
+                    in_class = True
+                elif char == '/' and current == ']':
+                    in_class = False
+                elif current == char and not in_class:
+                    break
+                elif current == '\n' and char != '`':
+                    break  # chaîne non terminée : ne pas aller plus loin
+                i += 1
+            i += 1
+            literal = text[start:i]
+            newlines = literal.count('\n')
+            if newlines and char == '`':
+                literal_lines.update(range(line, line + newlines + 1))
+            line += newlines
+            out.append(literal)
+        else:
+            if char == '\n':
+                line += 1
+            out.append(char)
+            i += 1
+    return ''.join(out), literal_lines
+
+
+def _starts_regex(out):
+    previous = ''.join(out[-40:]).rstrip()
+    if not previous or previous[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$]+$', previous)
+    return word is not None and word.group() in REGEX_KEYWORDS
+
+
+def _minify_css_line(line):
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', line)
+    for index in range(0, len(parts), 2):  # hors chaînes
+        part = re.sub(r'\s+', ' ', parts[index])
+        part = CSS_PUNCTUATION.sub(r'\1', part)
+        parts[index] = CSS_COLON.sub(':', part).replace(';}', '}')
+    return ''.join(parts)
+
+
+def minify(text, kind):
+    """Minifie `text` (``css`` ou ``js``) ligne par ligne
+
+    Retourne une liste (ligne minifiée, numéro de ligne d'origine à partir de 0).
+    """
+    text, literal_lines = _strip_comments(text, kind)
+    lines = []
+    for number, line in enumerate(text.split('\n')):
+        if number in literal_lines:
+            lines.append((line, number))
+            continue
+        line = line.strip()
+        if kind == 'css':
+            line = _minify_css_line(line)
+        if line:
+            lines.append((line, number))
+    return lines
+
+
+# Source maps (format v3)
+
+VLQ_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+
+def _vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ''
+    while True:
+        digit = value & 31
+        value >>= 5
+        encoded += VLQ_CHARS[digit | (32 if value else 0)]
+        if not value:
+            return encoded
+
+
+def source_map(filename, sources, lines):
+    """`lines` : pour chaque ligne produite, ses segments (colonne, index de la source, ligne d'origine)"""
+    encoded = []
+    previous_source = previous_line = 0
+    for segments in lines:
+        previous_column = 0
+        parts = []
+        for column, source, line in segments:
+            parts.append(_vlq(column - previous_column) + _vlq(source - previous_source)
+                         + _vlq(line - previous_line) + _vlq(0))
+            previous_column, previous_source, previous_line = column, source, line
+        encoded.append(','.join(parts))
+    return {'version': 3, 'file': filename, 'sources': sources, 'names': [], 'mappings': ';'.join(encoded)}
+
+
+def _join_css(fragments):
+    """Une ligne par fichier CSS ; retourne (texte, colonnes de début de chaque fragment)"""
+    text, columns = '', []
+    for fragment in fragments:
+        if text.endswith(';') and fragment.startswith('}'):
+            text = text[:-1]
+        elif text and not (text[-1] in '{};,' or fragment[0] in '{};,'):
+            text += ' '  # sélecteur ou valeur sur plusieurs lignes
+        columns.append(len(text))
+        text += fragment
+    return text, columns
+
+
+def bundle_path(name, kind):
+    return f'{OUTPUT_DIR}/{name}.{kind}'
+
+
+def build_bundle(static_folder, name, kind, files):
+    """Écrit le paquet et sa source map ; retourne (octets des sources, octets du paquet)
+
+    CSS : une ligne par fichier source. JS : une ligne par ligne conservée
+    (les fins de ligne comptent pour l'insertion automatique des « ; »).
+    """
+    target = bundle_path(name, kind)
+    output, mappings, raw = [], [], 0
+    for index, source in enumerate(files):
+        with open(os.path.join(static_folder, source), encoding='utf-8') as stream:
+            text = stream.read()
+        raw += len(text.encode('utf-8'))
+        lines = minify(text, kind)
+        if not lines:
+            continue
+        if kind == 'css':
+            joined, columns = _join_css([line for line, _ in lines])
+            output.append(joined)
+            mappings.append([(column, index, number) for column, (_, number) in zip(columns, lines)])
+            continue
+        for line, number in lines:
+            output.append(line)
+            mappings.append([(0, index, number)])
+        if not output[-1].endswith(';'):
+            output[-1] += ';'  # fichiers concaténés : fin d'instruction explicite
+
+    map_name = os.path.basename(target) + '.map'
+    sources = [os.path.relpath(source, OUTPUT_DIR).replace(os.sep, '/') for source in files]
+    comment = f'/*# sourceMappingURL={map_name} */' if kind == 'css' else f'//# sourceMappingURL={map_name}'
+    content = '\n'.join(output + [comment]) + '\n'
+
+    path = os.path.join(static_folder, target)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as stream:
+        stream.write(content)
+    with open(path + '.map', 'w', encoding='utf-8') as stream:
+        json.dump(source_map(os.path.basename(target), sources, mappings), stream, separators=(',', ':'))
+    return raw, len(content.encode('utf-8'))
+
+
+def is_stale(static_folder, name, kind, files):
+    path = os.path.join(static_folder, bundle_path(name, kind))
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    return any(os.path.getmtime(os.path.join(static_folder, source)) > built for source in files)
+
+
+def build_all(static_folder, only_stale=False):
+    """Construit les paquets ; retourne {chemin du paquet: (octets des sources, octets du paquet)}"""
+    results = {}
+    for name, kinds in BUNDLES.items():
+        for kind, files in kinds.items():
+            if only_stale and not is_stale(static_folder, name, kind, files):
+                continue
+            results[bundle_path(name, kind)] = build_bundle(static_folder, name, kind, files)
+    return results
+
+
+def bundle_urls(name, kind):
+    """URL à inclure pour le paquet `name` : le paquet, ou ses sources sans regroupement"""
+    bundle = BUNDLES.get(name) or BUNDLES[DEFAULT_BUNDLE]
+    if current_app.config.get('ASSETS_BUNDLES'):
+        return [url_for('static', filename=bundle_path(name if name in BUNDLES else DEFAULT_BUNDLE, kind))]
+    return [url_for('static', filename=source) for source in bundle[kind]]
+
+
+def init_app(app):
+    """Helper de template ; construit les paquets manquants si ASSETS_BUNDLES"""
+    app.add_template_global(bundle_urls)
+    if app.config.get('ASSETS_BUNDLES'):
+        build_all(app.static_folder, only_stale=True)
@@ -0,0 +1,176 @@
+"""
+E-KAY Platform - Compression des réponses
+
+Ressources statiques : ``flask assets build`` écrit à côté de chaque
+fichier texte (CSS, JS, SVG, JSON, XML, HTML) une version ``.gz`` (gzip
+niveau 9) et, si le paquet ``brotli`` est installé, ``.br`` (qualité 11).
+La vue ``static`` (``assets.serve_static``) sert la variante acceptée par
+le client (``Accept-Encoding``, brotli d'abord) avec ``Content-Encoding``
+et ``Vary: Accept-Encoding`` ; le coût de compression est payé une fois, à
+la construction. Une variante plus ancienne que son fichier source est
+ignorée.
+
+Réponses dynamiques (``COMPRESS_RESPONSES``) : les réponses HTML, JSON,
+CSV ou NDJSON d'au moins ``COMPRESS_MIN_SIZE`` octets sont compressées
+après la vue (gzip ``COMPRESS_LEVEL``, brotli ``COMPRESS_BR_QUALITY``).
+Les réponses en flux (exports administrateur) sont compressées morceau
+par morceau, avec un vidage après chaque morceau : elles restent
+progressives.
+
+``python -m ekay_platform.benchmarks.bench_compression`` mesure les octets
+transférés pour la page d'accueil, la liste des annonces et les ressources
+statiques.
+"""
+
+import gzip
+import mimetypes
+import os
+import zlib
+
+from flask import current_app, request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.webmanifest', '.xml', '.html', '.txt')
+# Extension de la variante précompressée -> Content-Encoding
+PRECOMPRESSED = {'br': '.br', 'gzip': '.gz'}
+# Une variante qui ne gagne pas au moins 10 % n'est pas écrite
+MIN_RATIO = 0.9
+
+
+def available_encodings():
+    """Encodages utilisables, par ordre de préférence"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def accepted_encoding(available):
+    """Encodage préféré par le client parmi `available` ; None pour aucun"""
+    return request.accept_encodings.best_match(available) if available else None
+
+
+def compress(data, encoding, level=6):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compressor(encoding, level):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 : en-tête gzip
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def compress_stream(chunks, encoding, level=6):
+    """Compresse un flux morceau par morceau en vidant le compresseur à chaque morceau"""
+    process, flush, finish = _compressor(encoding, level)
+    for chunk in chunks:
+        if chunk:
+            yield process(chunk) + flush()
+    yield finish()
+
+
+# Fichiers statiques précompressés
+
+def precompress_file(path):
+    """Écrit les variantes .gz / .br de `path` ; retourne {encodage: taille}"""
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    sizes = {}
+    for encoding in available_encodings():
+        target = path + PRECOMPRESSED[encoding]
+        compressed = compress(data, encoding, 11 if encoding == 'br' else 9)
+        if len(compressed) > len(data) * MIN_RATIO:
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, 'wb') as stream:
+            stream.write(compressed)
+        sizes[encoding] = len(compressed)
+    return sizes
+
+
+def compressible_files(static_folder, names):
+    """`names` (relatifs à static/) compressibles, plus les fichiers texte à la racine de static/"""
+    top = [name for name in os.listdir(static_folder) if os.path.isfile(os.path.join(static_folder, name))]
+    return sorted({name for name in list(names) + top if name.endswith(COMPRESSIBLE_EXTENSIONS)})
+
+
+def precompress(static_folder, names):
+    """Précompresse les fichiers ; retourne (fichiers, octets bruts, {encodage: octets})"""
+    raw, totals = 0, dict.fromkeys(available_encodings(), 0)
+    files = compressible_files(static_folder, names)
+    for name in files:
+        path = os.path.join(static_folder, name)
+        size = os.path.getsize(path)
+        raw += size
+        sizes = precompress_file(path)
+        for encoding in totals:
+            totals[encoding] += sizes.get(encoding, size)
+    return len(files), raw, totals
+
+
+def send_precompressed(filename, max_age=None):
+    """Variante précompressée de static/`filename` acceptée par le client, ou None"""
+    folder = current_app.static_folder
+    source = os.path.join(folder, filename)
+    if not filename.endswith(COMPRESSIBLE_EXTENSIONS) or not os.path.isfile(source):
+        return None
+    mtime = os.path.getmtime(source)
+    available = [encoding for encoding, extension in PRECOMPRESSED.items()
+                 if os.path.isfile(source + extension) and os.path.getmtime(source + extension) >= mtime]
+    encoding = accepted_encoding(available)
+    if encoding is None:
+        return None
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(folder, filename + PRECOMPRESSED[encoding], mimetype=mimetype, max_age=max_age)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def send_static_file(filename, max_age=None):
+    """Fichier de static/, précompressé si possible"""
+    if current_app.config.get('STATIC_PRECOMPRESSED'):
+        response = send_precompressed(filename, max_age)
+        if response is not None:
+            return response
+    if max_age is None:
+        return current_app.send_static_file(filename)
+    return send_from_directory(current_app.static_folder, filename, max_age=max_age)
+
+
+# Réponses dynamiques
+
+def compress_response(response):
+    """after_request : compression des réponses texte dynamiques"""
+    config = current_app.config
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in config.get('COMPRESS_MIMETYPES', ())):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding(available_encodings())
+    if encoding is None or request.method == 'HEAD':
+        return response
+    level = config.get('COMPRESS_BR_QUALITY', 4) if encoding == 'br' else config.get('COMPRESS_LEVEL', 6)
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+        response.set_data(compress(data, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Compression des réponses dynamiques si COMPRESS_RESPONSES"""
+    if app.config.get('COMPRESS_RESPONSES'):
+        app.after_request(compress_response)
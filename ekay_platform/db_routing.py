@@ -0,0 +1,171 @@
+"""
+E-KAY Platform - Routage des lectures vers des réplicas
+
+Chaque URI de ``SQLALCHEMY_REPLICA_URIS`` reçoit son propre moteur, avec
+les mêmes réglages que le primaire (db_tuning). Ce ne sont pas des binds
+Flask-SQLAlchemy : ``db.create_all`` ne touche jamais aux réplicas.
+
+Au début de chaque requête GET/HEAD/OPTIONS, un réplica sain est tiré au
+sort et la session y envoie ses SELECT. Tout le reste va au primaire :
+
+- les requêtes POST/PUT/DELETE… ;
+- les écritures (flush, UPDATE/INSERT/DELETE, SQL textuel) ;
+- toutes les lectures d'une session qui a déjà écrit (lecture de ses
+  propres écritures, y compris dans une requête GET qui écrit) ;
+- les requêtes GET d'un visiteur pendant ``REPLICA_STICKY_SECONDS`` après
+  une écriture de sa part (redirection après POST) ;
+- les vues décorées par ``use_primary``.
+
+Tolérance au retard : le retard de chaque réplica est mesuré au plus toutes
+les ``REPLICA_CHECK_INTERVAL`` secondes (PostgreSQL :
+``pg_last_xact_replay_timestamp``). Un réplica en retard de plus de
+``REPLICA_MAX_LAG`` secondes, injoignable ou en erreur de connexion est
+écarté jusqu'à la vérification suivante ; sans réplica sain, le primaire
+sert la requête.
+"""
+
+import random
+import time
+from functools import wraps
+
+from flask import request, session
+from sqlalchemy import create_engine, event, text
+
+try:
+    from flask_sqlalchemy.session import Session as _BaseSession
+except ImportError:  # Flask-SQLAlchemy < 3
+    from flask_sqlalchemy import SignallingSession as _BaseSession
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Clés de Session.info (le réplica est le moteur lui-même)
+REPLICA_INFO = 'replica'
+WROTE_INFO = 'wrote'
+# Clé de la session Flask : horodatage jusqu'auquel le visiteur lit le primaire
+STICKY_KEY = '_db_primary_until'
+
+PG_LAG_SQL = text(
+    'SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)'
+)
+
+
+def _is_read(clause):
+    # Le SQL textuel peut écrire : seul un SELECT construit part au réplica
+    return clause is not None and getattr(clause, 'is_select', False)
+
+
+class RoutingSession(_BaseSession):
+    """Session qui envoie ses lectures au réplica choisi pour la requête"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or not _is_read(clause):
+            self.info[WROTE_INFO] = True
+        elif not self.info.get(WROTE_INFO) and kwargs.get('bind') is None:
+            replica = self.info.get(REPLICA_INFO)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def replica_lag(engine):
+    """Retard de réplication en secondes (0 hors PostgreSQL)"""
+    if engine.dialect.name != 'postgresql':
+        return 0.0
+    with engine.connect() as connection:
+        return float(connection.execute(PG_LAG_SQL).scalar())
+
+
+class ReplicaPool:
+    """Réplicas d'une application et leur état de santé"""
+
+    def __init__(self, engines, max_lag, check_interval):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._checked = {}  # moteur -> (horodatage, sain)
+
+    def healthy(self, engine):
+        now = time.monotonic()
+        checked_at, ok = self._checked.get(engine, (None, False))
+        if checked_at is None or now - checked_at >= self.check_interval:
+            try:
+                ok = replica_lag(engine) <= self.max_lag
+            except Exception:
+                ok = False
+            self._checked[engine] = (now, ok)
+        return ok
+
+    def mark_down(self, engine):
+        self._checked[engine] = (time.monotonic(), False)
+
+    def choose(self):
+        candidates = [engine for engine in self.engines if self.healthy(engine)]
+        return random.choice(candidates) if candidates else None
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+
+def use_primary(view):
+    """Décorateur : la vue lit le primaire même en GET"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from .extensions import db
+        db.session.info.pop(REPLICA_INFO, None)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def create_replica_engine(app, uri):
+    """Moteur d'un réplica, réglé comme le primaire"""
+    from .db_tuning import engine_options, install_pragmas
+
+    options = engine_options(dict(app.config, SQLALCHEMY_DATABASE_URI=uri))
+    engine = create_engine(uri, **options)
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if pragmas and engine.dialect.name == 'sqlite':
+        install_pragmas(engine, pragmas)
+    return engine
+
+
+def init_app(app):
+    """Active le routage des lectures si des réplicas sont configurés"""
+    from .extensions import db
+
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+    if not uris:
+        return
+    pool = ReplicaPool(
+        [create_replica_engine(app, uri) for uri in uris],
+        app.config.get('REPLICA_MAX_LAG', 5.0),
+        app.config.get('REPLICA_CHECK_INTERVAL', 10.0),
+    )
+    app.extensions['db_replicas'] = pool
+    sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5.0)
+
+    for engine in pool.engines:
+        def _on_error(context, engine=engine):
+            if context.is_disconnect or context.connection is None:
+                pool.mark_down(engine)
+        event.listen(engine, 'handle_error', _on_error)
+
+    @app.before_request
+    def _route_reads():
+        db.session.info.pop(WROTE_INFO, None)
+        if request.method not in SAFE_METHODS or session.get(STICKY_KEY, 0) > time.time():
+            return
+        replica = pool.choose()
+        if replica is not None:
+            db.session.info[REPLICA_INFO] = replica
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if request.method not in SAFE_METHODS and db.session.info.get(WROTE_INFO):
+            session[STICKY_KEY] = time.time() + sticky_seconds
+        return response
+
+    @app.teardown_request
+    def _reset_routing(exc):
+        # La session peut survivre à la requête (contexte d'application englobant)
+        db.session.info.pop(REPLICA_INFO, None)
+        db.session.info.pop(WROTE_INFO, None)
@@ -0,0 +1,95 @@
+"""
+E-KAY Platform - Réglages du moteur de base de données
+
+Profil de performance choisi par classe de configuration (config.py) :
+
+- SQLite : pragmas ``SQLITE_PRAGMAS`` appliqués à chaque nouvelle connexion
+  (journal WAL, ``synchronous=NORMAL``, cache de pages, mmap, délai d'attente
+  du verrou). En WAL, les lectures ne bloquent plus l'écriture et
+  inversement ; ``synchronous=NORMAL`` ne synchronise le disque qu'aux
+  checkpoints, ce qui reste sûr en WAL (une coupure de courant peut perdre
+  les dernières transactions, jamais corrompre la base).
+- PostgreSQL et autres : pool de connexions explicite (``DB_POOL_SIZE``,
+  ``DB_MAX_OVERFLOW``, ``DB_POOL_TIMEOUT``, ``DB_POOL_RECYCLE``,
+  ``DB_POOL_PRE_PING``).
+- Tous : taille du cache des requêtes compilées par SQLAlchemy
+  (``DB_STATEMENT_CACHE_SIZE``), reprise pour SQLite par le cache de
+  requêtes préparées du pilote.
+
+Les clés présentes dans ``SQLALCHEMY_ENGINE_OPTIONS`` l'emportent toujours.
+``configure_engine`` doit être appelé avant ``db.init_app``, ``init_app`` après.
+
+Comparaison des profils : python -m ekay_platform.benchmarks.bench_sqlite_writes
+"""
+
+from sqlalchemy import event
+
+from .extensions import db
+
+# Réglage du pool : clé de configuration -> argument de create_engine
+POOL_OPTIONS = {
+    'DB_POOL_SIZE': 'pool_size',
+    'DB_MAX_OVERFLOW': 'max_overflow',
+    'DB_POOL_TIMEOUT': 'pool_timeout',
+    'DB_POOL_RECYCLE': 'pool_recycle',
+    'DB_POOL_PRE_PING': 'pool_pre_ping',
+}
+
+
+def is_sqlite(uri):
+    return uri.startswith('sqlite')
+
+
+def engine_options(config):
+    """Options de create_engine déduites de la configuration"""
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    options = {}
+    cache_size = config.get('DB_STATEMENT_CACHE_SIZE')
+    if cache_size is not None:
+        options['query_cache_size'] = cache_size
+    if is_sqlite(uri):
+        # Le pool SQLite est choisi par SQLAlchemy (StaticPool en mémoire,
+        # QueuePool sur fichier) : seules les requêtes préparées se règlent
+        if cache_size is not None:
+            options['connect_args'] = {'cached_statements': cache_size}
+    else:
+        for key, option in POOL_OPTIONS.items():
+            if config.get(key) is not None:
+                options[option] = config[key]
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Exécute les PRAGMA sur une connexion sqlite3"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def install_pragmas(engine, pragmas):
+    """Applique `pragmas` à chaque connexion ouverte par `engine`"""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+
+def configure_engine(app):
+    """Calcule SQLALCHEMY_ENGINE_OPTIONS (avant db.init_app)"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def init_app(app):
+    """Installe les pragmas SQLite sur les moteurs de l'application"""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    with app.app_context():
+        # Flask-SQLAlchemy 3 expose tous les moteurs (binds compris)
+        engines = getattr(db, 'engines', None) or {None: db.engine}
+        for engine in engines.values():
+            if engine.dialect.name == 'sqlite':
+                install_pragmas(engine, pragmas)
@@ -1,6 +1,7 @@
 from flask import render_template, current_app, url_for
 from flask_mail import Message
 from .extensions import mail
+from .metrics import record_email, track_email
 from .models import User, Property
 from datetime import datetime, timedelta
 
@@ -16,11 +17,14 @@ def send_email(subject, sender, recipients, text_body, html_body, **kwargs):
     msg.html = html_body
     
     try:
-        mail.send(msg)
+        with track_email():
+            mail.send(msg)
         current_app.logger.info(f"Email envoyé à {', '.join(recipients)}: {subject}")
+        record_email(True)
         return True
     except Exception as e:
         current_app.logger.error(f"Erreur lors de l'envoi d'email à {', '.join(recipients)}: {str(e)}")
+        record_email(False)
         return False
 
 def send_verification_email(user):
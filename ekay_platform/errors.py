@@ -1,4 +1,4 @@
-from flask import render_template, request, jsonify
+from flask import render_template, request, jsonify, make_response
 from . import db
 
 def page_not_found(e):
@@ -23,6 +23,18 @@ def forbidden(e):
         return response
     return render_template('errors/403.html'), 403
 
+def too_many_requests(e):
+    # Réponse sans accès à la base : la limitation doit rester bon marché
+    retry_after = getattr(e, 'retry_after', None)
+    if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        response = jsonify({'error': 'Too many requests', 'retry_after': retry_after})
+        response.status_code = 429
+    else:
+        response = make_response(render_template('errors/429.html', retry_after=retry_after), 429)
+    if retry_after:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
 def bad_request(message):
     response = jsonify({'error': 'Bad request', 'message': message})
     response.status_code = 400
@@ -4,7 +4,9 @@ from flask_migrate import Migrate
 from flask_mail import Mail
 from flask_babel import Babel
 
-db = SQLAlchemy()
+from .db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 migrate = Migrate()
 mail = Mail()
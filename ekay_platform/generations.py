@@ -0,0 +1,92 @@
+"""
+E-KAY Platform - Générations des caches en mémoire partagées par les processus
+
+Chaque worker gunicorn garde sa copie de l'index de recherche et de
+l'autocomplétion, tenue à jour par les événements de sa propre session.
+Les écritures des autres processus (autres workers, ``flask properties
+import``, tâches cron) n'y arrivent pas. La table ``cache_generations``
+tient un compteur par cache :
+
+- toute transaction qui modifie les données d'un cache incrémente son
+  compteur dans la même transaction (``Generation.bump``), ainsi que les
+  écritures Core (``invalidate``) ;
+- avant de servir une requête, le cache compare le compteur en base à la
+  valeur lue lors de sa dernière construction (``Generation.is_current``,
+  une lecture par clé primaire) et se reconstruit s'il diffère ;
+- le processus auteur applique ses propres modifications incrémentalement
+  et avance sa génération sans reconstruire si personne d'autre n'a écrit
+  entre-temps (compteur = génération connue + ses propres incréments).
+"""
+
+from sqlalchemy import select
+
+from .admin_stats import UPSERT_DIALECTS
+from .extensions import db
+from .models import CacheGeneration
+
+
+def bump(connection, name):
+    """Incrémente le compteur `name` dans la transaction de `connection` ; retourne sa valeur"""
+    table = CacheGeneration.__table__
+    insert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is not None:
+        statement = insert(table).values(name=name, value=1)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.name], set_={'value': table.c.value + 1},
+        ))
+    else:
+        updated = connection.execute(
+            table.update().where(table.c.name == name).values(value=table.c.value + 1)
+        ).rowcount
+        if not updated:
+            connection.execute(table.insert(), {'name': name, 'value': 1})
+    return connection.execute(select(table.c.value).where(table.c.name == name)).scalar()
+
+
+def invalidate(connection, *names):
+    """Invalide les caches `names` de tous les processus (écritures hors session ORM)"""
+    for name in names:
+        bump(connection, name)
+
+
+def current(name, session=None):
+    """Valeur en base du compteur `name` (0 s'il n'a jamais été incrémenté)"""
+    table = CacheGeneration.__table__
+    value = (session or db.session).execute(select(table.c.value).where(table.c.name == name)).scalar()
+    return value or 0
+
+
+class Generation:
+    """Génération d'un cache du processus, comparée au compteur partagé"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seen = None  # inconnue tant que le cache n'a pas été construit
+        self._key = f'generation:{name}'
+
+    def read(self, session=None):
+        """À appeler avant de charger les données d'une construction"""
+        return current(self.name, session)
+
+    def built(self, value):
+        self.seen = value
+
+    def is_current(self, session=None):
+        return self.seen is not None and current(self.name, session) == self.seen
+
+    def bump(self, session):
+        """Signale une modification des données du cache dans la transaction de `session`"""
+        bumps, _ = session.info.get(self._key, (0, None))
+        session.info[self._key] = (bumps + 1, bump(session.connection(), self.name))
+
+    def after_commit(self, session):
+        """Avance la génération si seules les modifications de `session` ont eu lieu
+
+        À appeler après avoir appliqué ces modifications au cache.
+        """
+        bumps, value = session.info.pop(self._key, (0, None))
+        if bumps and self.seen is not None and value == self.seen + bumps:
+            self.seen = value
+
+    def after_rollback(self, session):
+        session.info.pop(self._key, None)
@@ -1,46 +1,57 @@
-from flask import render_template, redirect, url_for, request, current_app, flash, abort
+from flask import render_template, redirect, url_for, request, current_app, flash, abort, jsonify
 from flask_login import current_user, login_required
+from sqlalchemy import exists
+from sqlalchemy.orm import load_only
 from . import main
+from .. import property_stats
 from ..extensions import db
-from ..models import User, Property, PropertyImage
+from ..models import User, Property, PropertyImage, PropertyCard, card_query
+from ..models.card import primary_images
 from .forms import SearchForm
 from datetime import datetime
 
+# Colonnes du tableau des annonces du propriétaire
+LANDLORD_COLUMNS = (Property.id, Property.title, Property.address, Property.city, Property.price,
+                    Property.currency, Property.status, Property.is_available, Property.created_at)
+
 @main.before_app_request
 def before_request():
     if current_user.is_authenticated:
-        current_user.last_seen = datetime.utcnow()
-        db.session.commit()
+        # Une écriture par intervalle au lieu d'une par requête
+        now = datetime.utcnow()
+        last_seen = current_user.last_seen
+        if last_seen is None or (now - last_seen.replace(tzinfo=None)).total_seconds() \
+                >= current_app.config.get('LAST_SEEN_INTERVAL', 0):
+            current_user.last_seen = now
+            db.session.commit()
 
 @main.route('/')
 @main.route('/index')
 def index():
     """Home page with property listings"""
     page = request.args.get('page', 1, type=int)
-    query = Property.query.filter_by(is_available=True)
+    query = card_query().filter_by(is_available=True)
     
     # Apply filters if any
     min_price = request.args.get('min_price', type=float)
     max_price = request.args.get('max_price', type=float)
     rooms = request.args.get('rooms', type=int)
     
+    # effective_annual_price vaut annual_price s'il est défini, sinon price * 12
     if min_price is not None:
-        # Si un prix annuel est défini, on l'utilise, sinon on utilise le prix mensuel * 12
-        query = query.filter(db.or_(
-            db.and_(Property.annual_price.isnot(None), Property.annual_price >= min_price),
-            db.and_(Property.annual_price.is_(None), Property.price * 12 >= min_price)
-        ))
+        query = query.filter(Property.effective_annual_price >= min_price)
     if max_price is not None:
-        query = query.filter(db.or_(
-            db.and_(Property.annual_price.isnot(None), Property.annual_price <= max_price),
-            db.and_(Property.annual_price.is_(None), Property.price * 12 <= max_price)
-        ))
+        query = query.filter(Property.effective_annual_price <= max_price)
     if rooms is not None:
         query = query.filter(Property.rooms >= rooms)
     
     # Paginate results
     properties = query.order_by(Property.created_at.desc()).paginate(
         page=page, per_page=current_app.config['PROPERTIES_PER_PAGE'], error_out=False)
+    properties.items = PropertyCard.from_properties(properties.items)
+    # Cœurs des cartes : favoris de la page en une requête
+    favorite_ids = current_user.favorite_ids(p.id for p in properties.items) \
+        if current_user.is_authenticated else set()
     
     # Prepare filter form
     form = SearchForm()
@@ -52,6 +63,7 @@ def index():
     return render_template('main/index.html', 
                          title='Accueil',
                          properties=properties,
+                         favorite_ids=favorite_ids,
                          form=form)
 
 @main.route('/property/<int:id>')
@@ -120,10 +132,15 @@ def dashboard():
     """User dashboard"""
     if current_user.is_landlord:
         # Landlord dashboard
-        properties = current_user.properties.order_by(Property.created_at.desc()).all()
+        properties = current_user.properties.options(load_only(*LANDLORD_COLUMNS)).order_by(
+            Property.created_at.desc()).all()
+        # Graphiques lus dans les agrégats quotidiens (property_stats), jamais dans les événements bruts
+        stats = property_stats.owner_stats(current_user.id, current_app.config.get('STATS_DASHBOARD_DAYS', 30))
         return render_template('dashboard/landlord.html', 
                              title='Tableau de bord Propriétaire',
-                             properties=properties)
+                             properties=properties,
+                             images=primary_images([p.id for p in properties]),
+                             stats=stats)
     else:
         # Tenant dashboard
         favorites = current_user.favorites.all()
@@ -135,13 +152,9 @@ def dashboard():
 @login_required
 def favorite(property_id):
     """Add/remove property from favorites"""
-    property = Property.query.get_or_404(property_id)
+    if not db.session.query(exists().where(Property.id == property_id)).scalar():
+        abort(404)
     
-    if property in current_user.favorites:
-        current_user.favorites.remove(property)
-        db.session.commit()
-        return jsonify({'status': 'removed'})
-    else:
-        current_user.favorites.append(property)
-        db.session.commit()
-        return jsonify({'status': 'added'})
+    added = current_user.toggle_favorite(property_id)
+    db.session.commit()
+    return jsonify({'status': 'added' if added else 'removed'})
@@ -0,0 +1,223 @@
+"""
+E-KAY Platform - Métriques Prometheus
+
+Expose ``/metrics`` au format texte Prometheus :
+
+- latence des requêtes HTTP par blueprint et endpoint (histogrammes) ;
+- nombre de réponses par code de statut ;
+- nombre de requêtes SQL par requête HTTP (via ``sql_stats``) ;
+- durée du traitement des images ;
+- emails en cours d'envoi ;
+- hachages de mots de passe (durée, calculs en cours, rehachages) ;
+- soumissions refusées par la limitation de débit.
+
+Sous gunicorn, chaque worker écrit ses valeurs dans ``PROMETHEUS_MULTIPROC_DIR``
+(voir ``gunicorn.conf.py``) et ``/metrics`` agrège tous les workers, quel que
+soit celui qui répond. Sans ``prometheus_client`` installé, les métriques
+sont désactivées et les fonctions d'observation ne font rien.
+
+Avec ``METRICS_TOKEN``, ``/metrics`` exige l'en-tête
+``Authorization: Bearer <jeton>`` (401 sinon) : le trafic par endpoint
+n'est pas public. En production, les métriques ne sont actives par défaut
+que si ce jeton est défini (voir config.py et render.yaml).
+"""
+
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, abort, current_app, g, request
+
+from .sql_stats import collect_queries
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, multiprocess
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    prometheus_client = None
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'ekay_http_request_duration_seconds',
+        'Durée de traitement des requêtes HTTP',
+        ['blueprint', 'endpoint', 'method'],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    REQUEST_COUNT = Counter(
+        'ekay_http_responses_total',
+        'Réponses HTTP par code de statut',
+        ['blueprint', 'endpoint', 'method', 'status'],
+    )
+    DB_QUERIES = Histogram(
+        'ekay_db_queries_per_request',
+        'Nombre de requêtes SQL émises par requête HTTP',
+        ['blueprint', 'endpoint'],
+        buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+    )
+    DB_DURATION = Histogram(
+        'ekay_db_duration_seconds',
+        'Temps SQL cumulé par requête HTTP',
+        ['blueprint', 'endpoint'],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    )
+    IMAGE_PROCESSING = Histogram(
+        'ekay_image_processing_seconds',
+        "Durée du traitement d'une image téléversée",
+        ['operation'],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    EMAIL_QUEUE_DEPTH = Gauge(
+        'ekay_email_queue_depth',
+        "Emails en attente d'envoi",
+        multiprocess_mode='livesum',
+    )
+    EMAILS_SENT = Counter(
+        'ekay_emails_total',
+        'Emails envoyés par résultat',
+        ['outcome'],
+    )
+    PASSWORD_HASH_DURATION = Histogram(
+        'ekay_password_hash_seconds',
+        "Durée d'un hachage ou d'une vérification de mot de passe, attente du pool comprise",
+        ['operation'],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+    )
+    PASSWORD_HASH_PENDING = Gauge(
+        'ekay_password_hash_pending',
+        'Hachages de mots de passe en cours ou en attente du pool',
+        multiprocess_mode='livesum',
+    )
+    PASSWORD_REHASHES = Counter(
+        'ekay_password_rehash_total',
+        'Mots de passe rehachés à la connexion avec la méthode actuelle',
+    )
+    RATE_LIMITED = Counter(
+        'ekay_rate_limited_total',
+        'Soumissions refusées (429) par limite de débit',
+        ['limit'],
+    )
+
+
+def available():
+    return prometheus_client is not None
+
+
+@contextmanager
+def observe_image_processing(operation):
+    """Mesure la durée d'un traitement d'image"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if prometheus_client is not None:
+            IMAGE_PROCESSING.labels(operation).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_email():
+    """Compte un email comme en attente pendant son envoi"""
+    if prometheus_client is None:
+        yield
+        return
+    EMAIL_QUEUE_DEPTH.inc()
+    try:
+        yield
+    finally:
+        EMAIL_QUEUE_DEPTH.dec()
+
+
+def record_email(sent):
+    if prometheus_client is not None:
+        EMAILS_SENT.labels('sent' if sent else 'failed').inc()
+
+
+@contextmanager
+def observe_password_hash(operation):
+    """Mesure un hachage de mot de passe et le compte comme en cours"""
+    if prometheus_client is None:
+        yield
+        return
+    PASSWORD_HASH_PENDING.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PASSWORD_HASH_PENDING.dec()
+        PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - start)
+
+
+def record_password_rehash():
+    if prometheus_client is not None:
+        PASSWORD_REHASHES.inc()
+
+
+def record_rate_limited(limit):
+    if prometheus_client is not None:
+        RATE_LIMITED.labels(limit).inc()
+
+
+def _labels():
+    endpoint = request.endpoint or 'none'
+    return request.blueprint or 'app', endpoint
+
+
+def render_metrics():
+    """Texte Prometheus, agrégé sur tous les workers en mode multiprocessus"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+def authorized():
+    """Vrai si la requête porte le jeton ``METRICS_TOKEN`` (ou si aucun n'est configuré)"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return True
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), token.encode())
+
+
+def init_app(app):
+    """Enregistre les hooks de mesure et la route /metrics"""
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    if prometheus_client is None:
+        app.logger.warning('prometheus_client non installé : métriques désactivées')
+        return
+    if not app.config.get('METRICS_TOKEN') and not (app.debug or app.testing):
+        app.logger.warning('METRICS_TOKEN non défini : /metrics est accessible sans authentification')
+
+    @app.before_request
+    def _start_metrics():
+        g._metrics_start = time.perf_counter()
+        g._metrics_queries = collect_queries()
+        g.metrics_queries = g._metrics_queries.__enter__()
+
+    @app.after_request
+    def _record_metrics(response):
+        start = g.get('_metrics_start')
+        if start is None or request.endpoint == 'metrics':
+            return response
+        blueprint, endpoint = _labels()
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - start)
+        REQUEST_COUNT.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+        stats = g.metrics_queries
+        DB_QUERIES.labels(blueprint, endpoint).observe(stats.count)
+        DB_DURATION.labels(blueprint, endpoint).observe(stats.duration)
+        return response
+
+    @app.teardown_request
+    def _stop_metrics(exc):
+        context = g.pop('_metrics_queries', None)
+        if context is not None:
+            context.__exit__(None, None, None)
+
+    @app.route('/metrics')
+    def metrics():
+        if not authorized():
+            abort(Response('Jeton requis\n', 401, {'WWW-Authenticate': 'Bearer realm="metrics"'}))
+        return Response(render_metrics(), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
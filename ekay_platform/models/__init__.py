@@ -1,14 +1,23 @@
 """
 E-KAY Platform - Models Package
+
+Couche de modèles unique : toutes les routes, scripts et migrations
+importent les modèles depuis ce package.
 """
 
 # Import des modèles pour les rendre disponibles au niveau du package
 from .user import User
 from .property import Property, PropertyImage
+from .booking import Booking
+from .card import PropertyCard, card_query
 from .tokens import Token
+from .dashboard import DashboardCounter
+from .cache import CacheGeneration
+from .stats import PropertyView, PropertyDailyStats
 from .associations import favorites
 
 # Initialisation des relations circulaires après l'import de tous les modèles
 from . import user as _  # noqa: F401
 
-__all__ = ['User', 'Property', 'PropertyImage', 'Token', 'favorites']
+__all__ = ['User', 'Property', 'PropertyImage', 'Booking', 'PropertyCard', 'card_query', 'Token', 'DashboardCounter',
+           'CacheGeneration', 'PropertyView', 'PropertyDailyStats', 'favorites']
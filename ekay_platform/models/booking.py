@@ -13,6 +13,7 @@ class Booking(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
+    guests = db.Column(db.Integer, default=1, nullable=False)
     status = db.Column(db.String(20), default='pending', 
                       nullable=False)  # pending, confirmed, cancelled, completed
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
@@ -34,6 +35,7 @@ class Booking(db.Model):
             'user_id': self.user_id,
             'start_date': self.start_date.isoformat(),
             'end_date': self.end_date.isoformat(),
+            'guests': self.guests,
             'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
@@ -0,0 +1,17 @@
+from .. import db
+
+
+class CacheGeneration(db.Model):
+    """Compteur de modifications d'un cache en mémoire (index de recherche, autocomplétion)
+
+    Incrémenté par toute transaction qui modifie les données du cache ;
+    chaque processus compare sa copie à ce compteur. Maintenu par
+    ekay_platform.generations.
+    """
+    __tablename__ = 'cache_generations'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CacheGeneration {self.name}={self.value}>'
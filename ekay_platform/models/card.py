@@ -0,0 +1,88 @@
+"""
+E-KAY Platform - Cartes d'annonces
+
+Profil de chargement des pages de liste : seules les colonnes affichées sur
+une carte sont lues, le reste (description complète, équipements, contact...)
+reste différé. Les résultats sont convertis en ``PropertyCard``, un objet de
+lecture détaché de la session, avec l'image principale de chaque annonce
+chargée en une seule requête pour toute la page.
+"""
+
+from flask import url_for
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, with_expression
+
+from ..extensions import db
+from .property import Property, PropertyImage
+
+# Colonnes lues pour afficher une carte
+CARD_FIELDS = (
+    'id', 'title', 'property_type', 'transaction_type', 'price', 'annual_price',
+    'price_type', 'effective_annual_price', 'currency', 'rooms', 'bedrooms',
+    'area', 'address', 'city', 'neighborhood', 'is_featured', 'created_at',
+)
+
+# Longueur de l'extrait de description calculé en SQL
+SUMMARY_LENGTH = 150
+
+
+def card_query(query=None):
+    """Restreint une requête sur Property aux colonnes des cartes"""
+    if query is None:
+        query = Property.query
+    return query.options(
+        load_only(*(getattr(Property, name) for name in CARD_FIELDS)),
+        with_expression(Property.summary, func.substr(Property.description, 1, SUMMARY_LENGTH + 1)),
+    )
+
+
+def primary_images(property_ids):
+    """Retourne {property_id: filename} de l'image principale de chaque propriété"""
+    if not property_ids:
+        return {}
+    rows = db.session.query(PropertyImage.property_id, PropertyImage.filename).filter(
+        PropertyImage.property_id.in_(property_ids)
+    ).order_by(
+        PropertyImage.property_id,
+        PropertyImage.is_primary.desc(),
+        PropertyImage.position,
+        PropertyImage.id
+    )
+    images = {}
+    for property_id, filename in rows:
+        images.setdefault(property_id, filename)
+    return images
+
+
+class PropertyCard:
+    """Vue en lecture seule d'une annonce pour les pages de liste"""
+
+    __slots__ = CARD_FIELDS + ('summary', 'image')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self):
+        return f'<PropertyCard {self.id}>'
+
+    @classmethod
+    def from_properties(cls, properties):
+        """Construit les cartes d'une page de propriétés chargées par `card_query`"""
+        properties = list(properties)
+        images = primary_images([p.id for p in properties])
+        cards = []
+        for prop in properties:
+            values = {name: getattr(prop, name) for name in CARD_FIELDS}
+            summary = prop.summary or ''
+            if len(summary) > SUMMARY_LENGTH:
+                summary = summary[:SUMMARY_LENGTH].rsplit(' ', 1)[0] + '...'
+            cards.append(cls(summary=summary, image=images.get(prop.id), **values))
+        return cards
+
+    @property
+    def image_url(self):
+        """URL de l'image principale, ou None si l'annonce n'a pas d'image"""
+        if not self.image:
+            return None
+        return url_for('static', filename=f'uploads/properties/{self.id}/{self.image}')
@@ -0,0 +1,18 @@
+from .. import db
+
+
+class DashboardCounter(db.Model):
+    """Agrégat matérialisé du tableau de bord administrateur
+
+    Une ligne par (dimension, clé) : annonces par statut, ville ou type,
+    réservations par statut, inscriptions par jour. Maintenu par
+    ekay_platform.admin_stats.
+    """
+    __tablename__ = 'dashboard_counters'
+
+    dimension = db.Column(db.String(30), primary_key=True)
+    key = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DashboardCounter {self.dimension}:{self.key}={self.value}>'
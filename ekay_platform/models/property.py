@@ -11,32 +11,49 @@ from datetime import datetime, timezone
 import os
 import uuid
 from flask import current_app, url_for
+from sqlalchemy.orm import query_expression, validates
 from ..extensions import db
+from .stats import PropertyView
 
 class Property(db.Model):
     """Modèle pour les propriétés à louer"""
     __tablename__ = 'properties'
+    __table_args__ = (
+        # Filtres de prix annuel de la page d'accueil et de la recherche
+        db.Index('ix_properties_available_annual_price', 'is_available', 'effective_annual_price'),
+    )
     
     # Identifiant et statut
     id = db.Column(db.Integer, primary_key=True)
     is_available = db.Column(db.Boolean, default=True, index=True)
     is_featured = db.Column(db.Boolean, default=False, index=True)
+    is_premium = db.Column(db.Boolean, default=False)
+    status = db.Column(db.String(20), default='draft', index=True)  # draft, pending, published, sold, rented, archived
     
     # Informations de base
     title = db.Column(db.String(200), nullable=False, index=True)
     description = db.Column(db.Text)
+    # Extrait de la description, calculé en SQL par les requêtes de liste (voir card.py)
+    summary = query_expression()
     property_type = db.Column(db.String(50), nullable=False, default='apartment', index=True)
+    transaction_type = db.Column(db.String(20), nullable=False, default='rent')  # sale, rent, vacation_rental
     
     # Prix
     price = db.Column(db.Float, nullable=False, index=True)  # Prix mensuel en HTG
     annual_price = db.Column(db.Float, nullable=True)  # Prix annuel en HTG (optionnel)
     price_type = db.Column(db.String(10), default='monthly', nullable=False, index=True)  # 'monthly' ou 'annual'
+    effective_annual_price = db.Column(db.Float, nullable=True)  # annual_price, sinon price * 12
+    currency = db.Column(db.String(3), default='HTG')  # HTG, USD, EUR
+    security_deposit = db.Column(db.Float)  # Caution
     
     # Détails du bien
     rooms = db.Column(db.Integer, nullable=False, index=True)  # Nombre total de pièces
     bedrooms = db.Column(db.Integer, nullable=True, index=True)  # Nombre de chambres
     bathrooms = db.Column(db.Integer, nullable=True, default=1)  # Nombre de salles de bain
     area = db.Column(db.Float, nullable=True, index=True)  # Superficie en m²
+    floor = db.Column(db.Integer)  # Étage
+    total_floors = db.Column(db.Integer)  # Nombre total d'étages du bâtiment
+    year_built = db.Column(db.Integer)  # Année de construction
     
     # Caractéristiques
     has_kitchen = db.Column(db.Boolean, default=False, index=True)
@@ -45,11 +62,66 @@ class Property(db.Model):
     has_balcony = db.Column(db.Boolean, default=False, index=True)
     has_pool = db.Column(db.Boolean, default=False, index=True)
     is_furnished = db.Column(db.Boolean, default=False, index=True)
+    has_elevator = db.Column(db.Boolean, default=False)
+    has_air_conditioning = db.Column(db.Boolean, default=False)
+    has_heating = db.Column(db.Boolean, default=False)
+    is_new_construction = db.Column(db.Boolean, default=False)
+    
+    # Équipements supplémentaires
+    has_wardrobes = db.Column(db.Boolean, default=False)
+    has_dishwasher = db.Column(db.Boolean, default=False)
+    has_washing_machine = db.Column(db.Boolean, default=False)
+    has_dryer = db.Column(db.Boolean, default=False)
+    has_tv = db.Column(db.Boolean, default=False)
+    has_internet = db.Column(db.Boolean, default=False)
+    has_terrace = db.Column(db.Boolean, default=False)
+    has_security = db.Column(db.Boolean, default=False)
+    has_intercom = db.Column(db.Boolean, default=False)
+    has_caretaker = db.Column(db.Boolean, default=False)
+    has_gym = db.Column(db.Boolean, default=False)
+    has_doorman = db.Column(db.Boolean, default=False)
+    has_pet_friendly = db.Column(db.Boolean, default=False)
+    has_wheelchair_access = db.Column(db.Boolean, default=False)
+    has_concierge = db.Column(db.Boolean, default=False)
+    has_laundry = db.Column(db.Boolean, default=False)
+    has_storage = db.Column(db.Boolean, default=False)
+    has_covered_parking = db.Column(db.Boolean, default=False)
+    has_garage = db.Column(db.Boolean, default=False)
+    has_private_garden = db.Column(db.Boolean, default=False)
+    has_shared_garden = db.Column(db.Boolean, default=False)
+    has_roof_terrace = db.Column(db.Boolean, default=False)
+    has_balcony_terrace = db.Column(db.Boolean, default=False)
+    has_sea_view = db.Column(db.Boolean, default=False)
+    has_mountain_view = db.Column(db.Boolean, default=False)
+    has_city_view = db.Column(db.Boolean, default=False)
+    has_pool_view = db.Column(db.Boolean, default=False)
+    
+    # Détails de construction
+    construction_year = db.Column(db.Integer)
+    land_area = db.Column(db.Float)  # Surface du terrain en m²
+    furnishing_type = db.Column(db.String(50))  # meublé, semi-meublé, vide
+    condition = db.Column(db.String(50))  # neuf, bon état, à rénover, etc.
+    orientation = db.Column(db.String(50))  # nord, sud, est, ouest
+    view = db.Column(db.String(100))  # mer, montagne, ville, piscine, etc.
+    heating_type = db.Column(db.String(50))  # électrique, gaz, fioul, etc.
+    energy_efficiency_rating = db.Column(db.String(2))  # A, B, C, D, E, F, G
+    
+    # Règles
+    allows_pets = db.Column(db.Boolean, default=False)
+    allows_smoking = db.Column(db.Boolean, default=False)
+    allows_events = db.Column(db.Boolean, default=False)
+    
+    # Informations de contact
+    contact_name = db.Column(db.String(100))
+    contact_phone = db.Column(db.String(20))
+    contact_email = db.Column(db.String(120))
     
     # Localisation
     address = db.Column(db.String(300), nullable=False, index=True)
     city = db.Column(db.String(100), nullable=False, index=True)
     state = db.Column(db.String(100), nullable=True, index=True)
+    postal_code = db.Column(db.String(20), nullable=True)
+    neighborhood = db.Column(db.String(100), nullable=True, index=True)  # Extrait de l'adresse
     country = db.Column(db.String(100), nullable=False, default='Haiti', index=True)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
@@ -57,11 +129,14 @@ class Property(db.Model):
     # Disponibilité
     available_from = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     min_stay = db.Column(db.Integer, default=12)  # Durée minimale de location en mois
+    minimum_rent_days = db.Column(db.Integer, default=1)  # Pour les locations courtes
     
     # Métadonnées
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    published_at = db.Column(db.DateTime)
     view_count = db.Column(db.Integer, default=0)  # Nombre de vues
+    favorite_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')  # voir User.add_favorite
     
     # Anciens champs à supprimer après migration
     corridor = db.Column(db.String(50), nullable=True)
@@ -71,11 +146,54 @@ class Property(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     # Relations
-    images = db.relationship('PropertyImage', backref='property', lazy=True, cascade='all, delete-orphan')
+    images = db.relationship('PropertyImage', backref='property', lazy='dynamic', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Property {self.title}>'
     
+    @property
+    def user(self):
+        """Alias de owner utilisé par les templates et les emails"""
+        return self.owner
+    
+    @property
+    def views(self):
+        """Alias de view_count utilisé par les templates"""
+        return self.view_count
+    
+    @staticmethod
+    def extract_neighborhood(address):
+        """Extrait le quartier d'une adresse (premier élément avant une virgule)"""
+        if not address:
+            return None
+        parts = [p.strip() for p in address.split(',') if p.strip()]
+        if len(parts) > 1:
+            return parts[0][:100]
+        return None
+    
+    @validates('address')
+    def _update_neighborhood(self, key, address):
+        """Maintient la colonne neighborhood à jour à chaque écriture de l'adresse"""
+        self.neighborhood = Property.extract_neighborhood(address)
+        return address
+    
+    @staticmethod
+    def compute_effective_annual_price(price, annual_price):
+        """Prix annuel de référence : le prix annuel s'il est défini, sinon 12 mois"""
+        if annual_price is not None:
+            return float(annual_price)
+        if price is not None:
+            return float(price) * 12
+        return None
+    
+    @validates('price', 'annual_price')
+    def _update_effective_annual_price(self, key, value):
+        """Maintient effective_annual_price à jour à chaque écriture d'un prix"""
+        price = value if key == 'price' else self.price
+        annual_price = value if key == 'annual_price' else self.annual_price
+        self.effective_annual_price = Property.compute_effective_annual_price(price, annual_price)
+        return value
+    
     def get_primary_image(self):
         """Retourne l'image principale de la propriété"""
         return self.images.filter_by(is_primary=True).first() or self.images.first()
@@ -84,22 +202,13 @@ class Property(db.Model):
         """Génère l'URL d'une image avec la taille spécifiée"""
         if not image:
             return url_for('static', filename='images/placeholder-property.jpg')
-        
-        # Gestion des différentes tailles d'images
-        base, ext = os.path.splitext(image.filename)
-        if size == 'thumbnail':
-            filename = f"{base}_thumb{ext}"
-        elif size == 'large':
-            filename = f"{base}_large{ext}"
-        else:  # medium par défaut
-            filename = image.filename
-            
-        return url_for('static', filename=f'uploads/properties/{self.id}/{filename}')
+        return image.url(size)
     
     def increment_views(self):
-        """Incrémente le compteur de vues"""
+        """Incrémente le compteur de vues et enregistre la vue pour les statistiques"""
         self.view_count = Property.view_count + 1
         db.session.add(self)
+        db.session.add(PropertyView(property_id=self.id))
         db.session.commit()
     
     def to_dict(self):
@@ -111,8 +220,13 @@ class Property(db.Model):
             'title': self.title,
             'description': self.description,
             'property_type': self.property_type,
+            'transaction_type': self.transaction_type,
+            'status': self.status,
             'price': self.price,
             'annual_price': self.annual_price,
+            'effective_annual_price': self.effective_annual_price,
+            'price_type': self.price_type,
+            'currency': self.currency,
             'rooms': self.rooms,
             'bedrooms': self.bedrooms,
             'bathrooms': self.bathrooms,
@@ -120,11 +234,14 @@ class Property(db.Model):
             'address': self.address,
             'city': self.city,
             'state': self.state,
+            'neighborhood': self.neighborhood,
+            'postal_code': self.postal_code,
             'country': self.country,
             'latitude': self.latitude,
             'longitude': self.longitude,
             'is_available': self.is_available,
             'is_featured': self.is_featured,
+            'is_premium': self.is_premium,
             'has_kitchen': self.has_kitchen,
             'has_parking': self.has_parking,
             'has_garden': self.has_garden,
@@ -135,12 +252,9 @@ class Property(db.Model):
             'min_stay': self.min_stay,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
+            'published_at': self.published_at.isoformat() if self.published_at else None,
             'view_count': self.view_count,
             'image_url': self.get_image_url(primary_image) if primary_image else None,
-            'is_available': self.is_available,
-            'available_from': self.available_from.isoformat() if self.available_from else None,
-            'min_stay': self.min_stay,
-            'created_at': self.created_at.isoformat(),
             'user_id': self.user_id,
             'images': [img.filename for img in self.images.all()]
         }
@@ -170,6 +284,18 @@ class PropertyImage(db.Model):
     def __repr__(self):
         return f'<PropertyImage {self.filename}>'
     
+    def url(self, size='medium'):
+        """Génère l'URL publique de l'image avec la taille spécifiée"""
+        base, ext = os.path.splitext(self.filename)
+        if size == 'thumbnail':
+            filename = f"{base}_thumb{ext}"
+        elif size == 'large':
+            filename = f"{base}_large{ext}"
+        else:  # medium par défaut
+            filename = self.filename
+            
+        return url_for('static', filename=f'uploads/properties/{self.property_id}/{filename}')
+    
     @property
     def path(self):
         """Retourne le chemin complet du fichier"""
@@ -0,0 +1,36 @@
+"""
+E-KAY Platform - Statistiques par annonce
+
+Événements bruts (vues) et agrégats quotidiens calculés par
+ekay_platform.property_stats.
+"""
+
+from datetime import datetime
+
+from ..extensions import db
+
+
+class PropertyView(db.Model):
+    """Une consultation de la page d'une annonce (événement brut)"""
+    __tablename__ = 'property_views'
+
+    id = db.Column(db.Integer, primary_key=True)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False)
+    viewed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<PropertyView {self.property_id} {self.viewed_at}>'
+
+
+class PropertyDailyStats(db.Model):
+    """Vues, favoris et demandes de réservation d'une annonce pour un jour"""
+    __tablename__ = 'property_daily_stats'
+
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True, index=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    favorites = db.Column(db.Integer, nullable=False, default=0)
+    booking_requests = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<PropertyDailyStats {self.property_id} {self.day}>'
@@ -5,12 +5,16 @@ from .. import db
 class Token(db.Model):
     """Modèle pour stocker les tokens de vérification email"""
     __tablename__ = 'tokens'
+    __table_args__ = (
+        # Invalidation des tokens en cours (User.generate_auth_token) et vérification
+        db.Index('ix_tokens_user_type_used', 'user_id', 'token_type', 'used'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     token = db.Column(db.String(100), unique=True, nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     token_type = db.Column(db.String(20), nullable=False)  # 'email_verification' or 'password_reset'
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # purge (token_sweeper)
     used = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
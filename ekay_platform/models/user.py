@@ -8,9 +8,18 @@ Contact: julmicemardoche@gmail.com
 """
 
 from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from sqlalchemy import event, exists, select
 from ..extensions import db, login_manager
+from .associations import favorites as favorites_table
+from .property import Property
+
+try:
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    INSERT_IGNORE_DIALECTS = {'postgresql': pg_insert, 'sqlite': sqlite_insert}
+except ImportError:  # pragma: no cover - SQLAlchemy sans ON CONFLICT
+    INSERT_IGNORE_DIALECTS = {}
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -28,6 +37,7 @@ class User(UserMixin, db.Model):
     reset_password_expires = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     last_seen = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    favorite_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     
     # Relationships
     properties = db.relationship('Property', backref='owner', lazy='dynamic', cascade='all, delete-orphan')
@@ -44,16 +54,20 @@ class User(UserMixin, db.Model):
     def password(self):
         raise AttributeError('password is not a readable attribute')
     
+    # Calculs délégués au pool de ekay_platform.passwords (importé ici :
+    # il dépend de metrics, que les modèles ne doivent pas charger)
     @password.setter
     def password(self, password):
-        self.password_hash = generate_password_hash(password)
+        from ..passwords import hash_password
+        self.password_hash = hash_password(password)
         
     def check_password(self, password):
         """Vérifie si le mot de passe fourni correspond au hash stocké"""
-        return check_password_hash(self.password_hash, password)
+        from ..passwords import verify_password
+        return verify_password(self.password_hash, password)
     
     def verify_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return self.check_password(password)
     
     def ping(self):
         """Mettre à jour le timestamp de dernière activité"""
@@ -104,6 +118,69 @@ class User(UserMixin, db.Model):
             return True
         return False
     
+    # Favoris : requêtes directes sur la table d'association, sans charger la
+    # relation ``favorites``, et compteurs dénormalisés tenus à jour
+    def has_favorite(self, property_id):
+        """Vrai si l'annonce est dans les favoris (une requête EXISTS)"""
+        return db.session.query(exists().where(
+            favorites_table.c.user_id == self.id, favorites_table.c.property_id == property_id
+        )).scalar()
+    
+    def favorite_ids(self, property_ids):
+        """Sous-ensemble de `property_ids` mis en favori, en une requête"""
+        property_ids = list(property_ids)
+        if not property_ids:
+            return set()
+        return set(db.session.execute(select(favorites_table.c.property_id).where(
+            favorites_table.c.user_id == self.id, favorites_table.c.property_id.in_(property_ids)
+        )).scalars())
+    
+    def add_favorite(self, property_id):
+        """Ajoute l'annonce aux favoris ; faux si elle y était déjà"""
+        values = {'user_id': self.id, 'property_id': property_id}
+        connection = db.session.connection()
+        insert = INSERT_IGNORE_DIALECTS.get(connection.dialect.name)
+        if insert is not None:
+            added = connection.execute(insert(favorites_table).values(**values).on_conflict_do_nothing()).rowcount
+        else:
+            added = not self.has_favorite(property_id)
+            if added:
+                connection.execute(favorites_table.insert().values(**values))
+        if added:
+            self._shift_favorite_counts(property_id, 1)
+        return bool(added)
+    
+    def remove_favorite(self, property_id):
+        """Retire l'annonce des favoris ; faux si elle n'y était pas"""
+        removed = db.session.execute(favorites_table.delete().where(
+            favorites_table.c.user_id == self.id, favorites_table.c.property_id == property_id
+        )).rowcount
+        if removed:
+            self._shift_favorite_counts(property_id, -1)
+        return bool(removed)
+    
+    def toggle_favorite(self, property_id):
+        """Ajoute ou retire l'annonce ; vrai si elle est désormais en favori"""
+        if self.remove_favorite(property_id):
+            return False
+        self.add_favorite(property_id)
+        return True
+    
+    def _shift_favorite_counts(self, property_id, delta):
+        properties, users = Property.__table__, User.__table__
+        db.session.execute(properties.update().where(properties.c.id == property_id).values(
+            favorite_count=properties.c.favorite_count + delta))
+        # En base aussi : deux appels avant un flush ne s'écrasent pas
+        db.session.execute(users.update().where(users.c.id == self.id).values(
+            favorite_count=users.c.favorite_count + delta))
+        db.session.add(self)
+        db.session.expire(self, ['favorite_count'])
+    
+    @property
+    def full_name(self):
+        """Nom affiché (utilisé pour pré-remplir les contacts des annonces)"""
+        return self.username
+    
     def avatar_url(self, size=100):
         """Génère une URL d'avatar avec Gravatar"""
         import hashlib
@@ -115,6 +192,23 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 
+@event.listens_for(db.session, 'before_flush')
+def _release_favorites(session, flush_context, instances):
+    # L'ORM supprime les lignes de favoris d'une annonce ou d'un utilisateur
+    # supprimé avant la ligne elle-même : décompter de l'autre côté d'abord
+    users, properties = User.__table__, Property.__table__
+    for obj in session.deleted:
+        if isinstance(obj, Property):
+            table, owner, other = users, favorites_table.c.property_id, favorites_table.c.user_id
+        elif isinstance(obj, User):
+            table, owner, other = properties, favorites_table.c.user_id, favorites_table.c.property_id
+        else:
+            continue
+        session.connection().execute(table.update().where(
+            table.c.id.in_(select(other).where(owner == obj.id))
+        ).values(favorite_count=table.c.favorite_count - 1))
+
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
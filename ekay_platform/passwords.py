@@ -0,0 +1,144 @@
+"""
+E-KAY Platform - Hachage des mots de passe hors du thread de requête
+
+PBKDF2 coûte plusieurs centaines de millisecondes de CPU par calcul. Les
+calculs (``User.password``, ``User.check_password``) passent par un pool
+borné de ``PASSWORD_HASH_WORKERS`` threads ou processus
+(``PASSWORD_HASH_EXECUTOR``) : une rafale de connexions n'occupe jamais plus
+de ce nombre de cœurs, les autres requêtes gardent le reste.
+
+- ``thread`` : hashlib relâche le GIL pendant PBKDF2, les calculs tournent
+  donc vraiment en parallèle. Sous gevent (threading patché), le pool de
+  threads système du hub est utilisé pour ne pas bloquer la boucle.
+- ``process`` : pool de processus créé au premier usage dans chaque worker
+  (après le fork de gunicorn).
+- ``sync`` : calcul direct dans le thread appelant (comportement d'origine).
+
+Rehachage à la connexion : si le hash stocké n'utilise pas
+``PASSWORD_HASH_METHOD`` (nombre d'itérations relevé, autre algorithme),
+``auth.login`` le recalcule avec le mot de passe qui vient d'être vérifié.
+
+Les durées (attente comprise) et les calculs en cours sont exposés par
+``metrics`` (``ekay_password_hash_seconds``, ``ekay_password_hash_pending``).
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .metrics import observe_password_hash, record_password_rehash
+
+EXECUTORS = ('thread', 'process', 'sync')
+
+
+def _gevent_threadpool():
+    """Pool de threads système de gevent si threading est patché"""
+    gevent = sys.modules.get('gevent')
+    if gevent is None:
+        return None
+    from gevent import monkey
+    return gevent.get_hub().threadpool if monkey.is_module_patched('threading') else None
+
+
+class PasswordHasher:
+    """Hachage et vérification dans un pool borné"""
+
+    def __init__(self, method=None, salt_length=16, workers=2, executor='thread', timeout=30.0):
+        if executor not in EXECUTORS:
+            raise ValueError(f'PASSWORD_HASH_EXECUTOR inconnu : {executor}')
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.executor = executor
+        self.timeout = timeout
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._prefix = None
+
+    def _get_pool(self):
+        # Un pool par processus : celui du maître n'est pas utilisable après le fork
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+                    self._pool = pool_class(max_workers=self.workers)
+                    self._pid = os.getpid()
+        return self._pool
+
+    def _run(self, operation, func, *args):
+        with observe_password_hash(operation):
+            if self.executor == 'sync':
+                return func(*args)
+            if self.executor == 'thread':
+                threadpool = _gevent_threadpool()
+                if threadpool is not None:
+                    return threadpool.spawn(func, *args).get(timeout=self.timeout)
+            return self._get_pool().submit(func, *args).result(timeout=self.timeout)
+
+    def hash(self, password):
+        if self.method is None:
+            return self._run('hash', generate_password_hash, password)
+        return self._run('hash', generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        if not pwhash:
+            return False
+        return self._run('verify', check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Vrai si `pwhash` n'a pas été calculé avec la méthode configurée"""
+        if self.method is None or not pwhash:
+            return False
+        if self._prefix is None:
+            # Forme normalisée de la méthode (itérations par défaut comprises)
+            self._prefix = generate_password_hash('', self.method, 1).split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._prefix
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+_sync_hasher = PasswordHasher(executor='sync')
+
+
+def get_hasher():
+    """Hacheur de l'application courante ; calcul direct hors application"""
+    if has_app_context():
+        return current_app.extensions.get('password_hasher', _sync_hasher)
+    return _sync_hasher
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_password(pwhash, password):
+    return get_hasher().verify(pwhash, password)
+
+
+def rehash_if_needed(user, password):
+    """Recalcule le hash de `user` avec la méthode actuelle ; à appeler après une vérification réussie"""
+    if not get_hasher().needs_rehash(user.password_hash):
+        return False
+    user.password = password
+    record_password_rehash()
+    return True
+
+
+def init_app(app):
+    hasher = PasswordHasher(
+        method=app.config.get('PASSWORD_HASH_METHOD'),
+        salt_length=app.config.get('PASSWORD_SALT_LENGTH', 16),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 2),
+        executor=app.config.get('PASSWORD_HASH_EXECUTOR', 'thread'),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 30.0),
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
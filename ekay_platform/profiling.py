@@ -0,0 +1,185 @@
+"""
+E-KAY Platform - Profilage par échantillonnage des requêtes
+
+Profilage optionnel (``PROFILING_ENABLED``) d'une fraction des requêtes de
+production. Une requête est profilée si :
+
+- son endpoint figure dans ``PROFILING_ENDPOINTS`` ;
+- elle porte l'en-tête ``X-Profile`` égal à ``PROFILING_TOKEN`` ;
+- ou elle est tirée au sort avec la probabilité ``PROFILING_SAMPLE_RATE``.
+
+Pendant la requête, un thread échantillonne la pile du thread qui la traite
+toutes les ``PROFILING_INTERVAL`` secondes. Les piles sont écrites au format
+« folded » (``frame;frame;frame N``) dans ``PROFILING_DIR``, un fichier par
+requête ; seuls les ``PROFILING_MAX_FILES`` plus récents sont conservés.
+
+Agrégation pour flamegraph.pl ou speedscope :
+
+    python -m ekay_platform.profiling profiles/ --endpoint properties.view_property -o view.folded
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_SUFFIX = '.folded'
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Échantillonne périodiquement la pile d'un thread"""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ekay-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+def write_profile(directory, endpoint, duration, stacks, max_files):
+    """Écrit un profil puis supprime les plus anciens au-delà de `max_files`"""
+    os.makedirs(directory, exist_ok=True)
+    name = '{}-{}-{}-{}ms{}'.format(
+        datetime.utcnow().strftime('%Y%m%dT%H%M%S%f'), os.getpid(),
+        endpoint or 'none', int(duration * 1000), PROFILE_SUFFIX
+    )
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+    profiles = sorted(p for p in os.listdir(directory) if p.endswith(PROFILE_SUFFIX))
+    for old in profiles[:max(0, len(profiles) - max_files)]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except OSError:
+            pass  # déjà supprimé par un autre worker
+    return path
+
+
+def _profile_endpoint(filename):
+    # <horodatage>-<pid>-<endpoint>-<durée>ms.folded
+    return filename[:-len(PROFILE_SUFFIX)].split('-', 2)[2].rsplit('-', 1)[0]
+
+
+def aggregate(directory, endpoint=None, since=None):
+    """Fusionne les profils d'un répertoire, éventuellement filtrés"""
+    stacks = Counter()
+    files = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(PROFILE_SUFFIX):
+            continue
+        if endpoint and _profile_endpoint(name) != endpoint:
+            continue
+        if since and name[:len(since)] < since:
+            continue
+        files += 1
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack:
+                    stacks[stack] += int(count)
+    return stacks, files
+
+
+def _should_profile(app):
+    token = app.config.get('PROFILING_TOKEN')
+    if token and request.headers.get(PROFILE_HEADER) == token:
+        return True
+    if request.endpoint in app.config.get('PROFILING_ENDPOINTS', ()):
+        return True
+    return random.random() < app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+
+
+def init_app(app):
+    """Active l'échantillonnage des requêtes si PROFILING_ENABLED est défini"""
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    directory = app.config.get('PROFILING_DIR') or os.path.join(app.instance_path, 'profiles')
+    interval = app.config.get('PROFILING_INTERVAL', 0.005)
+    max_files = app.config.get('PROFILING_MAX_FILES', 500)
+
+    @app.before_request
+    def _start_profiler():
+        if _should_profile(app):
+            g.profiler = StackSampler(threading.get_ident(), interval).start()
+
+    @app.teardown_request
+    def _stop_profiler(exc):
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return
+        stacks = sampler.stop()
+        try:
+            write_profile(directory, request.endpoint, sampler.duration, stacks, max_files)
+        except OSError as e:
+            app.logger.error(f"Impossible d'écrire le profil de {request.endpoint}: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Agrège les profils de requêtes au format folded')
+    parser.add_argument('directory', help='répertoire PROFILING_DIR')
+    parser.add_argument('--endpoint', help='ne garder que cet endpoint (ex. properties.view_property)')
+    parser.add_argument('--since', help='horodatage minimal, ex. 20250101 ou 20250101T12')
+    parser.add_argument('--top', type=int, default=0, help='afficher les N fonctions les plus coûteuses')
+    parser.add_argument('-o', '--output', help='fichier de sortie (sortie standard par défaut)')
+    args = parser.parse_args(argv)
+
+    stacks, files = aggregate(args.directory, args.endpoint, args.since)
+    if args.top:
+        # Temps propre : échantillons dont la fonction est au sommet de la pile
+        leaves = Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        print(f'{files} profils, {total} échantillons')
+        for frame, count in leaves.most_common(args.top):
+            print(f'{count / total:7.1%}  {frame}')
+        return
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for stack, count in stacks.most_common():
+            out.write(f'{stack} {count}\n')
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 properties = Blueprint('properties', __name__)
 
-from . import routes, forms, errors, booking_forms
+from . import routes, forms, errors, booking_forms, commands
@@ -0,0 +1,288 @@
+"""
+E-KAY Platform - Import en masse de propriétés (CSV, JSON)
+
+Le fichier est lu ligne à ligne : CSV avec en-tête, JSON Lines (un objet
+par ligne) ou tableau JSON décodé objet par objet. Chaque ligne est validée
+avec les champs de ``PropertyForm`` (mêmes validateurs et messages), puis
+les lignes valides sont insérées par lots (``executemany``) de
+``IMPORT_BATCH_SIZE``. La mémoire utilisée ne dépend pas de la taille du
+fichier : seuls le lot courant, le cache de géocodage (borné) et les
+``max_errors`` premières erreurs sont conservés.
+
+Les lignes sans coordonnées sont géocodées si ``geocode`` est demandé :
+cache en mémoire, puis coordonnées d'une annonce existante à la même
+adresse, puis Nominatim (geopy, une requête par seconde).
+
+Usage : flask properties import annonces.csv --owner agence --status pending
+"""
+
+import codecs
+import csv
+import io
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from werkzeug.datastructures import MultiDict
+from wtforms import Form
+
+from .. import autocomplete, search_index
+from ..admin_stats import apply_deltas, row_deltas
+from ..extensions import db
+from ..generations import invalidate
+from ..models import Property
+from .forms import PropertyForm
+
+FORMATS = ('csv', 'json')
+
+# Champs de PropertyForm repris tels quels (validateurs compris) pour chaque ligne
+IMPORT_FIELDS = [
+    'title', 'description', 'property_type', 'transaction_type',
+    'price', 'annual_price', 'rooms', 'bedrooms', 'bathrooms', 'area',
+    'address', 'city', 'state', 'postal_code', 'country', 'latitude', 'longitude',
+    'year_built', 'floor', 'total_floors',
+    'has_kitchen', 'has_parking', 'has_garden', 'has_balcony', 'has_pool',
+    'is_furnished', 'has_elevator', 'has_air_conditioning', 'has_heating',
+    'is_new_construction', 'allows_pets', 'allows_smoking', 'allows_events',
+    'is_available', 'available_from', 'min_stay', 'minimum_rent_days',
+    'contact_name', 'contact_phone', 'contact_email',
+]
+
+PropertyRowForm = type('PropertyRowForm', (Form,), {
+    name: getattr(PropertyForm, name) for name in IMPORT_FIELDS
+})
+
+BOOLEAN_FIELDS = {
+    name for name in IMPORT_FIELDS if PropertyRowForm.__dict__[name].field_class.__name__ == 'BooleanField'
+}
+# Colonne absente du fichier : défaut du modèle (is_available vrai), pas le False de la case vide
+BOOLEAN_DEFAULTS = {name: bool(Property.__table__.c[name].default.arg) for name in BOOLEAN_FIELDS}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'oui', 'o', 'on', 'x'}
+# Le formulaire propose « 5 pièces ou plus » : le nombre réel est conservé
+MAX_ROOMS_CHOICE = 5
+
+
+class ImportReport:
+    """Bilan d'un import : compteurs et premières erreurs par ligne"""
+
+    def __init__(self, max_errors=1000):
+        self.max_errors = max_errors
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []  # (ligne, champ, message)
+
+    def add_errors(self, line, errors):
+        self.failed += 1
+        for field, message in errors:
+            if len(self.errors) < self.max_errors:
+                self.errors.append((line, field, message))
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': [{'line': line, 'field': field, 'message': message}
+                       for line, field, message in self.errors],
+            'errors_truncated': self.failed > 0 and len(self.errors) >= self.max_errors,
+        }
+
+
+def iter_csv(stream):
+    """Lignes d'un CSV avec en-tête : (numéro de ligne, dict)"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_json(stream, chunk_size=65536):
+    """Objets d'un fichier JSON Lines ou d'un tableau JSON, sans tout charger"""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    in_array = buffer.startswith('[')
+    if in_array:
+        buffer = buffer[1:]
+    number = 0
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if in_array and buffer.startswith(']'):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                if buffer.strip():
+                    raise ValueError(f'JSON invalide après l\'objet {number}')
+                return
+            buffer += chunk
+            continue
+        number += 1
+        buffer = buffer[end:]
+        yield number, obj
+
+
+def open_text(stream):
+    """Flux texte UTF-8 (BOM accepté) à partir d'un flux binaire"""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return codecs.getreader('utf-8-sig')(stream)
+
+
+def iter_rows(stream, fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f'Format inconnu : {fmt}')
+    stream = open_text(stream)
+    return iter_csv(stream) if fmt == 'csv' else iter_json(stream)
+
+
+def row_formdata(row):
+    """Convertit une ligne (valeurs texte ou JSON) en données de formulaire"""
+    data = MultiDict()
+    for name in IMPORT_FIELDS:
+        value = row.get(name)
+        if value is None:
+            continue
+        if name in BOOLEAN_FIELDS:
+            if value is True or str(value).strip().lower() in TRUE_VALUES:
+                data[name] = 'y'
+            continue
+        value = str(value).strip()
+        if value:
+            data[name] = value
+    rooms = data.get('rooms')
+    if rooms and rooms.isdigit() and int(rooms) > MAX_ROOMS_CHOICE:
+        data['rooms'] = str(MAX_ROOMS_CHOICE)
+    return data
+
+
+def _float(value):
+    return float(value) if value not in (None, '') else None
+
+
+def property_row(form, row, owner_id, status, now):
+    """Ligne de la table properties à partir d'un formulaire validé"""
+    record = {name: form[name].data for name in IMPORT_FIELDS}
+    for name, default in BOOLEAN_DEFAULTS.items():
+        if row.get(name) is None:
+            record[name] = default
+    rooms = str(row.get('rooms', '')).strip()
+    record['rooms'] = int(rooms) if rooms.isdigit() else form.rooms.data
+    record['price'] = _float(record['price'])
+    record['annual_price'] = _float(record['annual_price'])
+    record['latitude'] = _float(record['latitude'])
+    record['longitude'] = _float(record['longitude'])
+    record.update({
+        'price_type': 'annual' if record['annual_price'] is not None else 'monthly',
+        'effective_annual_price': Property.compute_effective_annual_price(
+            record['price'], record['annual_price']),
+        'neighborhood': Property.extract_neighborhood(record['address']),
+        'status': status,
+        'user_id': owner_id,
+        'created_at': now,
+        'updated_at': now,
+        'published_at': now if status == 'published' else None,
+    })
+    return record
+
+
+class GeocodeCache:
+    """Coordonnées par adresse : mémoire (LRU bornée), base, puis géocodeur"""
+
+    def __init__(self, geocoder=None, max_size=10000):
+        self.geocoder = geocoder
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self.hits = self.lookups = 0
+
+    @staticmethod
+    def nominatim():
+        """Géocodeur Nominatim limité à une requête par seconde (geopy requis)"""
+        from geopy.extra.rate_limiter import RateLimiter
+        from geopy.geocoders import Nominatim
+        return RateLimiter(Nominatim(user_agent='ekay_platform').geocode, min_delay_seconds=1)
+
+    def _lookup(self, address, postal_code, city, country):
+        known = db.session.query(Property.latitude, Property.longitude).filter(
+            Property.address == address, Property.city == city,
+            Property.latitude.isnot(None), Property.longitude.isnot(None),
+        ).first()
+        if known is not None:
+            return tuple(known)
+        if self.geocoder is None:
+            return None
+        try:
+            location = self.geocoder(f'{address}, {postal_code or ""} {city}, {country}', timeout=10)
+        except Exception:
+            return None  # service indisponible : comme le formulaire, on ne bloque pas
+        return (location.latitude, location.longitude) if location else False
+
+    def locate(self, address, postal_code, city, country):
+        """(latitude, longitude), None si inconnu, False si l'adresse est introuvable"""
+        key = ' '.join(str(part or '').strip().lower() for part in (address, postal_code, city, country))
+        self.lookups += 1
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        result = self._lookup(address, postal_code, city, country)
+        self._cache[key] = result
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return result
+
+
+def import_properties(stream, fmt, owner_id, status='pending', batch_size=500,
+                      geocoder=None, max_errors=1000, on_error=None):
+    """Valide et insère les propriétés d'un fichier, retourne un ImportReport
+
+    `on_error(ligne, erreurs)` est appelé pour chaque ligne rejetée (toutes,
+    sans limite), par exemple pour écrire un rapport complet.
+    """
+    report = ImportReport(max_errors)
+    form = PropertyRowForm()
+    geocode = GeocodeCache(geocoder) if geocoder is not None else None
+    table = Property.__table__
+    now = datetime.utcnow()
+    batch = []
+
+    def flush():
+        if batch:
+            db.session.execute(table.insert(), batch)
+            apply_deltas(db.session.connection(), row_deltas(Property, batch))
+            # Les insertions Core ne passent pas par les événements de session :
+            # index de recherche et autocomplétion de tous les processus sont
+            # invalidés dans la même transaction que le lot
+            invalidate(db.session.connection(), search_index.GENERATION, autocomplete.GENERATION)
+            db.session.commit()
+            report.imported += len(batch)
+            batch.clear()
+
+    for line, row in iter_rows(stream, fmt):
+        report.total += 1
+        if not isinstance(row, dict):
+            errors = [(None, 'La ligne doit être un objet')]
+        else:
+            form.process(row_formdata(row))
+            errors = [] if form.validate() else [
+                (name, str(message)) for name, messages in form.errors.items() for message in messages
+            ]
+        if not errors and geocode is not None and not (form.latitude.data and form.longitude.data):
+            location = geocode.locate(form.address.data, form.postal_code.data,
+                                      form.city.data, form.country.data)
+            if location is False:
+                errors = [('address', 'Impossible de localiser cette adresse. Veuillez vérifier '
+                                      'les informations ou ajouter manuellement les coordonnées GPS.')]
+            elif location is not None:
+                form.latitude.data, form.longitude.data = location
+        if errors:
+            report.add_errors(line, errors)
+            if on_error is not None:
+                on_error(line, errors)
+            continue
+        batch.append(property_row(form, row, owner_id, status, now))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return report
@@ -0,0 +1,81 @@
+"""
+E-KAY Platform - Commandes CLI des propriétés (flask properties ...)
+"""
+
+import csv
+import os
+import time
+
+import click
+
+from . import properties
+from .bulk_import import FORMATS, GeocodeCache, import_properties
+from ..models import User
+
+
+@properties.cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--owner', required=True, help="nom d'utilisateur propriétaire des annonces")
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help='déduit de l\'extension par défaut')
+@click.option('--status', default='pending', type=click.Choice(['draft', 'pending', 'published']))
+@click.option('--batch-size', default=None, type=int, help='lignes par INSERT (IMPORT_BATCH_SIZE)')
+@click.option('--geocode/--no-geocode', default=False, help='géocoder les lignes sans coordonnées (geopy)')
+@click.option('--errors', 'errors_path', type=click.Path(dir_okay=False, writable=True),
+              help='CSV où écrire toutes les erreurs (ligne, champ, message)')
+def import_command(source, owner, fmt, status, batch_size, geocode, errors_path):
+    """Importe des propriétés depuis un fichier CSV ou JSON"""
+    from flask import current_app
+
+    user = User.query.filter_by(username=owner).first()
+    if user is None:
+        raise click.BadParameter(f'utilisateur inconnu : {owner}', param_hint='--owner')
+    if fmt is None:
+        extension = os.path.splitext(source.name)[1].lower()
+        fmt = 'csv' if extension == '.csv' else 'json'
+
+    errors_file = open(errors_path, 'w', newline='', encoding='utf-8') if errors_path else None
+    writer = csv.writer(errors_file) if errors_file else None
+    if writer:
+        writer.writerow(['line', 'field', 'message'])
+
+    def on_error(line, errors):
+        if writer:
+            writer.writerows((line, field, message) for field, message in errors)
+
+    started = time.perf_counter()
+    try:
+        report = import_properties(
+            source, fmt, user.id, status=status,
+            batch_size=batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 500),
+            geocoder=GeocodeCache.nominatim() if geocode else None,
+            max_errors=20, on_error=on_error,
+        )
+    finally:
+        if errors_file:
+            errors_file.close()
+
+    click.echo(f'{report.imported} importées, {report.failed} rejetées sur {report.total} lignes '
+               f'en {time.perf_counter() - started:.1f} s')
+    for line, field, message in report.errors:
+        click.echo(f'  ligne {line}, {field or "-"} : {message}', err=True)
+    if report.to_dict()['errors_truncated']:
+        click.echo('  … liste tronquée (--errors pour le rapport complet)', err=True)
+
+
+@properties.cli.command('rollup-stats')
+@click.option('--days', default=None, type=int, help='jours recalculés (STATS_ROLLUP_DAYS)')
+@click.option('--since', type=click.DateTime(['%Y-%m-%d']), help='recalculer depuis cette date (rattrapage)')
+def rollup_stats_command(days, since):
+    """Agrège vues, favoris et réservations par annonce et par jour (tâche périodique)"""
+    from datetime import datetime
+
+    from flask import current_app
+
+    from .. import property_stats
+
+    started = time.perf_counter()
+    if since is not None:
+        days = (datetime.utcnow().date() - since.date()).days + 1
+    written, pruned = property_stats.run(current_app.config, days=days)
+    click.echo(f'{written} lignes (annonce, jour) agrégées, {pruned} vues brutes purgées '
+               f'en {time.perf_counter() - started:.1f} s')
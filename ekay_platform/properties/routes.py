@@ -4,18 +4,23 @@ from flask import (
 )
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, exists
 from datetime import datetime, timedelta
 import os
 import uuid
 
 from . import properties
 from ..extensions import db
-from ..models import Property, PropertyImage, User
+from ..models import Property, PropertyImage, User, Booking, PropertyCard, card_query
 from .forms import PropertyForm, PropertyImageForm, PropertySearchForm
 from .booking_forms import BookingForm
 from ..email_utils import send_property_approved_email, send_booking_confirmation, send_booking_notification
 from ..utils import save_property_image, delete_property_images, allowed_file
+from ..autocomplete import get_autocomplete
+from ..rate_limit import rate_limit
+from ..search_index import (
+    AMENITY_FIELDS, IndexPagination, filter_query, get_search_index, order_query
+)
 
 # Nombre de propriétés par page pour la pagination
 PROPERTIES_PER_PAGE = 12
@@ -27,61 +32,55 @@ def list_properties():
     # Initialiser le formulaire de recherche avec les paramètres de l'URL
     search_form = PropertySearchForm()
     
-    # Construire la requête de base
-    query = Property.query.filter_by(is_available=True)
-    
-    # Appliquer les filtres
+    # Rassembler les critères de recherche
+    criteria = {}
     if search_form.validate():
         # Filtre par type de bien
         if search_form.property_type.data:
-            query = query.filter(Property.property_type == search_form.property_type.data)
+            criteria['property_type'] = search_form.property_type.data
         
         # Filtre par prix
         if search_form.min_price.data:
-            query = query.filter(Property.price >= search_form.min_price.data)
+            criteria['min_price'] = float(search_form.min_price.data)
         if search_form.max_price.data:
-            query = query.filter(Property.price <= search_form.max_price.data)
+            criteria['max_price'] = float(search_form.max_price.data)
         
         # Filtre par nombre de pièces
-        if search_form.min_rooms.data > 0:
-            query = query.filter(Property.rooms >= search_form.min_rooms.data)
+        if search_form.min_rooms.data and search_form.min_rooms.data > 0:
+            criteria['min_rooms'] = search_form.min_rooms.data
         
         # Filtre par caractéristiques
-        if search_form.has_kitchen.data:
-            query = query.filter_by(has_kitchen=True)
-        if search_form.has_parking.data:
-            query = query.filter_by(has_parking=True)
-        if search_form.has_garden.data:
-            query = query.filter_by(has_garden=True)
-        if search_form.has_balcony.data:
-            query = query.filter_by(has_balcony=True)
-        if search_form.has_pool.data:
-            query = query.filter_by(has_pool=True)
-        if search_form.is_furnished.data:
-            query = query.filter_by(is_furnished=True)
+        criteria['amenities'] = tuple(
+            field for field in AMENITY_FIELDS if getattr(search_form, field).data
+        )
         
         # Filtre par disponibilité
         if search_form.available_soon.data:
-            query = query.filter(Property.available_from <= datetime.utcnow())
+            criteria['available_before'] = datetime.utcnow()
     
-    # Trier les résultats
     sort_by = request.args.get('sort_by', 'newest')
-    if sort_by == 'price_asc':
-        query = query.order_by(Property.price.asc())
-    elif sort_by == 'price_desc':
-        query = query.order_by(Property.price.desc())
-    elif sort_by == 'area_desc':
-        query = query.order_by(Property.area.desc())
-    else:  # Par défaut, trier par date de création décroissante
-        query = query.order_by(Property.created_at.desc())
-    
-    # Pagination
     page = request.args.get('page', 1, type=int)
-    properties_pagination = query.paginate(
-        page=page, 
-        per_page=PROPERTIES_PER_PAGE,
-        error_out=False
-    )
+    
+    # Utiliser l'index en mémoire s'il est activé, sinon la requête SQL
+    search_index = get_search_index()
+    if search_index is not None:
+        ids, total = search_index.search(criteria, sort_by, page, PROPERTIES_PER_PAGE)
+        # Disponibilité revérifiée : l'index peut avoir une écriture de retard
+        rows = card_query().filter(Property.id.in_(ids)).filter_by(is_available=True).all() if ids else []
+        by_id = {p.id: p for p in rows}
+        properties_pagination = IndexPagination(
+            page, PROPERTIES_PER_PAGE, total,
+            [by_id[pid] for pid in ids if pid in by_id]
+        )
+    else:
+        query = filter_query(card_query().filter_by(is_available=True), criteria)
+        properties_pagination = order_query(query, sort_by).paginate(
+            page=page, 
+            per_page=PROPERTIES_PER_PAGE,
+            error_out=False
+        )
+    # Les templates de liste ne reçoivent que des cartes (colonnes affichées + image principale)
+    properties_pagination.items = PropertyCard.from_properties(properties_pagination.items)
     
     # Pour le formulaire de recherche, conserver les valeurs sélectionnées
     if request.method == 'GET':
@@ -528,21 +527,16 @@ def contact_owner(property_id):
 @login_required
 def toggle_favorite(property_id):
     """Ajoute ou supprime une propriété des favoris"""
-    property = Property.query.get_or_404(property_id)
-    
-    if property in current_user.favorites:
-        current_user.favorites.remove(property)
-        action = 'removed'
-    else:
-        current_user.favorites.append(property)
-        action = 'added'
+    if not db.session.query(exists().where(Property.id == property_id)).scalar():
+        abort(404)
     
+    action = 'added' if current_user.toggle_favorite(property_id) else 'removed'
     db.session.commit()
     
     return jsonify({
         'success': True,
         'action': action,
-        'favorites_count': len(current_user.favorites)
+        'favorites_count': current_user.favorite_count
     })
 
 @properties.route('/favorites')
@@ -581,49 +575,15 @@ def report_property(property_id):
 @properties.route('/api/cities')
 def api_cities():
     """API pour l'autocomplétion des villes"""
-    query = request.args.get('q', '').lower()
-    
-    # Récupérer les villes correspondant à la requête
-    cities = db.session.query(
-        Property.city.distinct().label('city')
-    ).filter(
-        Property.city.ilike(f'%{query}%')
-    ).order_by(
-        Property.city
-    ).limit(10).all()
-    
-    return jsonify([city.city for city in cities])
+    query = request.args.get('q', '')
+    return jsonify(get_autocomplete().complete_cities(query, limit=10))
 
 @properties.route('/api/neighborhoods')
 def api_neighborhoods():
     """API pour l'autocomplétion des quartiers"""
-    query = request.args.get('q', '').lower()
+    query = request.args.get('q', '')
     city = request.args.get('city', '')
-    
-    # Construire la requête
-    q = db.session.query(
-        Property.address.distinct().label('address')
-    ).filter(
-        Property.address.ilike(f'%{query}%')
-    )
-    
-    if city:
-        q = q.filter(Property.city == city)
-    
-    # Exécuter la requête
-    addresses = q.order_by(
-        Property.address
-    ).limit(10).all()
-    
-    # Extraire les noms de quartiers (simplifié)
-    neighborhoods = set()
-    for addr in addresses:
-        # Essayons d'extraire le nom du quartier (c'est une approximation)
-        parts = [p.strip() for p in addr.address.split(',') if p.strip()]
-        if len(parts) > 1:
-            neighborhoods.add(parts[0])  # Le premier élément est souvent le quartier
-    
-    return jsonify(sorted(list(neighborhoods)))
+    return jsonify(get_autocomplete().complete_neighborhoods(query, city=city or None, limit=10))
 
 # Gestion des erreurs
 @properties.errorhandler(404)
@@ -641,6 +601,7 @@ def internal_error(error):
 
 # Routes pour la réservation
 @properties.route('/property/<int:property_id>/book', methods=['GET', 'POST'])
+@rate_limit('booking', scope='user')
 @login_required
 def book_property(property_id):
     """Affiche le formulaire de réservation et traite la soumission"""
@@ -0,0 +1,119 @@
+"""
+E-KAY Platform - Statistiques quotidiennes des annonces
+
+Événements bruts :
+
+- vues : une ligne ``property_views`` par consultation (Property.increment_views) ;
+- favoris : date d'ajout dans la table d'association ``favorites`` ;
+- demandes de réservation : date de création des ``bookings``.
+
+Une tâche périodique (``flask properties rollup-stats``, voir render.yaml)
+les agrège par GROUP BY en une ligne ``property_daily_stats`` par annonce
+et par jour (UTC). Chaque passage recalcule entièrement les
+``STATS_ROLLUP_DAYS`` derniers jours : la tâche est idempotente et rattrape
+les événements arrivés entre deux passages. Les vues brutes plus anciennes
+que ``STATS_VIEW_RETENTION_DAYS`` sont ensuite supprimées, les agrégats
+restent.
+
+Le tableau de bord propriétaire ne lit que les agrégats (deux GROUP BY sur
+quelques lignes par annonce et par jour) ; le jour courant est à jour du
+dernier passage de la tâche.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func
+
+from .extensions import db
+from .models import Booking, Property, PropertyDailyStats, PropertyView, favorites
+
+METRICS = ('views', 'favorites', 'booking_requests')
+
+# Indicateur -> (colonne annonce, horodatage) de l'événement brut
+SOURCES = {
+    'views': (PropertyView.property_id, PropertyView.viewed_at),
+    'favorites': (favorites.c.property_id, favorites.c.created_at),
+    'booking_requests': (Booking.property_id, Booking.created_at),
+}
+
+
+def _as_date(value):
+    # func.date renvoie une chaîne sous SQLite, une date sous PostgreSQL
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def rollup(start, end=None):
+    """Recalcule les agrégats des jours `start` à `end` (inclus), valide la transaction
+
+    Retourne le nombre de lignes (annonce, jour) écrites.
+    """
+    end = end or datetime.utcnow().date()
+    since = datetime.combine(start, time.min)
+    until = datetime.combine(end + timedelta(days=1), time.min)
+
+    rows = {}
+    for metric, (property_id, timestamp) in SOURCES.items():
+        day = func.date(timestamp)
+        query = db.session.query(property_id, day, func.count()).filter(
+            timestamp >= since, timestamp < until
+        ).group_by(property_id, day)
+        for key, value, count in query:
+            row = rows.setdefault((key, _as_date(value)), dict.fromkeys(METRICS, 0))
+            row[metric] = count
+
+    table = PropertyDailyStats.__table__
+    db.session.execute(table.delete().where(table.c.day >= start, table.c.day <= end))
+    if rows:
+        db.session.execute(table.insert(), [
+            {'property_id': property_id, 'day': day, **counts}
+            for (property_id, day), counts in rows.items()
+        ])
+    db.session.commit()
+    return len(rows)
+
+
+def prune_views(before):
+    """Supprime les vues brutes antérieures à `before` (déjà agrégées)"""
+    deleted = PropertyView.query.filter(PropertyView.viewed_at < before).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def run(config, days=None):
+    """Passage de la tâche périodique : agrégation puis purge des vues brutes"""
+    days = days or config.get('STATS_ROLLUP_DAYS', 2)
+    today = datetime.utcnow().date()
+    written = rollup(today - timedelta(days=days - 1), today)
+    # Ne jamais purger une vue que ce passage n'a pas pu agréger
+    retention = max(config.get('STATS_VIEW_RETENTION_DAYS', 90), days)
+    pruned = prune_views(datetime.combine(today - timedelta(days=retention - 1), time.min))
+    return written, pruned
+
+
+def owner_stats(user_id, days=30):
+    """Statistiques des annonces d'un propriétaire sur les `days` derniers jours
+
+    Retourne ``daily`` (liste (jour, {indicateur: total}) sans trou),
+    ``by_property`` (id d'annonce -> {indicateur: total}) et ``totals``.
+    """
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    sums = [func.sum(getattr(PropertyDailyStats, metric)) for metric in METRICS]
+    base = db.session.query().select_from(PropertyDailyStats).join(
+        Property, Property.id == PropertyDailyStats.property_id
+    ).filter(Property.user_id == user_id, PropertyDailyStats.day >= start)
+
+    per_day = {
+        _as_date(day): dict(zip(METRICS, values))
+        for day, *values in base.add_columns(PropertyDailyStats.day, *sums).group_by(PropertyDailyStats.day)
+    }
+    by_property = {
+        property_id: dict(zip(METRICS, values))
+        for property_id, *values in base.add_columns(PropertyDailyStats.property_id, *sums)
+        .group_by(PropertyDailyStats.property_id)
+    }
+    empty = dict.fromkeys(METRICS, 0)
+    daily = [(day, per_day.get(day, empty))
+             for day in (start + timedelta(days=offset) for offset in range(days))]
+    totals = {metric: sum(counts[metric] for counts in by_property.values()) for metric in METRICS}
+    return {'daily': daily, 'by_property': by_property, 'totals': totals}
@@ -0,0 +1,270 @@
+"""
+E-KAY Platform - Limitation du débit des formulaires sensibles
+
+Connexion, inscription, envois d'emails (réinitialisation, vérification) et
+demandes de réservation coûtent cher (hachage du mot de passe, envoi SMTP) :
+une rafale de tentatives (credential stuffing) occuperait les workers. Le
+décorateur ``rate_limit`` compte les soumissions dans un seau à jetons par
+limite et par client :
+
+- ``RATE_LIMITS`` donne pour chaque limite ``N/période`` (``10/minute``) :
+  N soumissions d'affilée au plus, puis une de plus tous les période/N ;
+- le client est l'adresse IP (``scope='ip'``) ou l'utilisateur connecté
+  (``scope='user'``, lu dans la session, sans requête SQL) ;
+- une soumission refusée reçoit une 429 avec ``Retry-After`` avant tout
+  accès à la base ou hachage.
+
+Stockage des seaux (``RATE_LIMIT_STORAGE``) :
+
+- ``memory`` : dictionnaire du processus, partagé par ses threads. Sous
+  gunicorn, chaque worker a ses propres seaux (limite effective multipliée
+  par le nombre de workers) ;
+- ``sqlite:///chemin/fichier.db`` : fichier partagé par les workers d'une
+  même machine ;
+- ``redis://hôte:port/base`` : serveur compatible Redis (Redis, Valkey,
+  KeyDB...) partagé par toutes les machines, mise à jour atomique par un
+  script Lua. Nécessite le paquet ``redis``.
+
+Si le stockage partagé est indisponible, la requête passe (un journal
+d'avertissement est émis) : la limitation ne doit jamais bloquer les
+connexions légitimes. Derrière un proxy, ``RATE_LIMIT_PROXY_COUNT`` indique
+combien d'adresses de ``X-Forwarded-For`` ont été ajoutées par des proxys
+de confiance.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import abort, current_app, request, session
+
+from .metrics import record_rate_limited
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    redis = None
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(value):
+    """``'10/minute'`` -> (capacité, jetons par seconde)"""
+    count, _, period = value.partition('/')
+    count = int(count)
+    seconds = PERIODS.get(period.strip().rstrip('s'))
+    if count <= 0 or seconds is None:
+        raise ValueError(f'limite invalide : {value!r} (attendu N/second|minute|hour|day)')
+    return count, count / seconds
+
+
+def refill(tokens, updated, now, capacity, rate, cost=1):
+    """Seau après remplissage puis retrait de `cost` jetons
+
+    Retourne (jetons restants, secondes à attendre ; 0 si accepté).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class MemoryStorage:
+    """Seaux du processus, protégés par un verrou"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # clé -> (jetons, horodatage)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, retry_after = refill(tokens, updated, now, capacity, rate, cost)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteStorage:
+    """Seaux dans un fichier SQLite partagé par les workers de la machine"""
+
+    PRUNE_EVERY = 1000  # appels entre deux purges des seaux inactifs
+    IDLE_SECONDS = 86400
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def consume(self, key, capacity, rate, cost=1):
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens, retry_after = refill(*(row or (capacity, now)), now, capacity, rate, cost)
+            connection.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now),
+            )
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                connection.execute('DELETE FROM rate_limit_buckets WHERE updated < ?', (now - self.IDLE_SECONDS,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def clear(self):
+        self._connection().execute('DELETE FROM rate_limit_buckets')
+
+
+# Même calcul que refill(), atomique côté serveur ; le délai est renvoyé en
+# chaîne (les nombres Lua sont tronqués en entiers dans la réponse)
+REDIS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisStorage:
+    """Seaux sur un serveur compatible Redis, partagés par toutes les machines"""
+
+    def __init__(self, url=None, client=None, prefix='ekay:rl:'):
+        if client is None:
+            if redis is None:
+                raise RuntimeError('RATE_LIMIT_STORAGE=redis:// nécessite le paquet redis')
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(REDIS_SCRIPT)
+
+    def consume(self, key, capacity, rate, cost=1):
+        result = self._script(keys=[self.prefix + key], args=[capacity, rate, cost, time.time()])
+        return float(result)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+def make_storage(uri):
+    if not uri or uri == 'memory':
+        return MemoryStorage()
+    if uri.startswith('sqlite:///'):
+        return SQLiteStorage(uri[len('sqlite:///'):])
+    if uri.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStorage(uri)
+    raise ValueError(f'RATE_LIMIT_STORAGE inconnu : {uri}')
+
+
+class RateLimiter:
+    """Limites nommées et stockage des seaux d'une application"""
+
+    def __init__(self, storage, limits, proxy_count=0):
+        self.storage = storage
+        self.limits = {name: parse_limit(value) for name, value in limits.items() if value}
+        self.proxy_count = proxy_count
+
+    def client_ip(self):
+        if self.proxy_count:
+            forwarded = request.headers.getlist('X-Forwarded-For')
+            addresses = [address.strip() for value in forwarded for address in value.split(',')]
+            if len(addresses) >= self.proxy_count:
+                return addresses[-self.proxy_count]
+        return request.remote_addr or 'inconnue'
+
+    def identity(self, scope):
+        if scope == 'user':
+            user_id = session.get('_user_id')
+            if user_id is not None:
+                return f'user:{user_id}'
+        return f'ip:{self.client_ip()}'
+
+    def hit(self, name, scope='ip'):
+        """Consomme un jeton ; retourne le délai d'attente en secondes (0 si accepté)"""
+        limit = self.limits.get(name)
+        if limit is None:
+            return 0.0
+        capacity, rate = limit
+        try:
+            return self.storage.consume(f'{name}:{self.identity(scope)}', capacity, rate)
+        except Exception as exc:  # stockage partagé indisponible : ne pas bloquer
+            current_app.logger.warning('Limitation de débit indisponible (%s) : %s', name, exc)
+            return 0.0
+
+
+def rate_limit(name, scope='ip', methods=('POST',)):
+    """Refuse par une 429 les soumissions au-delà de la limite `name` de ``RATE_LIMITS``
+
+    À placer sous ``@route`` et au-dessus de ``@login_required`` : le refus
+    intervient avant tout chargement de l'utilisateur.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            limiter = current_app.extensions.get('rate_limiter')
+            if limiter is not None and request.method in methods:
+                retry_after = limiter.hit(name, scope)
+                if retry_after:
+                    record_rate_limited(name)
+                    abort(429, retry_after=math.ceil(retry_after))
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def init_app(app):
+    """Active la limitation si RATE_LIMIT_ENABLED"""
+    if not app.config.get('RATE_LIMIT_ENABLED'):
+        return None
+    limiter = RateLimiter(
+        make_storage(app.config.get('RATE_LIMIT_STORAGE', 'memory')),
+        app.config.get('RATE_LIMITS', {}),
+        proxy_count=app.config.get('RATE_LIMIT_PROXY_COUNT', 0),
+    )
+    app.extensions['rate_limiter'] = limiter
+    return limiter
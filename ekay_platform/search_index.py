@@ -0,0 +1,421 @@
+"""
+E-KAY Platform - Index de recherche en mémoire
+
+Index colonnaire (tableaux NumPy) des propriétés disponibles, utilisé par
+``list_properties`` pour évaluer les filtres et les tris sans interroger la
+base de données. L'index est construit au démarrage puis mis à jour de façon
+incrémentale après chaque commit qui touche une propriété. Chaque worker a
+son propre index : les écritures des autres processus incrémentent la
+génération partagée ``search_index`` (voir ``generations``), et l'index
+se reconstruit à la requête suivante quand elle a changé.
+
+NumPy est une dépendance optionnelle : sans elle, l'index reste désactivé et
+les routes utilisent la requête SQL habituelle.
+"""
+
+import math
+import threading
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+
+from .extensions import db
+from .generations import Generation
+from .models import Property
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+# Équipements filtrables, dans l'ordre des bits du masque
+AMENITY_FIELDS = (
+    'has_kitchen', 'has_parking', 'has_garden',
+    'has_balcony', 'has_pool', 'is_furnished'
+)
+
+SORT_OPTIONS = ('newest', 'price_asc', 'price_desc', 'area_desc')
+
+# Compteur partagé des modifications de l'index (table cache_generations)
+GENERATION = 'search_index'
+
+# Colonnes chargées pour construire l'index
+INDEX_COLUMNS = (
+    'id', 'is_available', 'effective_annual_price', 'rooms', 'area', 'created_at',
+    'available_from', 'city', 'property_type'
+) + AMENITY_FIELDS
+
+
+def filter_query(query, criteria):
+    """Applique les critères de recherche à une requête SQL sur Property
+    
+    Les bornes de prix portent sur le prix annuel effectif, comme sur la page d'accueil.
+    """
+    if criteria.get('property_type'):
+        query = query.filter(Property.property_type == criteria['property_type'])
+    if criteria.get('city'):
+        query = query.filter(Property.city == criteria['city'])
+    if criteria.get('min_price') is not None:
+        query = query.filter(Property.effective_annual_price >= criteria['min_price'])
+    if criteria.get('max_price') is not None:
+        query = query.filter(Property.effective_annual_price <= criteria['max_price'])
+    if criteria.get('min_rooms'):
+        query = query.filter(Property.rooms >= criteria['min_rooms'])
+    for field in criteria.get('amenities', ()):
+        query = query.filter(getattr(Property, field) == True)  # noqa: E712
+    if criteria.get('available_before') is not None:
+        query = query.filter(Property.available_from <= criteria['available_before'])
+    return query
+
+
+def order_query(query, sort_by):
+    """Applique l'ordre de tri demandé à une requête SQL sur Property"""
+    if sort_by == 'price_asc':
+        return query.order_by(Property.effective_annual_price.asc(), Property.id.desc())
+    if sort_by == 'price_desc':
+        return query.order_by(Property.effective_annual_price.desc(), Property.id.desc())
+    if sort_by == 'area_desc':
+        return query.order_by(Property.area.is_(None), Property.area.desc(), Property.id.desc())
+    return query.order_by(Property.created_at.desc(), Property.id.desc())
+
+
+def _timestamp(value):
+    """Convertit une date en timestamp UTC (NaN si absente)"""
+    if value is None:
+        return math.nan
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _number(value):
+    """Convertit une valeur numérique optionnelle en float (NaN si absente)"""
+    return math.nan if value is None else float(value)
+
+
+class IndexPagination:
+    """Pagination compatible avec celle de Flask-SQLAlchemy pour les templates"""
+
+    def __init__(self, page, per_page, total, items):
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def pages(self):
+        if not self.per_page or not self.total:
+            return 0
+        return int(math.ceil(self.total / float(self.per_page)))
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def has_next(self):
+        return self.page < self.pages
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    def iter_pages(self, left_edge=2, left_current=2, right_current=4, right_edge=2):
+        last = 0
+        for num in range(1, self.pages + 1):
+            if (num <= left_edge
+                    or self.page - left_current - 1 < num < self.page + right_current
+                    or num > self.pages - right_edge):
+                if last + 1 != num:
+                    yield None
+                yield num
+                last = num
+
+
+class PropertySearchIndex:
+    """Index colonnaire des propriétés disponibles"""
+
+    # Capacité initiale des tableaux, doublée à chaque dépassement
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ready = False
+        self.generation = Generation(GENERATION)
+        self._reset(0)
+
+    def _reset(self, capacity):
+        capacity = max(capacity, self.INITIAL_CAPACITY)
+        self.size = 0
+        self.tombstones = 0
+        self._positions = {}
+        self._city_codes = {}
+        self._type_codes = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._price = np.zeros(capacity, dtype=np.float64)  # Prix annuel effectif
+        self._rooms = np.zeros(capacity, dtype=np.int32)
+        self._area = np.zeros(capacity, dtype=np.float64)
+        self._created_at = np.zeros(capacity, dtype=np.float64)
+        self._available_from = np.zeros(capacity, dtype=np.float64)
+        self._amenities = np.zeros(capacity, dtype=np.uint8)
+        self._city = np.zeros(capacity, dtype=np.int32)
+        self._type = np.zeros(capacity, dtype=np.int32)
+        self._live = np.zeros(capacity, dtype=bool)
+
+    @property
+    def count(self):
+        """Nombre de propriétés indexées"""
+        return len(self._positions)
+
+    def _columns(self):
+        return ('_ids', '_price', '_rooms', '_area', '_created_at',
+                '_available_from', '_amenities', '_city', '_type', '_live')
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _code(self, codes, value):
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _write(self, pos, row):
+        self._ids[pos] = row['id']
+        self._price[pos] = _number(row['effective_annual_price'])
+        self._rooms[pos] = row['rooms'] or 0
+        self._area[pos] = _number(row['area'])
+        self._created_at[pos] = _timestamp(row['created_at'])
+        self._available_from[pos] = _timestamp(row['available_from'])
+        bits = 0
+        for bit, field in enumerate(AMENITY_FIELDS):
+            if row[field]:
+                bits |= 1 << bit
+        self._amenities[pos] = bits
+        self._city[pos] = self._code(self._city_codes, row['city'])
+        self._type[pos] = self._code(self._type_codes, row['property_type'])
+        self._live[pos] = True
+
+    def build(self, session=None):
+        """Construit l'index à partir de la base de données"""
+        session = session or db.session
+        # Génération lue avant les lignes : une écriture concurrente provoque
+        # au pire une reconstruction de plus, jamais une modification manquée
+        generation = self.generation.read(session)
+        columns = [getattr(Property, name) for name in INDEX_COLUMNS]
+        rows = session.query(*columns).filter(Property.is_available == True).all()  # noqa: E712
+        with self._lock:
+            self._reset(len(rows) * 2)
+            for row in rows:
+                self._append(dict(zip(INDEX_COLUMNS, row)))
+            self.generation.built(generation)
+            self.ready = True
+        return self.count
+
+    def _append(self, row):
+        if self.size == len(self._ids):
+            self._grow()
+        pos = self.size
+        self._write(pos, row)
+        self._positions[row['id']] = pos
+        self.size += 1
+
+    def upsert(self, row):
+        """Ajoute ou met à jour une propriété (dictionnaire de INDEX_COLUMNS)"""
+        with self._lock:
+            if not row['is_available']:
+                self.remove(row['id'])
+                return
+            pos = self._positions.get(row['id'])
+            if pos is None:
+                self._append(row)
+            else:
+                self._write(pos, row)
+
+    def remove(self, property_id):
+        """Retire une propriété de l'index"""
+        with self._lock:
+            pos = self._positions.pop(property_id, None)
+            if pos is None:
+                return
+            self._live[pos] = False
+            self.tombstones += 1
+            if self.tombstones > max(64, self.size // 4):
+                self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._live[:self.size])
+        for name in self._columns():
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self._live[len(keep):self.size] = False
+        self.size = len(keep)
+        self.tombstones = 0
+        self._positions = {int(pid): pos for pos, pid in enumerate(self._ids[:self.size])}
+
+    def _mask(self, criteria):
+        n = self.size
+        mask = self._live[:n].copy()
+        if criteria.get('property_type'):
+            code = self._type_codes.get(criteria['property_type'])
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self._type[:n] == code
+        if criteria.get('city'):
+            code = self._city_codes.get(criteria['city'])
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self._city[:n] == code
+        if criteria.get('min_price') is not None:
+            mask &= self._price[:n] >= float(criteria['min_price'])
+        if criteria.get('max_price') is not None:
+            mask &= self._price[:n] <= float(criteria['max_price'])
+        if criteria.get('min_rooms'):
+            mask &= self._rooms[:n] >= int(criteria['min_rooms'])
+        required = 0
+        for field in criteria.get('amenities', ()):
+            required |= 1 << AMENITY_FIELDS.index(field)
+        if required:
+            mask &= (self._amenities[:n] & required) == required
+        if criteria.get('available_before') is not None:
+            mask &= self._available_from[:n] <= _timestamp(criteria['available_before'])
+        return mask
+
+    def search(self, criteria, sort_by='newest', page=1, per_page=12):
+        """Retourne (ids de la page, nombre total de résultats)"""
+        with self._lock:
+            rows = np.flatnonzero(self._mask(criteria))
+            total = len(rows)
+            ids = self._ids[rows]
+            # lexsort trie selon la dernière clé en priorité ; l'id décroissant départage
+            if sort_by == 'price_asc':
+                keys = (-ids, self._price[rows])
+            elif sort_by == 'price_desc':
+                keys = (-ids, -self._price[rows])
+            elif sort_by == 'area_desc':
+                keys = (-ids, np.nan_to_num(-self._area[rows], nan=np.inf))
+            else:
+                keys = (-ids, np.nan_to_num(-self._created_at[rows], nan=np.inf))
+            start = (max(page, 1) - 1) * per_page
+            order = np.lexsort(keys)[start:start + per_page]
+            return ids[order].tolist(), total
+
+
+def _snapshot(prop):
+    return {name: getattr(prop, name) for name in INDEX_COLUMNS}
+
+
+def _changes_index(obj):
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in INDEX_COLUMNS)
+
+
+def _current_index():
+    return current_app.extensions.get('search_index') if has_app_context() else None
+
+
+def _after_flush(session, flush_context):
+    pending = session.info.setdefault('search_index_pending', {})
+    changed = False
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Property) and obj.id is not None:
+            pending[obj.id] = _snapshot(obj)
+            changed = changed or obj in session.new or _changes_index(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Property) and obj.id is not None:
+            pending[obj.id] = None
+            changed = True
+    # Le compteur de vues ne touche pas l'index : pas d'invalidation des autres workers
+    index = _current_index()
+    if changed and index is not None:
+        index.generation.bump(session)
+
+
+def _after_commit(session):
+    pending = session.info.pop('search_index_pending', None)
+    index = _current_index()
+    if index is None:
+        return
+    if pending and index.ready:
+        for property_id, row in pending.items():
+            if row is None:
+                index.remove(property_id)
+            else:
+                index.upsert(row)
+    index.generation.after_commit(session)
+
+
+def _after_rollback(session):
+    session.info.pop('search_index_pending', None)
+    index = _current_index()
+    if index is not None:
+        index.generation.after_rollback(session)
+
+
+_listeners_installed = False
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(db.session, 'after_flush', _after_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_rollback', _after_rollback)
+    _listeners_installed = True
+
+
+def init_app(app):
+    """Active l'index de recherche si SEARCH_INDEX_ENABLED est vrai"""
+    if not app.config.get('SEARCH_INDEX_ENABLED'):
+        return None
+    if np is None:
+        app.logger.warning("NumPy n'est pas installé : l'index de recherche est désactivé")
+        return None
+
+    index = PropertySearchIndex()
+    app.extensions['search_index'] = index
+    _install_listeners()
+
+    # Construction au démarrage ; si les tables n'existent pas encore,
+    # l'index sera construit à la première recherche
+    with app.app_context():
+        try:
+            count = index.build()
+            app.logger.info(f"Index de recherche construit ({count} propriétés)")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Construction différée de l'index de recherche: {e}")
+    return index
+
+
+def get_search_index():
+    """Retourne l'index de l'application courante, reconstruit s'il est absent ou périmé"""
+    index = current_app.extensions.get('search_index')
+    if index is None:
+        return None
+    try:
+        if not index.ready or not index.generation.is_current():
+            index.build()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Impossible de construire l'index de recherche: {e}")
+        return None
+    return index
@@ -0,0 +1,159 @@
+"""
+E-KAY Platform - Instrumentation SQL par requête
+
+Compte les requêtes SQL émises pendant une requête HTTP (ou un bloc de code),
+leur durée cumulée et les formes de requêtes répétées. Une même forme
+exécutée plus de ``SQL_N_PLUS_ONE_THRESHOLD`` fois est signalée comme un
+probable N+1 (une requête par ligne au lieu d'un chargement groupé).
+
+Quand ``SQL_PROFILING`` est actif, chaque réponse porte un en-tête
+``X-SQL-Queries`` et une ligne de journal. Dans les tests, ``query_budget``
+fait échouer un bloc qui dépasse son nombre de requêtes autorisé.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+HEADER_NAME = 'X-SQL-Queries'
+
+# Collecteurs actifs dans le contexte courant (requête HTTP, blocs imbriqués)
+_collectors = ContextVar('sql_stats_collectors', default=())
+
+_WHITESPACE = re.compile(r'\s+')
+# Listes IN de longueur variable : "(?, ?, ?)" ou "(%(p_1)s, %(p_2)s)"
+_PARAM_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Levée lorsqu'un bloc émet plus de requêtes que son budget"""
+
+
+def statement_shape(statement):
+    """Forme normalisée d'une requête : sans littéraux ni longueur des listes IN"""
+    shape = _LITERALS.sub('?', statement)
+    shape = _PARAM_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryStats:
+    """Statistiques des requêtes SQL d'un bloc de code"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def repeated(self, threshold):
+        """Formes exécutées plus de `threshold` fois, les plus fréquentes d'abord"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def summary(self, threshold):
+        """Résumé court utilisé pour l'en-tête de débogage et le journal"""
+        return f'count={self.count}; time={self.duration_ms:.1f}ms; n+1={len(self.repeated(threshold))}'
+
+
+@contextmanager
+def collect_queries():
+    """Collecte les requêtes SQL émises dans le bloc"""
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries):
+    """Fait échouer le bloc s'il émet plus de `max_queries` requêtes (pour les tests)"""
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        details = '\n'.join(f'  {count} x {shape}' for shape, count in stats.shapes.most_common(5))
+        raise QueryBudgetExceeded(
+            f'{stats.count} requêtes SQL pour un budget de {max_queries}:\n{details}'
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault('sql_stats_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    starts = conn.info.get('sql_stats_start')
+    if not collectors or not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    for stats in collectors:
+        stats.record(statement, duration)
+
+
+_listeners_installed = False
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _listeners_installed = True
+
+
+def init_app(app):
+    """Installe les compteurs SQL ; l'instrumentation HTTP suit SQL_PROFILING"""
+    _install_listeners()
+    if not app.config.get('SQL_PROFILING'):
+        return
+
+    threshold = app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 5)
+    budget = app.config.get('SQL_QUERY_BUDGET')
+
+    @app.before_request
+    def _start_sql_stats():
+        g._sql_stats_context = collect_queries()
+        g.sql_stats = g._sql_stats_context.__enter__()
+
+    @app.after_request
+    def _report_sql_stats(response):
+        stats = g.get('sql_stats')
+        if stats is None:
+            return response
+
+        summary = stats.summary(threshold)
+        response.headers[HEADER_NAME] = summary
+        app.logger.info('SQL %s %s %s', request.method, request.path, summary)
+        for shape, count in stats.repeated(threshold):
+            app.logger.warning('N+1 probable sur %s (%d x): %s', request.endpoint, count, shape)
+
+        if budget is not None and stats.count > budget:
+            message = f'{request.endpoint}: {stats.count} requêtes SQL pour un budget de {budget}'
+            if app.testing:
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
+
+    @app.teardown_request
+    def _stop_sql_stats(exc):
+        context = g.pop('_sql_stats_context', None)
+        if context is not None:
+            context.__exit__(None, None, None)
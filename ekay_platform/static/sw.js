@@ -1,56 +1,10 @@
-const CACHE_NAME = 'ekam-cache-v5';  // Updated cache version
+// Version du cache et ressources à précharger : servies par /sw.js (ekay_platform/assets.py),
+// calculées à partir du manifeste des ressources à empreinte. Valeurs minimales si ce fichier
+// est servi tel quel (empreintes désactivées).
+const ASSETS = self.EKAY_ASSETS || { version: 'dev', precache: ['/', '/static/offline.html'] };
+const CACHE_NAME = 'ekam-cache-' + ASSETS.version;
 const OFFLINE_URL = '/static/offline.html';
-const CACHEABLE_PATHS = [
-  '/',
-  '/static/css/style.css',
-  '/static/js/main.js',
-  '/static/manifest.json',
-  '/static/browserconfig.xml',
-  // Icons
-  '/static/icons/favicon-16.png',
-  '/static/icons/favicon-32.png',
-  '/static/icons/apple-touch-icon.png',
-  '/static/icons/icon-192.png',
-  '/static/icons/icon-512.png',
-  '/static/icons/icon-512-maskable.png',
-  // Core pages
-  '/login',
-  '/register',
-  '/properties',
-  '/a-propos',
-  '/licence',
-  // Fallback images
-  '/static/images/no-image.jpg',
-  // API endpoints
-  '/api/properties'
-];
-
-// Assets to precache
-const PRECACHE_ASSETS = [
-  '/',
-  '/static/css/style.css',
-  '/static/js/main.js',
-  '/static/manifest.json',
-  '/static/browserconfig.xml',
-  OFFLINE_URL,
-  // Icons
-  '/static/icons/favicon-16.png',
-  '/static/icons/favicon-32.png',
-  '/static/icons/apple-touch-icon.png',
-  '/static/icons/icon-192.png',
-  '/static/icons/icon-512.png',
-  '/static/icons/icon-512-maskable.png',
-  // Core pages
-  '/login',
-  '/register',
-  '/properties',
-  '/a-propos',
-  '/licence',
-  // API endpoints
-  '/api/properties',
-  // Fallback images
-  '/static/images/no-image.jpg'
-];
+const PRECACHE_ASSETS = ASSETS.precache;
 
 self.addEventListener('install', (event) => {
   console.log('[Service Worker] Install');
@@ -58,7 +12,7 @@ self.addEventListener('install', (event) => {
     caches.open(CACHE_NAME)
       .then((cache) => {
         console.log('[Service Worker] Caching app shell and content');
-        return cache.addAll(CACHEABLE_PATHS);
+        return cache.addAll(PRECACHE_ASSETS);
       })
       .then(() => self.skipWaiting())
   );
@@ -54,6 +54,22 @@ def app():
     os.close(db_fd)
     os.unlink(db_path)
 
+@pytest.fixture
+def make_app(tmp_path):
+    """Fabrique d'applications de test : configuration de test surchargée par mots-clés
+
+    La base est un fichier SQLite du répertoire temporaire du test, sauf
+    SQLALCHEMY_DATABASE_URI explicite ; les tables ne sont pas créées.
+    """
+    def factory(**overrides):
+        overrides.setdefault('SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'app.db'}")
+        app_config['_make_app'] = type('OverriddenConfig', (app_config['testing'],), overrides)
+        try:
+            return create_app('_make_app')
+        finally:
+            del app_config['_make_app']
+    return factory
+
 @pytest.fixture
 def client(app):
     """Un client de test pour l'application."""
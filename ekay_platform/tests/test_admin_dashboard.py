@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+
+from ekay_platform import admin_stats, db
+from ekay_platform.models import DashboardCounter, Property, User
+
+
+def make_property(owner, i, **kwargs):
+    values = dict(title=f'Bien numéro {i:02d}', description='Description du bien', property_type='house',
+                  price=1000 + i, address=f'{i} rue Capois', city='Jacmel', rooms=3,
+                  status='published', user_id=owner.id)
+    values.update(kwargs)
+    return Property(**values)
+
+
+def counters():
+    return {(row.dimension, row.key): row.value for row in DashboardCounter.query}
+
+
+@pytest.fixture
+def admin_client(app):
+    with app.app_context():
+        owner = User.query.filter_by(username='testuser').first()
+        owner.is_admin = True
+        for i in range(30):
+            db.session.add(make_property(owner, i, city='Jacmel' if i % 3 else 'Cap-Haïtien',
+                                         status='published' if i % 2 else 'pending'))
+        db.session.commit()
+    app.config['ADMIN_PROPERTIES_PER_PAGE'] = 10
+    client = app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    return client
+
+
+def test_counters_follow_session_changes(app):
+    with app.app_context():
+        admin_stats.rebuild()
+        owner = User.query.first()
+        prop = make_property(owner, 1)
+        db.session.add(prop)
+        db.session.commit()
+        assert counters()['property_status', 'published'] == 1
+
+        db.session.expire_all()  # l'ancienne valeur doit être rechargée avant modification
+        prop.status = 'archived'
+        prop.city = 'Jacmel'  # inchangée : pas de delta
+        db.session.commit()
+        values = counters()
+        assert values['property_status', 'published'] == 0
+        assert values['property_status', 'archived'] == 1
+        assert values['property_city', 'Jacmel'] == 1
+
+        db.session.delete(prop)
+        db.session.add(User(username='nouveau', email='nouveau@example.com', password_hash='x'))
+        db.session.commit()
+        values = counters()
+        assert values['property_status', 'archived'] == 0
+        assert values['user_signups', date.today().isoformat()] == 2
+
+        incremental = {key: value for key, value in counters().items() if value and key != admin_stats.META}
+        admin_stats.rebuild()
+        rebuilt = {key: value for key, value in counters().items() if key != admin_stats.META}
+        assert incremental == rebuilt
+
+
+def test_dashboard_paginates_sorts_and_filters(admin_client):
+    response = admin_client.get('/admin/admin?sort=price&dir=asc')
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'Bien numéro 00' in html and 'Bien numéro 10' not in html
+    assert '30 biens' in html
+
+    html = admin_client.get('/admin/admin?sort=price&dir=asc&page=3').get_data(as_text=True)
+    assert 'Bien numéro 29' in html and 'Bien numéro 00' not in html
+
+    html = admin_client.get('/admin/admin?status=pending&city=Jacmel').get_data(as_text=True)
+    assert '10 biens' in html
+    html = admin_client.get('/admin/admin?status=published').get_data(as_text=True)
+    assert '15 biens' in html
+    html = admin_client.get('/admin/admin?q=numéro 1').get_data(as_text=True)
+    assert '10 biens' in html  # 10 à 19
+
+
+def test_refresh_stats_command(app, runner):
+    with app.app_context():
+        db.session.add(make_property(User.query.first(), 1))
+        db.session.commit()
+        DashboardCounter.query.delete()
+        db.session.commit()
+    result = runner.invoke(args=['admin', 'refresh-stats'])
+    assert 'compteurs recalculés' in result.output
+    with app.app_context():
+        assert counters()['property_type', 'house'] == 1
@@ -0,0 +1,57 @@
+import json
+import re
+
+import pytest
+from flask import url_for
+
+from ekay_platform import assets
+
+
+@pytest.fixture
+def static_app(make_app, tmp_path):
+    return make_app(ASSETS_FINGERPRINT=True, ASSETS_DIRS=['css', 'js'],
+                    ASSETS_MANIFEST=str(tmp_path / 'assets-manifest.json'))
+
+
+def test_url_for_points_to_immutable_fingerprinted_file(static_app):
+    with static_app.test_request_context():
+        url = url_for('static', filename='css/style.css')
+        plain = url_for('static', filename='offline.html')
+    assert re.fullmatch(r'/static/css/style\.[0-9a-f]{12}\.css', url)
+    assert plain == '/static/offline.html'
+
+    client = static_app.test_client()
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control'] and 'max-age=31536000' in response.headers['Cache-Control']
+    with open(f'{static_app.static_folder}/css/style.css', 'rb') as stream:
+        assert response.data == stream.read()
+    response.close()
+
+    response = client.get('/static/css/style.css')
+    assert response.status_code == 200 and 'immutable' not in response.headers.get('Cache-Control', '')
+    response.close()
+
+
+def test_build_command_and_service_worker_share_the_manifest(static_app, tmp_path):
+    result = static_app.test_cli_runner().invoke(args=['assets', 'build'])
+    assert 'ressources, version' in result.output
+    saved = json.loads((tmp_path / 'assets-manifest.json').read_text())
+    assert saved['files']['js/main.js'].startswith('js/main.')
+
+    response = static_app.test_client().get('/sw.js')
+    header = response.get_data(as_text=True).split('\n', 1)[0]
+    config = json.loads(header[len('self.EKAY_ASSETS = '):-1])
+    assert config['version'] == saved['version']
+    assert '/static/' + saved['files']['css/style.css'] in config['precache']
+    assert '/static/offline.html' in config['precache']
+
+
+def test_version_changes_with_content(tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'a.css').write_text('body{}')
+    first = assets.AssetManifest.build(str(tmp_path), ['css'])
+    assert assets.AssetManifest.build(str(tmp_path), ['css']).version == first.version
+    (tmp_path / 'css' / 'a.css').write_text('body{color:red}')
+    second = assets.AssetManifest.build(str(tmp_path), ['css'])
+    assert second.version != first.version and second.files['css/a.css'] != first.files['css/a.css']
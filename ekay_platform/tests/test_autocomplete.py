@@ -0,0 +1,68 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from ekay_platform import db, generations
+from ekay_platform.models import Property, User
+from ekay_platform.autocomplete import GENERATION, PrefixIndex, normalize
+
+
+def test_normalize_strips_accents_and_punctuation():
+    assert normalize('Pétion-Ville') == 'petion ville'
+    assert normalize("  Cap-Haïtien ") == 'cap haitien'
+    assert normalize(None) == ''
+
+
+def test_prefix_index_ranks_by_popularity():
+    index = PrefixIndex()
+    index.add('Port-de-Paix', 1)
+    index.add('Port-au-Prince', 5)
+    index.add('Pétion-Ville', 3)
+    assert index.lookup('port') == ['Port-au-Prince', 'Port-de-Paix']
+    assert index.lookup('p', limit=2) == ['Port-au-Prince', 'Pétion-Ville']
+    assert index.lookup('petion v') == ['Pétion-Ville']
+    assert index.lookup('ville') == ['Pétion-Ville']
+    index.discard('Port-au-Prince', 5)
+    assert index.lookup('port') == ['Port-de-Paix']
+
+
+def _add_property(user, address, city):
+    prop = Property(title='Maison', price=100, rooms=2, address=address, city=city, user_id=user.id)
+    db.session.add(prop)
+    return prop
+
+
+def test_api_follows_property_writes(app, client):
+    with app.app_context():
+        user = User.query.first()
+        _add_property(user, 'Juvenat, Rue 3', 'Pétion-Ville')
+        _add_property(user, 'Juvenat, Rue 7', 'Pétion-Ville')
+        _add_property(user, 'Bourdon, Rue 1', 'Pétion-Ville')
+        db.session.commit()
+
+    assert client.get('/properties/api/cities?q=peti').get_json() == ['Pétion-Ville']
+    assert client.get('/properties/api/neighborhoods?q=&city=Pétion-Ville').get_json() == ['Juvenat', 'Bourdon']
+
+    with app.app_context():
+        prop = Property.query.filter_by(neighborhood='Bourdon').first()
+        prop.address = 'Thomassin, Route de Kenscoff'
+        prop.city = 'Kenscoff'
+        db.session.commit()
+
+    assert client.get('/properties/api/neighborhoods?q=b&city=Pétion-Ville').get_json() == []
+    assert client.get('/properties/api/neighborhoods?q=thom').get_json() == ['Thomassin']
+    assert client.get('/properties/api/cities?q=k').get_json() == ['Kenscoff']
+
+
+def test_api_sees_writes_from_another_process(app, client):
+    with app.app_context():
+        _add_property(User.query.first(), 'Bois Verna, Rue 2', 'Port-au-Prince')
+        db.session.commit()
+    assert client.get('/properties/api/cities?q=port').get_json() == ['Port-au-Prince']
+
+    with app.app_context():
+        # Autre worker ou commande : session sans les événements de ce processus
+        with Session(db.engine) as other:
+            other.execute(delete(Property).where(Property.city == 'Port-au-Prince'))
+            generations.invalidate(other.connection(), GENERATION)
+            other.commit()
+    assert client.get('/properties/api/cities?q=port').get_json() == []
@@ -0,0 +1,57 @@
+import io
+import json
+
+from ekay_platform import db, generations
+from ekay_platform.models import Property, User
+from ekay_platform.properties.bulk_import import import_properties, iter_json
+
+HEADER = 'title,description,property_type,transaction_type,price,rooms,bathrooms,area,address,city,country,available_from,has_pool\n'
+VALID = 'Maison à Jacmel,Grande maison proche de la plage,house,rent,50000,8,2,120,"Cyvadier, 12 rue",Jacmel,Haiti,2030-01-01,oui\n'
+INVALID = 'x,court,castle,rent,-5,2,1,0,,Jacmel,Haiti,,\n'
+
+
+def test_csv_import_validates_rows_and_inserts_in_batches(app):
+    with app.app_context():
+        owner = User.query.filter_by(username='testuser').first()
+        data = (HEADER + VALID * 3 + INVALID).encode('utf-8-sig')
+        report = import_properties(io.BytesIO(data), 'csv', owner.id, batch_size=2)
+
+        assert (report.total, report.imported, report.failed) == (4, 3, 1)
+        fields = {field for line, field, _ in report.errors}
+        assert {line for line, _, _ in report.errors} == {5}
+        assert {'title', 'property_type', 'price', 'address', 'available_from'} <= fields
+
+        prop = Property.query.first()
+        assert prop.rooms == 8  # « 5 pièces ou plus » : le nombre réel est conservé
+        assert prop.has_pool and not prop.has_garden
+        assert prop.is_available  # colonne absente : défaut du modèle
+        assert prop.neighborhood == 'Cyvadier'
+        assert prop.effective_annual_price == 600000
+        assert prop.status == 'pending' and prop.user_id == owner.id
+        # Un lot = une invalidation des caches en mémoire de tous les workers
+        assert generations.current('search_index') == generations.current('autocomplete') == 2
+
+
+def test_json_lines_and_array_are_streamed():
+    objects = [{'title': f'Annonce {i}', 'description': 'x' * i} for i in range(50)]
+    lines = '\n'.join(json.dumps(obj) for obj in objects)
+    array = json.dumps(objects)
+    for text in (lines, array):
+        parsed = [obj for _, obj in iter_json(io.StringIO(text), chunk_size=16)]
+        assert parsed == objects
+
+
+def test_import_command(app, client, runner, tmp_path):
+    source = tmp_path / 'annonces.csv'
+    source.write_text(HEADER + VALID + INVALID, encoding='utf-8')
+    errors = tmp_path / 'erreurs.csv'
+
+    result = runner.invoke(args=['properties', 'import', str(source), '--owner', 'testuser',
+                                 '--status', 'published', '--errors', str(errors)])
+    assert result.exit_code == 0, result.output
+    assert '1 importées, 1 rejetées sur 2 lignes' in result.output
+    assert errors.read_text(encoding='utf-8').count('\n') > 2
+    with app.app_context():
+        assert db.session.query(Property.status).scalar() == 'published'
+    # Sans colonne is_available, l'annonce publiée apparaît dans la liste
+    assert 'Maison à Jacmel' in client.get('/properties/').get_data(as_text=True)
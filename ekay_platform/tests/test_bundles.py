@@ -0,0 +1,81 @@
+import json
+import shutil
+
+from ekay_platform import bundles
+
+
+def decode_mappings(mappings):
+    """(ligne produite, colonne, source, ligne d'origine) de chaque segment"""
+    values = {char: index for index, char in enumerate(bundles.VLQ_CHARS)}
+    decoded, source, line = [], 0, 0
+    for generated, group in enumerate(mappings.split(';')):
+        column = 0
+        for segment in filter(None, group.split(',')):
+            fields, value, shift = [], 0, 0
+            for char in segment:
+                digit = values[char]
+                value += (digit & 31) << shift
+                shift += 5
+                if not digit & 32:
+                    fields.append(-(value >> 1) if value & 1 else value >> 1)
+                    value = shift = 0
+            column += fields[0]
+            source += fields[1]
+            line += fields[2]
+            decoded.append((generated, column, source, line))
+    return decoded
+
+
+def test_minify_keeps_strings_regexes_and_template_literals():
+    css = '/* thème */\n.card  >  a:hover ,\n.badge {\n    content: "a  ;  b";\n    margin : 0 auto;\n}\n'
+    assert [line for line, _ in bundles.minify(css, 'css')] == ['.card>a:hover,', '.badge{', 'content:"a  ;  b";',
+                                                                'margin :0 auto;', '}']
+    js = ("// commentaire\nconst url = 'https://ekay.ht/a'; /* bloc */\n"
+          "const re = /\\/\\/+[/]/g;\nconst html = `\n    <p>${url}</p>\n`;\n")
+    lines = bundles.minify(js, 'js')
+    assert [line for line, _ in lines] == ["const url = 'https://ekay.ht/a';", 'const re = /\\/\\/+[/]/g;',
+                                           'const html = `', '    <p>${url}</p>', '`;']
+    assert [number for _, number in lines] == [1, 2, 3, 4, 5]
+
+
+def test_build_bundle_writes_minified_output_and_source_map(tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'a.css').write_text('/* a */\nbody {\n  color: red;\n}\n')
+    (tmp_path / 'css' / 'b.css').write_text('\n\n.card {\n  margin: 0;\n}\n')
+    raw, size = bundles.build_bundle(str(tmp_path), 'page', 'css', ['css/a.css', 'css/b.css'])
+    content = (tmp_path / 'dist' / 'page.css').read_text()
+    assert content == 'body{color:red}\n.card{margin:0}\n/*# sourceMappingURL=page.css.map */\n'
+    assert (raw, size) == (56, len(content))
+
+    source_map = json.loads((tmp_path / 'dist' / 'page.css.map').read_text())
+    assert source_map['sources'] == ['../css/a.css', '../css/b.css']
+    # « .card{ » (ligne 1 de la sortie, colonne 0) vient de b.css ligne 3 (2 à partir de 0)
+    assert (1, 0, 1, 2) in decode_mappings(source_map['mappings'])
+    assert (0, len('body{'), 0, 2) in decode_mappings(source_map['mappings'])
+
+
+def test_pages_include_one_bundle_per_type(app, tmp_path):
+    static = shutil.copytree(app.static_folder, tmp_path / 'static', ignore=shutil.ignore_patterns('uploads', 'dist'))
+    app.static_folder = str(static)
+    client = app.test_client()
+
+    html = client.get('/').get_data(as_text=True)
+    assert '/static/css/home.css' in html and '/static/js/home.js' in html
+    assert html.index('/static/css/home.css') < html.index('/static/css/style.css')
+
+    app.config['ASSETS_BUNDLES'] = True
+    built = bundles.build_all(app.static_folder)
+    assert set(built) == {'dist/site.css', 'dist/site.js', 'dist/home.css', 'dist/home.js', 'dist/style.css'}
+    html = client.get('/').get_data(as_text=True)
+    assert html.count('rel="stylesheet" href="/static/') == 2 and '/static/dist/home.css' in html
+    assert '/static/dist/home.js' in html and '/static/js/main.js' not in html
+    html = client.get('/properties/').get_data(as_text=True)
+    assert '/static/dist/site.css' in html and '/static/dist/site.js' in html
+    assert client.get('/static/dist/home.css').status_code == 200
+
+
+def test_style_loads_after_page_stylesheets(app):
+    html = app.test_client().get('/auth/login').get_data(as_text=True)
+    # Bloc extra_css de la page entre le paquet du site et style.css
+    assert html.index('/static/css/ekay-theme.css') < html.index('.auth-container {')
+    assert html.index('.auth-container {') < html.index('/static/css/style.css')
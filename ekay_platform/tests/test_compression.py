@@ -0,0 +1,71 @@
+import gzip
+import os
+
+import pytest
+from flask import Response
+
+from ekay_platform import compression
+
+
+@pytest.fixture
+def compressed_app(make_app, tmp_path):
+    app = make_app(COMPRESS_RESPONSES=True, COMPRESS_MIN_SIZE=1024, COMPRESS_MIMETYPES=['text/html', 'text/csv'],
+                   STATIC_PRECOMPRESSED=True, ASSETS_FINGERPRINT=False)
+    app.static_folder = str(tmp_path)
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'site.css').write_text('.card { margin: 0 auto; }\n' * 400)
+
+    @app.route('/_page')
+    def page():
+        return '<p>Annonce</p>' * 500
+
+    @app.route('/_small')
+    def small():
+        return '<p>court</p>'
+
+    @app.route('/_stream')
+    def stream():
+        return Response((f'{i},Jacmel\n' * 50 for i in range(20)), mimetype='text/csv')
+
+    return app
+
+
+def test_dynamic_html_is_compressed_when_accepted(compressed_app):
+    client = compressed_app.test_client()
+    response = client.get('/_page', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data).decode() == '<p>Annonce</p>' * 500
+
+    assert 'Content-Encoding' not in client.get('/_page', headers={'Accept-Encoding': 'identity'}).headers
+    assert 'Content-Encoding' not in client.get('/_small', headers={'Accept-Encoding': 'gzip'}).headers
+
+
+def test_streamed_response_is_compressed_per_chunk(compressed_app):
+    response = compressed_app.test_client().get('/_stream', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data).decode() == ''.join(f'{i},Jacmel\n' * 50 for i in range(20))
+
+
+def test_static_files_are_served_precompressed(compressed_app, tmp_path):
+    count, raw, totals = compression.precompress(str(tmp_path), ['css/site.css'])
+    assert count == 1 and totals['gzip'] < raw
+    original = (tmp_path / 'css' / 'site.css').read_bytes()
+
+    client = compressed_app.test_client()
+    response = client.get('/static/css/site.css', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    assert gzip.decompress(response.data) == original
+    response.close()
+
+    response = client.get('/static/css/site.css')
+    assert 'Content-Encoding' not in response.headers and response.data == original
+    response.close()
+
+    # Variante plus ancienne que la source : ignorée
+    stale = os.path.getmtime(tmp_path / 'css' / 'site.css') - 60
+    os.utime(tmp_path / 'css' / 'site.css.gz', (stale, stale))
+    response = client.get('/static/css/site.css', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    response.close()
@@ -0,0 +1,24 @@
+from ekay_platform import db
+from ekay_platform.models import Booking, Property, PropertyImage, User
+from ekay_platform.benchmarks.datagen import generate
+
+
+def test_generate_is_consistent_and_reproducible(app):
+    with app.app_context():
+        counts = generate(users=6, properties=40, images=2, bookings=30, seed=7)
+        assert User.query.count() == 1 + 6
+        assert Property.query.count() == 40
+        assert PropertyImage.query.count() == counts['images']
+        assert Booking.query.count() == 30
+
+        for prop in Property.query:
+            # Colonnes dérivées identiques à celles des validateurs du modèle
+            assert prop.neighborhood == Property.extract_neighborhood(prop.address)
+            assert prop.effective_annual_price == Property.compute_effective_annual_price(
+                prop.price, prop.annual_price)
+        first = [(p.city, p.price) for p in Property.query.order_by(Property.id)]
+
+        db.drop_all()
+        db.create_all()
+        generate(users=6, properties=40, images=2, bookings=30, seed=7)
+        assert [(p.city, p.price) for p in Property.query.order_by(Property.id)] == first
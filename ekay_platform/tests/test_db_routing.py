@@ -0,0 +1,63 @@
+import pytest
+from flask import jsonify, request
+
+from ekay_platform import db, db_routing
+from ekay_platform.models import Property, User
+
+
+@pytest.fixture
+def replicated_app(make_app, tmp_path):
+    """Primaire et réplica : deux fichiers SQLite dont les données diffèrent"""
+    app = make_app(SQLALCHEMY_REPLICA_URIS=[f"sqlite:///{tmp_path / 'replica.db'}"])
+
+    @app.route('/_title/<int:property_id>', methods=['GET', 'POST'])
+    def title(property_id):
+        if request.method == 'POST':
+            db.session.get(Property, property_id).title = 'modifié'
+            db.session.commit()
+        return jsonify(title=db.session.get(Property, property_id).title)
+
+    with app.app_context():
+        replica = app.extensions['db_replicas'].engines[0]
+        db.create_all()
+        db.metadata.create_all(replica)
+        for engine, label in ((db.engine, 'primaire'), (replica, 'réplica')):
+            with engine.begin() as connection:
+                connection.execute(User.__table__.insert(), {'id': 1, 'username': 'u', 'email': 'u@example.com', 'password_hash': 'x'})
+                connection.execute(Property.__table__.insert(), {
+                    'id': 1, 'title': label, 'description': '', 'property_type': 'house',
+                    'price': 1000, 'rooms': 2, 'address': 'a', 'city': 'Jacmel', 'user_id': 1,
+                })
+    return app
+
+
+def test_get_reads_from_replica(replicated_app):
+    client = replicated_app.test_client()
+    assert client.get('/_title/1').json['title'] == 'réplica'
+
+
+def test_write_goes_to_primary_and_reads_after_write(replicated_app):
+    client = replicated_app.test_client()
+    # La lecture suivant le flush reste sur le primaire
+    assert client.post('/_title/1').json['title'] == 'modifié'
+    with replicated_app.app_context():
+        assert db.session.get(Property, 1).title == 'modifié'
+
+
+def test_visitor_sticks_to_primary_after_write(replicated_app):
+    client = replicated_app.test_client()
+    client.post('/_title/1')
+    assert client.get('/_title/1').json['title'] == 'modifié'
+    # Un autre visiteur lit toujours le réplica
+    assert replicated_app.test_client().get('/_title/1').json['title'] == 'réplica'
+
+
+def test_lagging_replica_falls_back_to_primary(replicated_app, monkeypatch):
+    monkeypatch.setattr(db_routing, 'replica_lag', lambda engine: 60.0)
+    replicated_app.extensions['db_replicas']._checked.clear()
+    assert replicated_app.test_client().get('/_title/1').json['title'] == 'primaire'
+
+
+def test_outside_requests_use_primary(replicated_app):
+    with replicated_app.app_context():
+        assert db.session.get(Property, 1).title == 'primaire'
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+
+from config import Config
+from ekay_platform import db
+from ekay_platform.db_tuning import engine_options
+
+
+def test_engine_options_postgres_pool():
+    options = engine_options({
+        'SQLALCHEMY_DATABASE_URI': 'postgresql://localhost/ekay',
+        'DB_POOL_SIZE': 8, 'DB_MAX_OVERFLOW': 4, 'DB_POOL_TIMEOUT': 10,
+        'DB_POOL_PRE_PING': True, 'DB_STATEMENT_CACHE_SIZE': 1000,
+        'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 2},
+    })
+    assert options == {
+        'pool_size': 2, 'max_overflow': 4, 'pool_timeout': 10,
+        'pool_pre_ping': True, 'query_cache_size': 1000,
+    }
+
+
+def test_engine_options_sqlite_has_no_pool():
+    options = engine_options({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///ekay.db', 'DB_POOL_SIZE': 8, 'DB_STATEMENT_CACHE_SIZE': 500,
+    })
+    assert options == {'query_cache_size': 500, 'connect_args': {'cached_statements': 500}}
+
+
+def test_sqlite_pragmas_applied_on_connect(make_app):
+    app = make_app(SQLITE_PRAGMAS=Config.SQLITE_PRAGMAS, DB_STATEMENT_CACHE_SIZE=100)
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert connection.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            assert connection.execute(text('PRAGMA cache_size')).scalar() == -64000
+        db.engine.dispose()
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from ekay_platform import db
+from ekay_platform.admin.exports import export_columns
+from ekay_platform.models import User
+
+
+@pytest.fixture
+def admin_client(app):
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        user.is_admin = True
+        for i in range(25):
+            db.session.add(User(username=f'export{i}', email=f'export{i}@example.com', password_hash='x'))
+        db.session.commit()
+    app.config['EXPORT_CHUNK_SIZE'] = 10
+    client = app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    return client
+
+
+def test_csv_export_streams_in_chunks(admin_client):
+    response = admin_client.get('/admin/export/users.csv')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.headers['Content-Disposition'].startswith('attachment; filename="users-')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 26
+    assert 'password_hash' not in rows[0]
+    assert rows[1]['username'] == 'export0'
+
+
+def test_ndjson_export(admin_client):
+    response = admin_client.get('/admin/export/users.ndjson')
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 26
+    assert json.loads(lines[-1])['email'] == 'export24@example.com'
+
+
+def test_parquet_export(admin_client):
+    pq = pytest.importorskip('pyarrow.parquet')
+    response = admin_client.get('/admin/export/users.parquet')
+    table = pq.read_table(io.BytesIO(response.get_data()))
+    assert table.num_rows == 26
+    assert table.num_columns == len(export_columns(User))
+
+
+def test_export_requires_admin(client, auth):
+    auth.login()
+    assert client.get('/admin/export/bookings.csv').status_code == 302
@@ -0,0 +1,54 @@
+from ekay_platform import db
+from ekay_platform.models import Property, User
+
+
+def make_property(owner, i):
+    prop = Property(title=f'Maison numéro {i}', description='Description du bien', property_type='house',
+                    price=1000, address='12 rue Capois', city='Jacmel', rooms=3, user_id=owner.id)
+    db.session.add(prop)
+    return prop
+
+
+def test_toggle_maintains_counts_and_bulk_lookup(app):
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        props = [make_property(user, i) for i in range(3)]
+        db.session.commit()
+        ids = [prop.id for prop in props]
+
+        assert user.toggle_favorite(ids[0]) is True
+        assert user.add_favorite(ids[1]) is True
+        assert user.add_favorite(ids[1]) is False  # déjà en favori : compteurs inchangés
+        db.session.commit()
+        assert user.favorite_count == 2
+        assert db.session.get(Property, ids[1]).favorite_count == 1
+        assert user.favorite_ids(ids) == {ids[0], ids[1]}
+        assert user.has_favorite(ids[0]) and not user.has_favorite(ids[2])
+
+        assert user.toggle_favorite(ids[0]) is False
+        db.session.commit()
+        assert user.favorite_count == 1
+        assert db.session.get(Property, ids[0]).favorite_count == 0
+
+        # Suppression d'une annonce favorite : le compteur de l'utilisateur suit
+        db.session.delete(db.session.get(Property, ids[1]))
+        db.session.commit()
+        assert user.favorite_count == 0
+        assert user.favorite_ids(ids) == set()
+
+
+def test_toggle_favorite_route(app, client):
+    with app.app_context():
+        prop = make_property(User.query.filter_by(username='testuser').first(), 1)
+        db.session.commit()
+        property_id = prop.id
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+
+    response = client.post(f'/properties/{property_id}/favorite')
+    assert response.get_json() == {'success': True, 'action': 'added', 'favorites_count': 1}
+    assert client.post(f'/favorite/{property_id}').get_json() == {'status': 'removed'}
+    assert client.post('/properties/999/favorite').status_code == 404
+
+    client.post(f'/properties/{property_id}/favorite')
+    html = client.get('/').get_data(as_text=True)
+    assert 'Retirer des favoris' in html
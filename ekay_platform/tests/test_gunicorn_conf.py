@@ -0,0 +1,56 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+pytest.importorskip('gunicorn')
+pytest.importorskip('prometheus_client')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_production_command_boots_with_default_metrics_dir(tmp_path):
+    """Commande de démarrage de production, préchargement et répertoire des métriques par défaut"""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        TMPDIR=str(tmp_path),  # répertoire par défaut : <tmp>/ekay-prometheus, encore inexistant
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKERS='2',
+        GUNICORN_ACCESS_LOG='',
+        DATABASE_URL=f'sqlite:///{tmp_path / "boot.db"}',
+        SECRET_KEY='boot',
+        ASSETS_BUNDLES='false',
+    )
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', "ekay_platform:create_app('production')"],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    try:
+        for _ in range(150):
+            assert process.poll() is None, process.stdout.read().decode(errors='replace')
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/auth/login', timeout=1).close()
+                break
+            except urllib.error.HTTPError:
+                break  # le serveur répond : démarrage réussi
+            except OSError:
+                time.sleep(0.2)
+        else:
+            pytest.fail('gunicorn ne répond pas')
+        assert (tmp_path / 'ekay-prometheus').is_dir()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
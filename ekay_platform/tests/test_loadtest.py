@@ -0,0 +1,24 @@
+import argparse
+
+import pytest
+
+pytest.importorskip('requests')
+
+from ekay_platform.benchmarks.loadtest import parse_mix, summarize
+
+
+def test_summarize_reports_scenarios_and_steps():
+    records = [('detail', 'view', 0.010, True), ('detail', 'view', 0.030, False),
+               ('detail', None, 0.040, True), ('book', 'form', 0.020, True)]
+    summary = summarize(records, elapsed=2.0)
+    assert summary['requests'] == 3
+    assert summary['rps'] == 1.5
+    assert list(summary['results']) == ['book.form', 'detail', 'detail.view']
+    view = summary['results']['detail.view']
+    assert (view['count'], view['errors'], view['p50']) == (2, 1, 30.0)
+
+
+def test_parse_mix_rejects_unknown_scenarios():
+    assert parse_mix('browse=3,detail') == {'browse': 3.0, 'detail': 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix('checkout=1')
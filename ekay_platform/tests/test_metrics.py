@@ -0,0 +1,38 @@
+import pytest
+
+from ekay_platform import metrics
+
+pytest.importorskip('prometheus_client')
+
+
+@pytest.fixture
+def metrics_client(app):
+    app.config['METRICS_ENABLED'] = True
+    metrics.init_app(app)
+    return app.test_client()
+
+
+def test_metrics_endpoint_reports_requests(metrics_client):
+    metrics_client.get('/properties/')
+    metrics_client.get('/properties/api/cities?q=j')
+
+    response = metrics_client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'ekay_http_request_duration_seconds_bucket{blueprint="properties",endpoint="properties.list_properties"' in text
+    assert 'ekay_http_responses_total{blueprint="properties",endpoint="properties.api_cities",method="GET",status="200"}' in text
+    assert 'ekay_db_queries_per_request_count{blueprint="properties",endpoint="properties.list_properties"}' in text
+    assert 'ekay_email_queue_depth' in text
+
+
+def test_metrics_endpoint_requires_token(app):
+    app.config.update(METRICS_ENABLED=True, METRICS_TOKEN='s3cret')
+    metrics.init_app(app)
+    client = app.test_client()
+
+    response = client.get('/metrics')
+    assert response.status_code == 401
+    assert response.headers['WWW-Authenticate'].startswith('Bearer')
+    assert client.get('/metrics', headers={'Authorization': 'Bearer autre'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer s3cret'}).status_code == 200
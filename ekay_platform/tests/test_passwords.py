@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from ekay_platform import db
+from ekay_platform.models import User
+from ekay_platform.passwords import PasswordHasher
+
+FAST = 'pbkdf2:sha256:1000'
+
+
+def test_pool_bounds_concurrent_hashes(monkeypatch):
+    hasher = PasswordHasher(method=FAST, workers=2, executor='thread')
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_hash(password, method, salt_length):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return f'{method}$salt${password}'
+
+    monkeypatch.setattr('ekay_platform.passwords.generate_password_hash', slow_hash)
+    threads = [threading.Thread(target=hasher.hash, args=('secret',)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    hasher.shutdown()
+    assert max(peak) == 2
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process', 'sync'])
+def test_hash_and_verify(executor):
+    hasher = PasswordHasher(method=FAST, executor=executor)
+    pwhash = hasher.hash('secret')
+    assert pwhash.startswith(FAST + '$')
+    assert hasher.verify(pwhash, 'secret') and not hasher.verify(pwhash, 'autre')
+    assert not hasher.needs_rehash(pwhash)
+    assert PasswordHasher(method='pbkdf2:sha256:2000').needs_rehash(pwhash)
+    hasher.shutdown()
+
+
+def test_login_rehashes_outdated_hash(make_app):
+    app = make_app(PASSWORD_HASH_METHOD='pbkdf2:sha256:2000')
+    with app.app_context():
+        db.create_all()
+        old = PasswordHasher(method=FAST).hash('password')
+        db.session.add(User(username='ancien', email='ancien@example.com', password_hash=old))
+        db.session.commit()
+
+    client = app.test_client()
+    response = client.post('/auth/login', data={'username': 'ancien', 'password': 'password'})
+    assert response.status_code == 302
+    with app.app_context():
+        user = User.query.filter_by(username='ancien').first()
+        assert user.password_hash.startswith('pbkdf2:sha256:2000$')
+        assert user.check_password('password')
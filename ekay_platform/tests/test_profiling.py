@@ -0,0 +1,35 @@
+import os
+
+from ekay_platform import profiling
+
+
+def test_profiled_requests_are_written_and_rotated(app, tmp_path):
+    app.config.update(
+        PROFILING_ENABLED=True,
+        PROFILING_SAMPLE_RATE=0.0,
+        PROFILING_ENDPOINTS=['properties.list_properties'],
+        PROFILING_TOKEN='secret',
+        PROFILING_INTERVAL=0.001,
+        PROFILING_DIR=str(tmp_path),
+        PROFILING_MAX_FILES=2,
+    )
+    profiling.init_app(app)
+    client = app.test_client()
+
+    client.get('/properties/api/cities?q=j')
+    assert os.listdir(tmp_path) == []
+
+    client.get('/properties/api/cities?q=j', headers={profiling.PROFILE_HEADER: 'secret'})
+    for _ in range(3):
+        client.get('/properties/')
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) == 2
+    assert all('properties.list_properties' in name for name in files)
+
+    stacks, count = profiling.aggregate(str(tmp_path), endpoint='properties.list_properties')
+    assert count == 2
+    assert profiling.aggregate(str(tmp_path), endpoint='properties.api_cities') == ({}, 0)
+
+    output = tmp_path / 'merged.txt'
+    profiling.main([str(tmp_path), '-o', str(output)])
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in output.read_text().splitlines()) == sum(stacks.values())
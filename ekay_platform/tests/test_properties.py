@@ -72,3 +72,44 @@ def test_create_property_valid(client, auth):
         assert property.status == 'published'
 
 # Ajoutez d'autres tests ici...
+
+def test_effective_annual_price_follows_prices(app):
+    """Le prix annuel effectif est maintenu à chaque écriture des prix"""
+    with app.app_context():
+        property = Property(price=1000, rooms=1, title='Studio', address='1 Rue A', city='Jacmel')
+        assert property.effective_annual_price == 12000
+        property.annual_price = 11000
+        assert property.effective_annual_price == 11000
+        property.price = 2000
+        assert property.effective_annual_price == 11000
+        property.annual_price = None
+        assert property.effective_annual_price == 24000
+
+def test_property_cards_load_card_fields_only(app, client):
+    """Les pages de liste ne chargent que les champs des cartes et l'image principale"""
+    from sqlalchemy import inspect
+    from ekay_platform import db
+    from ekay_platform.models import PropertyImage, User, PropertyCard, card_query
+    with app.app_context():
+        user = User.query.first()
+        property = Property(title='Villa vue mer', description='Grande villa ' * 30, price=5000,
+                            rooms=4, address='Rue 1', city='Jacmel', user_id=user.id)
+        db.session.add(property)
+        db.session.flush()
+        db.session.add_all([
+            PropertyImage(filename='b.jpg', original_filename='b.jpg', position=1, property_id=property.id),
+            PropertyImage(filename='a.jpg', original_filename='a.jpg', position=2, is_primary=True,
+                          property_id=property.id),
+        ])
+        db.session.commit()
+        db.session.expunge_all()
+
+        loaded = card_query().all()
+        assert 'description' in inspect(loaded[0]).unloaded
+        card, = PropertyCard.from_properties(loaded)
+        assert card.image == 'a.jpg'
+        assert card.summary.endswith('...') and len(card.summary) <= 153
+
+    response = client.get('/properties/')
+    assert b'uploads/properties/1/a.jpg' in response.data
+    assert b'Grande villa' in response.data
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from ekay_platform import db, property_stats
+from ekay_platform.models import Booking, Property, PropertyDailyStats, PropertyView, User
+
+
+def make_property(owner, title='Maison à Jacmel'):
+    prop = Property(title=title, description='Description du bien', property_type='house', price=1000,
+                    address='12 rue Capois', city='Jacmel', rooms=3, user_id=owner.id)
+    db.session.add(prop)
+    db.session.commit()
+    return prop
+
+
+def test_rollup_aggregates_raw_events_per_day(app):
+    with app.app_context():
+        owner = User.query.filter_by(username='testuser').first()
+        visitor = User(username='visiteur', email='visiteur@example.com', password_hash='x')
+        db.session.add(visitor)
+        prop = make_property(owner)
+        other = make_property(owner, 'Villa à Jacmel')
+        yesterday = datetime.utcnow() - timedelta(days=1)
+
+        prop.increment_views()
+        prop.increment_views()
+        db.session.add(PropertyView(property_id=prop.id, viewed_at=yesterday))
+        db.session.add(PropertyView(property_id=other.id, viewed_at=yesterday - timedelta(days=200)))
+        db.session.flush()
+        visitor.add_favorite(prop.id)
+        today = datetime.utcnow().date()
+        db.session.add(Booking(property_id=prop.id, user_id=owner.id, start_date=today,
+                               end_date=today + timedelta(days=3)))
+        db.session.commit()
+
+        written, pruned = property_stats.run(app.config)
+        assert (written, pruned) == (2, 1)
+        rows = {(row.day, row.property_id): (row.views, row.favorites, row.booking_requests)
+                for row in PropertyDailyStats.query}
+        assert rows == {(today, prop.id): (2, 1, 1), (yesterday.date(), prop.id): (1, 0, 0)}
+
+        # Idempotent : un second passage réécrit les mêmes lignes
+        assert property_stats.run(app.config) == (2, 0)
+
+        stats = property_stats.owner_stats(owner.id, days=7)
+        assert stats['totals'] == {'views': 3, 'favorites': 1, 'booking_requests': 1}
+        assert stats['daily'][-1] == (today, {'views': 2, 'favorites': 1, 'booking_requests': 1})
+        assert len(stats['daily']) == 7
+        assert other.id not in stats['by_property']
+
+
+def test_landlord_dashboard_shows_rollups(app, client, runner):
+    with app.app_context():
+        owner = User.query.filter_by(username='testuser').first()
+        owner.is_landlord = True
+        prop = make_property(owner)
+        for _ in range(3):
+            prop.increment_views()
+    result = runner.invoke(args=['properties', 'rollup-stats'])
+    assert '1 lignes (annonce, jour) agrégées' in result.output
+
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    response = client.get('/dashboard')
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'Maison à Jacmel' in html
+    assert '<td class="text-end">3</td>' in html
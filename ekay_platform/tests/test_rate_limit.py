@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from ekay_platform import db
+from ekay_platform.models import User
+from ekay_platform.rate_limit import MemoryStorage, SQLiteStorage, parse_limit, refill
+
+
+@pytest.fixture
+def limited_app(make_app, tmp_path):
+    app = make_app(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_STORAGE=f"sqlite:///{tmp_path / 'buckets.db'}",
+        RATE_LIMIT_PROXY_COUNT=1,
+        RATE_LIMITS={'login': '3/minute', 'booking': '1/hour'},
+    )
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='testuser', email='test@example.com', password_hash='x'))
+        db.session.commit()
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+    app.statements = statements
+    return app
+
+
+def test_token_bucket_refills_over_time():
+    capacity, rate = parse_limit('6/minute')
+    assert (capacity, rate) == (6, 0.1)
+    assert refill(0, 100.0, 105.0, capacity, rate) == (0.5, 5.0)
+    assert refill(0, 100.0, 110.0, capacity, rate) == (0.0, 0.0)
+    assert refill(1, 0.0, 1000.0, capacity, rate)[0] == capacity - 1
+    with pytest.raises(ValueError):
+        parse_limit('10/fortnight')
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_storage_is_shared_across_threads(backend, tmp_path):
+    storage = MemoryStorage() if backend == 'memory' else SQLiteStorage(str(tmp_path / 'buckets.db'))
+    results = []
+
+    def hammer():
+        for _ in range(10):
+            results.append(storage.consume('login:ip:1.2.3.4', 20, 0.001))
+
+    threads = [threading.Thread(target=hammer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(1 for retry_after in results if retry_after == 0) == 20
+    assert storage.consume('login:ip:5.6.7.8', 20, 0.001) == 0
+
+
+def test_login_is_throttled_per_client_before_any_query(limited_app):
+    client = limited_app.test_client()
+    headers = {'X-Forwarded-For': '203.0.113.7'}
+    for _ in range(3):
+        response = client.post('/auth/login', data={'username': 'testuser', 'password': 'faux'}, headers=headers)
+        assert response.status_code == 302
+
+    del limited_app.statements[:]
+    response = client.post('/auth/login', data={'username': 'testuser', 'password': 'faux'}, headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+    assert 'Trop de tentatives' in response.get_data(as_text=True)
+    assert limited_app.statements == []
+
+    # Autre client, et affichage du formulaire : non limités
+    other = {'X-Forwarded-For': '198.51.100.1, 203.0.113.8'}
+    assert client.post('/auth/login', data={'username': 'x', 'password': 'y'}, headers=other).status_code == 302
+    assert client.get('/auth/login', headers=headers).status_code == 200
+
+
+def test_booking_is_throttled_per_user(limited_app):
+    client = limited_app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    assert client.post('/properties/property/999/book').status_code == 404
+    assert client.post('/properties/property/999/book').status_code == 429
+    # Même adresse, autre utilisateur (anonyme) : seau distinct
+    assert limited_app.test_client().post('/properties/property/999/book').status_code == 302
@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ekay_platform import db
+from ekay_platform.models import Property, User
+from ekay_platform import generations, search_index
+from ekay_platform.search_index import filter_query, order_query
+
+pytest.importorskip('numpy')
+
+
+def _add_property(user_id, **kwargs):
+    data = {
+        'title': 'Maison',
+        'description': 'Belle maison',
+        'price': 1000,
+        'rooms': 2,
+        'address': '1 Rue Capois',
+        'city': 'Jacmel',
+        'user_id': user_id,
+    }
+    data.update(kwargs)
+    prop = Property(**data)
+    db.session.add(prop)
+    return prop
+
+
+@pytest.fixture
+def index(app):
+    """Index activé pour l'application de test, avec quelques propriétés"""
+    with app.app_context():
+        user = User.query.first()
+        now = datetime.utcnow()
+        for i in range(30):
+            _add_property(
+                user.id,
+                title=f'Maison {i}',
+                price=500 + (i * 37) % 900,
+                rooms=1 + i % 5,
+                area=None if i % 7 == 0 else 20 + i,
+                city='Jacmel' if i % 2 else 'Pétion-Ville',
+                property_type='house' if i % 3 else 'apartment',
+                has_pool=i % 4 == 0,
+                is_furnished=i % 5 == 0,
+                is_available=i % 9 != 0,
+                created_at=now - timedelta(days=i),
+            )
+        db.session.commit()
+        app.config['SEARCH_INDEX_ENABLED'] = True
+        yield search_index.init_app(app)
+
+
+def _sql_ids(criteria, sort_by, page=1, per_page=5):
+    query = filter_query(Property.query.filter_by(is_available=True), criteria)
+    pagination = order_query(query, sort_by).paginate(page=page, per_page=per_page, error_out=False)
+    return [p.id for p in pagination.items], pagination.total
+
+
+@pytest.mark.parametrize('criteria', [
+    {},
+    {'property_type': 'house'},
+    {'city': 'Jacmel', 'min_rooms': 3},
+    {'min_price': 700, 'max_price': 1200},
+    {'amenities': ('has_pool',)},
+    {'amenities': ('has_pool', 'is_furnished')},
+    {'property_type': 'castle'},
+])
+@pytest.mark.parametrize('sort_by', ['newest', 'price_asc', 'price_desc', 'area_desc'])
+def test_index_matches_sql(app, index, criteria, sort_by):
+    with app.app_context():
+        for page in (1, 2):
+            assert index.search(criteria, sort_by, page, 5) == _sql_ids(criteria, sort_by, page)
+
+
+def test_index_follows_commits(app, index):
+    with app.app_context():
+        user = User.query.first()
+        prop = _add_property(user.id, title='Nouvelle villa', price=99999, property_type='villa')
+        db.session.commit()
+        assert index.search({'property_type': 'villa'})[0] == [prop.id]
+
+        prop.is_available = False
+        db.session.commit()
+        assert index.search({'property_type': 'villa'}) == ([], 0)
+
+        prop.is_available = True
+        db.session.commit()
+        db.session.delete(prop)
+        db.session.commit()
+        assert index.search({'property_type': 'villa'}) == ([], 0)
+        assert index.search({}, 'newest', 1, 100) == _sql_ids({}, 'newest', 1, 100)
+        # Modifications de ce processus déjà appliquées : pas de reconstruction
+        assert index.generation.is_current()
+
+
+def test_index_rebuilt_after_write_from_another_process(app, index):
+    with app.app_context():
+        prop = Property.query.filter_by(is_available=True).first()
+        # Autre worker ou commande : session sans les événements de ce processus
+        with Session(db.engine) as other:
+            other.execute(update(Property).where(Property.id == prop.id).values(is_available=False))
+            generations.invalidate(other.connection(), search_index.GENERATION)
+            other.commit()
+        assert prop.id in index.search({}, 'newest', 1, 100)[0]
+        assert search_index.get_search_index() is index
+        assert prop.id not in index.search({}, 'newest', 1, 100)[0]
+        assert index.generation.is_current()
+
+
+def test_list_properties_uses_index(app, client, index):
+    response = client.get('/properties/?sort_by=price_asc')
+    assert response.status_code == 200
@@ -0,0 +1,51 @@
+import pytest
+
+from ekay_platform import db, sql_stats
+from ekay_platform.models import Property, PropertyImage, User
+from ekay_platform.sql_stats import QueryBudgetExceeded, query_budget, statement_shape
+
+
+def test_statement_shape_ignores_literals_and_in_lists():
+    assert statement_shape('SELECT * FROM t WHERE id IN (?, ?, ?)') == \
+        statement_shape('SELECT *\n FROM t WHERE id IN (?)')
+    assert statement_shape("SELECT * FROM t WHERE name = 'a' LIMIT 10") == \
+        'SELECT * FROM t WHERE name = ? LIMIT ?'
+
+
+def _add_properties(count):
+    user = User.query.first()
+    for i in range(count):
+        prop = Property(title=f'Maison {i}', description='Maison', price=100, rooms=2,
+                        address='1 Rue A', city='Jacmel', user_id=user.id)
+        db.session.add(prop)
+        db.session.flush()
+        db.session.add(PropertyImage(filename=f'{i}.jpg', original_filename=f'{i}.jpg', property_id=prop.id))
+    db.session.commit()
+
+
+def test_query_budget_detects_n_plus_one(app):
+    with app.app_context():
+        _add_properties(8)
+        db.session.expunge_all()
+
+        with pytest.raises(QueryBudgetExceeded):
+            with query_budget(5):
+                for prop in Property.query.all():
+                    prop.images.first()
+
+        with query_budget(2) as stats:
+            Property.query.all()
+        assert stats.count == 1
+
+
+def test_list_page_reports_queries(app, client):
+    app.config['SQL_PROFILING'] = True
+    sql_stats.init_app(app)
+    with app.app_context():
+        _add_properties(8)
+
+    response = client.get('/properties/')
+    summary = response.headers[sql_stats.HEADER_NAME]
+    assert summary.endswith('n+1=0')
+    # Liste paginée : comptage, page de cartes et images principales groupées
+    assert int(summary.split(';')[0].split('=')[1]) <= 4
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from ekay_platform import db, token_sweeper
+from ekay_platform.models import Token, User
+
+
+def make_token(user, token_type='password_reset', age_hours=0, expires_in=3600, used=False):
+    token = Token(user_id=user.id, token_type=token_type, expires_in=expires_in)
+    token.created_at = datetime.utcnow() - timedelta(hours=age_hours)
+    token.expires_at = token.created_at + timedelta(seconds=expires_in)
+    token.used = used
+    db.session.add(token)
+    return token
+
+
+def test_sweep_deletes_stale_tokens_in_batches(app):
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        for _ in range(5):
+            make_token(user, age_hours=48)                       # expiré
+        make_token(user, age_hours=30, expires_in=86400 * 7, used=True)  # utilisé, ancien
+        recent_used = make_token(user, age_hours=1, used=True)   # utilisé, conservé
+        recently_expired = make_token(user, age_hours=2)         # expiré depuis moins de 24 h
+        valid = make_token(user, 'email_verification', expires_in=86400)
+        db.session.commit()
+        kept = {recent_used.id, recently_expired.id, valid.id}
+
+        stats = token_sweeper.token_stats(retention_hours=24)
+        assert stats['total'] == 9 and stats['sweepable'] == 6
+        assert stats['by_type']['email_verification']['valid'] == 1
+        assert stats['by_type']['password_reset']['used'] == 2
+
+        assert token_sweeper.sweep(batch_size=2, retention_hours=24, max_batches=2) == 4
+        assert token_sweeper.sweep(batch_size=2, retention_hours=24) == 2
+        assert {token.id for token in Token.query} == kept
+        assert token_sweeper.sweep(batch_size=2) == 0
+
+
+def test_generated_token_still_verifies(app):
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        first = user.generate_auth_token('password_reset')
+        second = user.generate_auth_token('password_reset')
+        assert not user.verify_token(first.token, 'password_reset')
+        assert user.verify_token(second.token, 'password_reset')
+        token_sweeper.sweep(retention_hours=0)
+        assert Token.query.count() == 0
+
+
+def test_sweep_and_stats_commands(app, runner):
+    with app.app_context():
+        make_token(User.query.first(), age_hours=48)
+        db.session.commit()
+    result = runner.invoke(args=['auth', 'token-stats'])
+    assert 'password_reset : 1' in result.output and '1 à purger' in result.output
+    result = runner.invoke(args=['auth', 'sweep-tokens', '--batch-size', '10'])
+    assert '1 tokens supprimés' in result.output
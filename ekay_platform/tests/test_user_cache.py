@@ -0,0 +1,119 @@
+import pytest
+from flask_login import current_user, login_required
+from sqlalchemy import delete, event
+from sqlalchemy.orm import Session
+
+from ekay_platform import db, generations
+from ekay_platform.models import Property, User
+from ekay_platform.user_cache import GENERATION
+
+
+@pytest.fixture
+def cached_app(make_app):
+    app = make_app(USER_CACHE_TTL=30, LAST_SEEN_INTERVAL=60)
+
+    @app.route('/_whoami')
+    @login_required
+    def whoami():
+        return f'{current_user.username} {current_user.favorite_count}'
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='testuser', email='test@example.com', password='password'))
+        db.session.commit()
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+    app.statements = statements
+    return app
+
+
+def user_selects(app):
+    return sum(1 for statement in app.statements if statement.lstrip().startswith('SELECT') and 'FROM users' in statement)
+
+
+def test_repeat_requests_skip_the_user_query(cached_app):
+    client = cached_app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    assert client.get('/_whoami').get_data(as_text=True) == 'testuser 0'
+
+    cached_app.statements.clear()
+    for _ in range(3):
+        assert client.get('/_whoami').status_code == 200
+    assert user_selects(cached_app) == 0
+    # last_seen n'est plus réécrit à chaque requête
+    assert not any(statement.startswith('UPDATE users') for statement in cached_app.statements)
+
+
+def test_profile_change_and_deletion_invalidate(cached_app):
+    client = cached_app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    client.get('/_whoami')
+
+    with cached_app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        user.username = 'renamed'
+        db.session.commit()
+    assert client.get('/_whoami').get_data(as_text=True) == 'renamed 0'
+
+    with cached_app.app_context():
+        db.session.delete(User.query.filter_by(username='renamed').first())
+        db.session.commit()
+    assert client.get('/_whoami').status_code == 302
+
+
+def test_password_change_elsewhere_ends_other_sessions(cached_app):
+    client = cached_app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    assert client.get('/_whoami').status_code == 200
+
+    with cached_app.app_context():
+        User.query.filter_by(username='testuser').first().password = 'nouveau-mot-de-passe'
+        db.session.commit()
+    assert client.get('/_whoami').status_code == 302
+
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'nouveau-mot-de-passe'})
+    assert client.get('/_whoami').status_code == 200
+
+
+def test_deletion_in_another_process_and_admins_skip_the_cache(cached_app):
+    cache = cached_app.extensions['user_cache']
+    cache.check_interval = 0
+    client = cached_app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    assert client.get('/_whoami').status_code == 200
+
+    with cached_app.app_context():
+        # Autre worker : session sans les événements de ce processus
+        with Session(db.engine) as other:
+            other.execute(delete(User).where(User.username == 'testuser'))
+            generations.invalidate(other.connection(), GENERATION)
+            other.commit()
+        db.session.add(User(username='admin', email='admin@example.com', password='password', is_admin=True))
+        db.session.commit()
+    assert client.get('/_whoami').status_code == 302
+
+    client.post('/auth/login', data={'username': 'admin', 'password': 'password'})
+    cached_app.statements.clear()
+    client.get('/_whoami')
+    client.get('/_whoami')
+    assert user_selects(cached_app) == 2
+
+
+def test_deleted_favourite_refreshes_the_cached_count(cached_app):
+    client = cached_app.test_client()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'password'})
+    with cached_app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        prop = Property(title='Maison', price=100, rooms=2, address='a', city='Jacmel', user_id=user.id)
+        db.session.add(prop)
+        db.session.commit()
+        property_id = prop.id
+        user.add_favorite(property_id)
+        db.session.commit()
+    assert client.get('/_whoami').get_data(as_text=True) == 'testuser 1'
+
+    with cached_app.app_context():
+        db.session.delete(db.session.get(Property, property_id))
+        db.session.commit()
+    assert client.get('/_whoami').get_data(as_text=True) == 'testuser 0'
@@ -0,0 +1,109 @@
+"""
+E-KAY Platform - Purge des tokens expirés ou utilisés
+
+Chaque vérification d'email ou réinitialisation de mot de passe laisse une
+ligne ``tokens`` qui ne sert plus une fois utilisée, remplacée
+(``User.generate_auth_token`` marque les précédentes comme utilisées) ou
+expirée. Une tâche périodique (``flask auth sweep-tokens``, voir
+render.yaml) les supprime :
+
+- par lots de ``TOKEN_SWEEP_BATCH_SIZE`` identifiants, une transaction par
+  lot : les verrous ne sont tenus que le temps d'un petit DELETE par clé
+  primaire et les connexions, inscriptions et vérifications continuent
+  pendant la purge ;
+- après ``TOKEN_RETENTION_HOURS`` heures seulement (expiration, ou
+  création pour un token utilisé), pour garder les liens récents lors d'un
+  diagnostic ;
+- avec une courte pause (``TOKEN_SWEEP_PAUSE``) entre deux lots.
+
+``flask auth token-stats`` affiche le nombre de tokens par type et par
+état, et la taille occupée par la table (PostgreSQL, SQLite avec dbstat).
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, or_, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from .extensions import db
+from .models import Token
+
+# Taille de la table et de ses index, par dialecte (octets)
+TABLE_SIZE_QUERIES = {
+    'postgresql': "SELECT pg_total_relation_size('tokens')",
+    'sqlite': "SELECT SUM(pgsize) FROM dbstat WHERE name = 'tokens' OR name LIKE 'ix_tokens%'",
+}
+
+
+def sweepable(retention_hours=24, now=None):
+    """Condition des tokens à supprimer : expirés ou utilisés depuis `retention_hours`"""
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=retention_hours)
+    return or_(Token.expires_at < cutoff, (Token.used.is_(True)) & (Token.created_at < cutoff))
+
+
+def sweep(batch_size=1000, retention_hours=24, pause=0.0, max_batches=None):
+    """Supprime les tokens périmés par lots, une transaction par lot
+
+    Retourne le nombre de tokens supprimés.
+    """
+    condition = sweepable(retention_hours)
+    table = Token.__table__
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [row[0] for row in db.session.query(Token.id).filter(condition).order_by(Token.id).limit(batch_size)]
+        if not ids:
+            break
+        deleted += db.session.execute(table.delete().where(table.c.id.in_(ids))).rowcount
+        db.session.commit()
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
+
+
+def table_size():
+    """Taille en octets de la table et de ses index ; None si le moteur ne la donne pas"""
+    query = TABLE_SIZE_QUERIES.get(db.session.get_bind().dialect.name)
+    if query is None:
+        return None
+    try:
+        return db.session.execute(text(query)).scalar()
+    except (OperationalError, ProgrammingError):  # SQLite compilé sans dbstat
+        db.session.rollback()
+        return None
+
+
+def token_stats(retention_hours=24):
+    """Nombre de tokens par type (valides, utilisés, expirés, à purger) et taille de la table"""
+    now = datetime.utcnow()
+    expired = Token.expires_at < now
+    query = db.session.query(
+        Token.token_type,
+        func.count(),
+        func.sum(case((Token.used.is_(True), 1), else_=0)),
+        func.sum(case((expired & Token.used.isnot(True), 1), else_=0)),
+        func.sum(case((sweepable(retention_hours, now), 1), else_=0)),
+    ).group_by(Token.token_type)
+    by_type = {
+        token_type: {'total': total, 'used': used or 0, 'expired': expired_count or 0,
+                     'valid': total - (used or 0) - (expired_count or 0), 'sweepable': sweepable_count or 0}
+        for token_type, total, used, expired_count, sweepable_count in query
+    }
+    return {
+        'by_type': by_type,
+        'total': sum(counts['total'] for counts in by_type.values()),
+        'sweepable': sum(counts['sweepable'] for counts in by_type.values()),
+        'table_bytes': table_size(),
+    }
+
+
+def run(config):
+    """Passage de la tâche périodique"""
+    return sweep(
+        batch_size=config.get('TOKEN_SWEEP_BATCH_SIZE', 1000),
+        retention_hours=config.get('TOKEN_RETENTION_HOURS', 24),
+        pause=config.get('TOKEN_SWEEP_PAUSE', 0.0),
+    )
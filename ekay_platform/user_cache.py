@@ -0,0 +1,261 @@
+"""
+E-KAY Platform - Cache des utilisateurs connectés
+
+Sans cache, chaque requête authentifiée relit toute la ligne ``users``
+(``load_user``). Ici :
+
+- Flask-Login mémorise déjà l'utilisateur pour la durée de la requête
+  (``g._login_user``) : le chargeur n'est appelé qu'une fois ;
+- entre les requêtes, un cache de processus garde pendant
+  ``USER_CACHE_TTL`` secondes les colonnes de chaque utilisateur. Sur
+  succès, l'utilisateur est reconstruit et rattaché à la session SQLAlchemy
+  sans SELECT (il reste utilisable normalement : relations, écritures) ;
+- la session Flask ne contient que l'identifiant et une empreinte du hash
+  de mot de passe (``_user_stamp``). Une empreinte différente de celle de
+  l'utilisateur (mot de passe changé ailleurs) déconnecte la session.
+
+Invalidation : toute modification ORM d'un utilisateur validée par un
+commit (profil, mot de passe, suppression par un administrateur) retire
+son entrée du cache du processus, de même que la suppression d'une annonce
+qu'il avait en favori (compteur mis à jour en Core). Les colonnes de
+``PATCHED_COLUMNS`` (dernière visite) sont recopiées dans l'entrée au lieu
+de l'invalider.
+
+Autres workers : une suppression ou un changement de droits
+(``PRIVILEGE_COLUMNS``) incrémente la génération partagée ``users`` (voir
+``generations``) ; chaque processus la relit au plus toutes les
+``USER_CACHE_CHECK_INTERVAL`` secondes et vide son cache si elle a changé.
+Les administrateurs ne sont jamais mis en cache : chaque requête relit
+leurs droits. Les autres modifications restent visibles sur les autres
+workers au plus ``USER_CACHE_TTL`` secondes après.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context, has_request_context, session
+from flask_login import user_logged_in
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import make_transient_to_detached
+
+from .extensions import db, login_manager
+from .generations import Generation
+from .models import Property, User, favorites
+
+STAMP_KEY = '_user_stamp'
+# Colonnes mises à jour à chaque visite : pas d'invalidation
+PATCHED_COLUMNS = {'last_seen'}
+# Colonnes dont la modification invalide le cache de tous les processus
+PRIVILEGE_COLUMNS = {'is_admin', 'is_landlord'}
+GENERATION = 'users'
+COLUMNS = [column.key for column in User.__table__.columns]
+
+
+def password_stamp(password_hash):
+    """Empreinte courte du hash de mot de passe, stockée dans la session"""
+    return hashlib.sha256((password_hash or '').encode('utf-8')).hexdigest()[:16]
+
+
+class UserCache:
+    """Colonnes des utilisateurs récents, par identifiant, avec expiration"""
+
+    def __init__(self, ttl=30.0, max_size=10000, check_interval=1.0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.check_interval = check_interval
+        self.generation = Generation(GENERATION)
+        self._checked_at = None
+        self._entries = OrderedDict()  # id -> (expiration, colonnes)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def sync(self):
+        """Vide le cache si un autre processus a supprimé un utilisateur ou changé des droits"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        value = self.generation.read()
+        with self._lock:
+            if value != self.generation.seen:
+                self._entries.clear()
+                self.generation.built(value)
+            self._checked_at = now
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def patch(self, user_id, values):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                entry[1].update(values)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _attach(values):
+    """Utilisateur persistant dans la session courante, sans requête"""
+    key = db.session.identity_key(User, values['id'])
+    existing = db.session.identity_map.get(key)
+    if existing is not None:
+        return existing
+    user = User(**values)
+    make_transient_to_detached(user)
+    db.session.add(user)
+    return user
+
+
+def load_user(user_id):
+    """Chargeur Flask-Login : cache du processus, puis base"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    cache = current_app.extensions.get('user_cache')
+    if cache is None:  # autre application sans cache dans le même processus
+        return db.session.get(User, user_id)
+    stamp = session.get(STAMP_KEY)
+
+    cache.sync()
+    values = cache.get(user_id)
+    if values is None or (stamp and password_stamp(values['password_hash']) != stamp):
+        user = db.session.get(User, user_id)
+        if user is None:
+            cache.invalidate(user_id)
+            return None
+        values = {name: getattr(user, name) for name in COLUMNS}
+        if not user.is_admin:  # droits d'administration relus à chaque requête
+            cache.put(user_id, values)
+    else:
+        user = _attach(dict(values))
+
+    current = password_stamp(values['password_hash'])
+    if stamp is None:
+        session[STAMP_KEY] = current  # session antérieure au cache ou cookie « se souvenir de moi »
+    elif stamp != current:
+        return None
+    return user
+
+
+def _on_login(sender, user, **extra):
+    session[STAMP_KEY] = password_stamp(user.password_hash)
+
+
+def _current_cache():
+    return current_app.extensions.get('user_cache') if has_app_context() else None
+
+
+def _before_flush(session_, flush_context, instances):
+    # favorite_count des utilisateurs est décrémenté en Core à la suppression
+    # d'une annonce (models.user) : invalider ces utilisateurs aussi
+    deleted = [obj.id for obj in session_.deleted if isinstance(obj, Property) and obj.id is not None]
+    if deleted and _current_cache() is not None:
+        changed = session_.info.setdefault('user_cache_changed', {})
+        for user_id in session_.connection().execute(
+            select(favorites.c.user_id).where(favorites.c.property_id.in_(deleted))
+        ).scalars():
+            changed[user_id] = None
+
+
+def _after_flush(session_, flush_context):
+    changed = session_.info.setdefault('user_cache_changed', {})
+    stamps = session_.info.setdefault('user_cache_stamps', {})
+    revoked = False
+    for obj in session_.deleted:
+        if isinstance(obj, User):
+            changed[obj.id] = None
+            revoked = True
+    for obj in session_.dirty:
+        if not isinstance(obj, User) or obj in session_.deleted:
+            continue
+        state = inspect(obj)
+        modified = {attr.key for attr in state.mapper.column_attrs
+                    if state.attrs[attr.key].history.has_changes()}
+        if modified and modified <= PATCHED_COLUMNS and changed.get(obj.id, {}) is not None:
+            changed.setdefault(obj.id, {}).update({name: getattr(obj, name) for name in modified})
+        elif modified:
+            changed[obj.id] = None
+        if 'password_hash' in modified:
+            stamps[obj.id] = password_stamp(obj.password_hash)
+        revoked = revoked or bool(modified & PRIVILEGE_COLUMNS)
+    cache = _current_cache()
+    if revoked and cache is not None:
+        cache.generation.bump(session_)
+
+
+def _after_commit(session_):
+    changed = session_.info.pop('user_cache_changed', None)
+    stamps = session_.info.pop('user_cache_stamps', None)
+    cache = _current_cache()
+    if cache is None:
+        return
+    cache.generation.after_commit(session_)
+    if not changed:
+        return
+    for user_id, values in changed.items():
+        if values is None:
+            cache.invalidate(user_id)
+        else:
+            cache.patch(user_id, values)
+    # Mot de passe changé par l'utilisateur lui-même : sa session reste valide
+    if stamps and has_request_context():
+        user_id = session.get('_user_id')
+        if user_id is not None and int(user_id) in stamps:
+            session[STAMP_KEY] = stamps[int(user_id)]
+
+
+def _after_rollback(session_):
+    session_.info.pop('user_cache_changed', None)
+    session_.info.pop('user_cache_stamps', None)
+    cache = _current_cache()
+    if cache is not None:
+        cache.generation.after_rollback(session_)
+
+
+_listeners_installed = False
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(db.session, 'before_flush', _before_flush)
+    event.listen(db.session, 'after_flush', _after_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_rollback', _after_rollback)
+    user_logged_in.connect(_on_login)
+    _listeners_installed = True
+
+
+def init_app(app):
+    """Remplace le chargeur d'utilisateur si USER_CACHE_TTL est non nul"""
+    ttl = app.config.get('USER_CACHE_TTL', 0)
+    if not ttl:
+        return None
+    cache = UserCache(ttl, app.config.get('USER_CACHE_SIZE', 10000),
+                      app.config.get('USER_CACHE_CHECK_INTERVAL', 1.0))
+    app.extensions['user_cache'] = cache
+    login_manager.user_loader(load_user)
+    _install_listeners()
+    return cache
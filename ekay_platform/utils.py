@@ -6,6 +6,7 @@ from PIL import Image, ExifTags
 import uuid
 from werkzeug.utils import secure_filename
 from flask import current_app
+from .metrics import observe_image_processing
 
 def allowed_file(filename, allowed_extensions=None):
     """Vérifie si l'extension du fichier est autorisée"""
@@ -69,6 +70,7 @@ def process_image(file, max_size=(1200, 1200), quality=85):
         current_app.logger.error(f"Erreur lors du traitement de l'image: {e}")
         raise
 
+@observe_image_processing('save_property_image')
 def save_property_image(file, property_id):
     """
     Enregistre une image pour une propriété et crée des miniatures
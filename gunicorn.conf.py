@@ -0,0 +1,96 @@
+"""
+E-KAY Platform - Configuration Gunicorn
+
+Lue automatiquement par ``gunicorn`` depuis le répertoire courant :
+
+    gunicorn "ekay_platform:create_app('production')"
+
+Tous les réglages se surchargent par variables d'environnement.
+
+Modes de workers (GUNICORN_WORKER_CLASS) :
+
+- ``gthread`` (défaut) : chaque worker sert GUNICORN_THREADS requêtes à la
+  fois avec des threads. Sans dépendance supplémentaire, compatible avec
+  tous les pilotes de base de données ; le GIL limite le gain sur les pages
+  coûteuses en CPU (rendu Jinja, traitement d'images), mais les attentes
+  réseau et SQL se recouvrent. Bon choix général.
+- ``gevent`` : chaque worker sert jusqu'à GUNICORN_WORKER_CONNECTIONS
+  requêtes avec des greenlets. Utile quand les requêtes attendent surtout
+  des E/S (SMTP, base distante). Nécessite ``pip install gevent`` (et
+  ``psycogreen`` pour PostgreSQL). Le préchargement est désactivé par défaut
+  dans ce mode : l'application doit être importée après le monkey-patching.
+
+Nombre de workers : un par cœur plus un (GUNICORN_WORKERS pour forcer).
+La taille du pool SQLAlchemy de chaque worker suit sa concurrence (voir
+``DB_POOL_SIZE`` dans config.py) pour qu'aucun thread n'attende une connexion.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+cores = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get('GUNICORN_WORKERS', cores + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+# Préchargement : l'application est importée une fois dans le maître, les
+# workers la partagent en copie sur écriture (démarrage plus rapide, moins de mémoire).
+preload_app = os.environ.get(
+    'GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true'
+).lower() in ['true', 'on', '1']
+
+# Recyclage progressif des workers pour contenir les fuites mémoire ; la
+# gigue évite que tous les workers redémarrent en même temps.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None  # vide : pas de journal d'accès
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# Pool SQLAlchemy par worker : une connexion par requête concurrente, bornée
+# en mode gevent où les greenlets attendent alors leur tour sur le pool.
+concurrency = worker_connections if worker_class == 'gevent' else threads
+os.environ.setdefault('DB_POOL_SIZE', str(min(concurrency, 20)))
+os.environ.setdefault('DB_MAX_OVERFLOW', str(min(concurrency, 10)))
+
+# Métriques Prometheus : chaque worker écrit ses valeurs dans ce répertoire,
+# /metrics les agrège. Il doit exister avant le chargement de l'application :
+# avec le préchargement, le maître l'importe (et crée ses jauges) avant
+# tout hook. Repartir d'un répertoire vide : les fichiers d'un ancien maître
+# fausseraient les compteurs.
+_metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'ekay-prometheus')
+)
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # Avec le préchargement, le maître a pu ouvrir des connexions (index de
+    # recherche construit au démarrage) : les fermer avant de forker pour
+    # qu'aucun worker n'hérite d'un socket partagé.
+    if not server.cfg.preload_app:
+        return
+    from ekay_platform.extensions import db
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose()
+    replicas = app.extensions.get('db_replicas')
+    if replicas is not None:
+        replicas.dispose()
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)